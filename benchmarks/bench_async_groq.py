@@ -0,0 +1,81 @@
+"""
+Compare sequential and concurrent codebase summaries against the local stub API.
+
+Usage:
+    python benchmarks/bench_async_groq.py --latency 0.5 --groups 12 --rate-limit-share 0.2
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from common import REPO_ROOT  # noqa: F401  (puts the repository on sys.path)
+from stub_groq_server import StubGroqServer
+from src.async_groq import AsyncCodebaseSummarizer
+from src.config import Config
+from src.summarizer import Summarizer
+
+PERSPECTIVES = ["product_manager", "developer", "manager"]
+SUMMARIES = [
+    "Records a financial transaction with amount, category and type.",
+    "Calculates the net balance from all transactions.",
+    "Summarizes total amounts by category.",
+]
+
+async def run_concurrent(summarizer, args):
+    async with AsyncCodebaseSummarizer(summarizer, max_concurrency=args.concurrency,
+                                       tokens_per_minute=args.tokens_per_minute) as client:
+        start = time.perf_counter()
+        await client.summarize_perspectives(SUMMARIES, PERSPECTIVES)
+        perspectives = time.perf_counter() - start
+        start = time.perf_counter()
+        await client.summarize_many({f"file_{i}.py": SUMMARIES for i in range(args.groups)})
+        groups = time.perf_counter() - start
+    return perspectives, groups
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--groups", type=int, default=12)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--tokens-per-minute", type=int, default=60_000)
+    parser.add_argument("--rate-limit-share", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with StubGroqServer(latency=args.latency, rate_limit_share=args.rate_limit_share) as server:
+        summarizer = Summarizer(
+            function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
+            groq_api_key="stub",
+            groq_model=Config.GROQ_MODEL,
+            groq_base_url=server.base_url
+        )
+        start = time.perf_counter()
+        for user_type in PERSPECTIVES:
+            summarizer.summarize_codebase(SUMMARIES, user_type)
+        sequential = time.perf_counter() - start
+        connections_before = len(server.connections)
+
+        perspectives, groups = asyncio.run(run_concurrent(summarizer, args))
+        print(f"3 perspectives, sequential: {sequential:.2f}s")
+        print(f"3 perspectives, concurrent: {perspectives:.2f}s")
+        print(f"{args.groups} groups, concurrent (limit {args.concurrency}): {groups:.2f}s")
+        print(f"requests={server.requests} rate_limited={server.rate_limited} "
+              f"peak_in_flight={server.peak_in_flight} "
+              f"async_connections={len(server.connections) - connections_before}")
+
+    # Summarizer.summarize_perspectives asks for all perspectives as one JSON object
+    combined_reply = json.dumps({user_type: f"Summary for the {user_type} perspective." for user_type in PERSPECTIVES})
+    with StubGroqServer(latency=args.latency, reply=combined_reply) as server:
+        summarizer = Summarizer(
+            function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
+            groq_api_key="stub",
+            groq_model=Config.GROQ_MODEL,
+            groq_base_url=server.base_url
+        )
+        start = time.perf_counter()
+        summarizer.summarize_perspectives(SUMMARIES, PERSPECTIVES)
+        combined = time.perf_counter() - start
+        print(f"3 perspectives, one combined request: {combined:.2f}s (requests={server.requests})")
+
+if __name__ == "__main__":
+    main()
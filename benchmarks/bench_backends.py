@@ -0,0 +1,60 @@
+"""
+Compare inference backends for speed and agreement with the fp32 PyTorch summaries.
+
+Every backend summarizes the same fixed corpus; quality is reported as exact-match
+rate and mean ROUGE-L against the fp32 "pytorch" output.
+
+Usage:
+    python benchmarks/bench_backends.py --num-functions 64 --backends pytorch pytorch-int8 onnx
+"""
+import argparse
+import time
+
+from common import load_corpus, rouge_l
+from src.config import Config
+from src.model_registry import registry
+from src.summarizer import Summarizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-functions", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=Config.FUNCTION_BATCH_SIZE)
+    parser.add_argument("--backends", nargs="+", default=["pytorch", "pytorch-int8", "onnx"])
+    args = parser.parse_args()
+
+    # Distinct functions only, so in-call deduplication does not skew the timings
+    codes = list(dict.fromkeys(load_corpus(args.num_functions)))
+    backends = ["pytorch"] + [backend for backend in args.backends if backend != "pytorch"]
+    reference = None
+    print(f"{len(codes)} functions, batch size {args.batch_size}")
+    print(f"{'backend':>14} {'load s':>8} {'MB':>8} {'functions/s':>12} {'exact':>7} {'ROUGE-L':>8}")
+    for backend in backends:
+        summarizer = Summarizer(
+            function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
+            groq_api_key=Config.GROQ_API_KEY or "unused",
+            groq_model=Config.GROQ_MODEL,
+            backend=backend,
+            near_duplicate_threshold=0,
+            trivial_fast_path=False
+        )
+        try:
+            loaded = summarizer.loaded_model
+        except ImportError as e:
+            print(f"{backend:>14} skipped: {e}")
+            continue
+        summarizer.summarize_functions(codes[:2], batch_size=2)
+        start = time.perf_counter()
+        summaries = summarizer.summarize_functions(codes, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = summaries
+        exact = sum(s == r for s, r in zip(summaries, reference)) / len(codes)
+        rouge = sum(rouge_l(s, r) for s, r in zip(summaries, reference)) / len(codes)
+        print(f"{backend:>14} {loaded.load_seconds:>8.2f} {loaded.resident_bytes / 2**20:>8.1f} "
+              f"{len(codes) / elapsed:>12.2f} {exact:>7.2f} {rouge:>8.3f}")
+        registry.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Measure function summarization throughput at several batch sizes on CPU.
+
+Usage:
+    python benchmarks/bench_batching.py --num-functions 64 --batch-sizes 1 4 8 16
+"""
+import argparse
+import time
+
+from common import load_corpus
+from src.config import Config
+from src.summarizer import Summarizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-functions", type=int, default=64)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    codes = load_corpus(args.num_functions)
+    summarizer = Summarizer(
+        function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
+        groq_api_key=Config.GROQ_API_KEY or "unused",
+        groq_model=Config.GROQ_MODEL,
+        # Every measured run must reach the model, including repeats of the same functions
+        near_duplicate_threshold=0,
+        trivial_fast_path=False
+    )
+    # Warm up so the first measured run does not pay one-off allocation costs
+    summarizer.summarize_functions(codes[:2], batch_size=2)
+
+    print(f"{'batch_size':>10} {'seconds':>10} {'functions/s':>12}")
+    for batch_size in args.batch_sizes:
+        start = time.perf_counter()
+        summarizer.summarize_functions(codes, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+        print(f"{batch_size:>10} {elapsed:>10.2f} {len(codes) / elapsed:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
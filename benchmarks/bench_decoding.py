@@ -0,0 +1,58 @@
+"""
+Compare decoding profiles: latency per function and agreement with the "quality" profile.
+
+The "quality" profile (4-beam search) is the reference; the other profiles report
+ROUGE-L F1 and the share of summaries identical to it.
+
+Usage:
+    python benchmarks/bench_decoding.py --num-functions 64 --batch-size 8
+"""
+import argparse
+import time
+
+from common import load_corpus, rouge_l
+from src.config import Config
+from src.summarizer import Summarizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-functions", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=Config.FUNCTION_BATCH_SIZE)
+    parser.add_argument("--profiles", nargs="+", default=["quality", "balanced", "fast"],
+                        choices=sorted(Config.DECODING_PROFILES))
+    args = parser.parse_args()
+
+    codes = load_corpus(args.num_functions)
+    summarizer = Summarizer(
+        function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
+        groq_api_key=Config.GROQ_API_KEY or "unused",
+        groq_model=Config.GROQ_MODEL,
+        # Every measured run must reach the model, including repeats of the same functions
+        near_duplicate_threshold=0,
+        trivial_fast_path=False
+    )
+    # Warm up so the first measured run does not pay one-off allocation costs
+    summarizer.summarize_functions(codes[:2], batch_size=2)
+
+    results = {}
+    for profile in ["quality"] + [p for p in args.profiles if p != "quality"]:
+        start = time.perf_counter()
+        summaries = summarizer.summarize_functions(codes, batch_size=args.batch_size, profile=profile)
+        results[profile] = (time.perf_counter() - start, summaries)
+
+    reference = results["quality"][1]
+    print(f"{'profile':>10} {'seconds':>10} {'ms/function':>12} {'speedup':>8} {'rouge_l':>8} {'exact':>6}")
+    for profile, (elapsed, summaries) in results.items():
+        if profile not in args.profiles:
+            continue
+        scores = [rouge_l(s, r) for s, r in zip(summaries, reference)]
+        exact = sum(s == r for s, r in zip(summaries, reference)) / len(codes)
+        print(
+            f"{profile:>10} {elapsed:>10.2f} {1000 * elapsed / len(codes):>12.1f} "
+            f"{results['quality'][0] / elapsed:>7.2f}x {sum(scores) / len(scores):>8.3f} {exact:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Measure how much inference duplicate detection saves on a repository.
+
+Extracts every function under --root, optionally adds vendored copies of a share
+of them with cosmetic edits (a trailing comment, different blank lines) and runs
+them through the exact and near-duplicate stages of Summarizer.summarize_functions
+with a counting stand-in for the model, at several similarity thresholds.
+Reports model runs, functions served by duplicates and the time spent on
+signatures; no model or GPU is needed.
+
+Usage:
+    python benchmarks/bench_dedup.py --root path/to/repo --vendored 0.2 --thresholds 0.8,0.9,0.95
+"""
+import argparse
+import random
+import time
+
+from common import REPO_ROOT
+from src.repository import iter_repository_functions
+from src.summarizer import Summarizer
+
+
+def vendored_copy(code: str, rng: random.Random) -> str:
+    lines = code.splitlines()
+    if len(lines) > 2 and rng.random() < 0.5:
+        lines.insert(rng.randrange(1, len(lines)), "")
+    return "\n".join(lines) + "\n    # vendored from upstream\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=REPO_ROOT, help="Repository or .zip archive to scan.")
+    parser.add_argument("--vendored", type=float, default=0.2, help="Share of functions copied with cosmetic edits.")
+    parser.add_argument("--copies", type=int, default=2, help="Exact copies of every function (e.g. generated stubs).")
+    parser.add_argument("--thresholds", default="0,0.8,0.9,0.95", help="Comma-separated; 0 is exact dedup only.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    codes = [record.code for record in iter_repository_functions(args.root)]
+    rng = random.Random(args.seed)
+    corpus = codes * max(1, args.copies) + [vendored_copy(code, rng) for code in codes if rng.random() < args.vendored]
+    rng.shuffle(corpus)
+    print(f"{len(codes)} distinct functions, {len(corpus)} with copies\n")
+
+    print(f"{'threshold':>9} {'model runs':>11} {'exact dup':>10} {'near dup':>9} {'saved':>7} {'dedup ms':>9}")
+    for threshold in (float(t) for t in args.thresholds.split(",")):
+        summarizer = Summarizer("stand-in", None, None, near_duplicate_threshold=threshold)
+        summarizer._generate = lambda batch, batch_size, profile=None: [f"summary {i}" for i in range(len(batch))]
+        start = time.perf_counter()
+        summarizer.summarize_functions(corpus)
+        elapsed = (time.perf_counter() - start) * 1000
+        stats = summarizer.stats
+        print(
+            f"{threshold:>9g} {stats.generated:>11} {stats.exact_duplicates:>10} {stats.near_duplicates:>9} "
+            f"{stats.inference_saved / stats.functions:>7.0%} {elapsed:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
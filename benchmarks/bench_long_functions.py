@@ -0,0 +1,102 @@
+"""
+Compare truncation and statement-aligned chunking on functions longer than the model input.
+
+Long functions with a docstring are collected from --root (the standard library by
+default). The docstring is removed from the input and its first paragraph serves as
+the reference summary for ROUGE-L.
+
+Usage:
+    python benchmarks/bench_long_functions.py --num-functions 32 --batch-size 8
+"""
+import argparse
+import ast
+import os
+import time
+from typing import List, Tuple
+
+from common import rouge_l
+from src.code_parser import extract_functions
+from src.config import Config
+from src.summarizer import Summarizer
+
+
+def strip_docstring(code: str) -> Tuple[str, str]:
+    """Split a function's source into (code without docstring, first docstring paragraph)."""
+    try:
+        node = ast.parse(code).body[0]
+    except (SyntaxError, IndexError):
+        return code, ""
+    docstring = ast.get_docstring(node)
+    if not docstring or len(node.body) < 2 or node.body[0].lineno == node.lineno:
+        return code, ""
+    lines = code.splitlines(keepends=True)
+    first = node.body[0]
+    stripped = "".join(lines[:first.lineno - 1] + lines[first.end_lineno:])
+    return stripped, docstring.split("\n\n")[0].replace("\n", " ")
+
+
+def load_long_functions(root: str, num_functions: int, min_tokens: int, count_tokens) -> List[Tuple[str, str]]:
+    """Collect (code, reference) pairs for functions of at least min_tokens tokens."""
+    pairs = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith(".") and d not in ("__pycache__", "test", "tests"))
+        for filename in sorted(filenames):
+            if not filename.endswith(".py"):
+                continue
+            for func in extract_functions(os.path.join(dirpath, filename)):
+                # Cheap character filter before tokenizing
+                if len(func.code) < 3 * min_tokens:
+                    continue
+                code, reference = strip_docstring(func.code)
+                if reference and count_tokens(code) >= min_tokens:
+                    pairs.append((code, reference))
+                    if len(pairs) >= num_functions:
+                        return pairs
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=os.path.dirname(os.__file__), help="Directory to collect functions from.")
+    parser.add_argument("--num-functions", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=Config.FUNCTION_BATCH_SIZE)
+    parser.add_argument("--profile", default="quality", choices=sorted(Config.DECODING_PROFILES))
+    args = parser.parse_args()
+
+    summarizer = Summarizer(
+        function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
+        groq_api_key=Config.GROQ_API_KEY or "unused",
+        groq_model=Config.GROQ_MODEL,
+        decoding_profile=args.profile,
+        # Every measured run must reach the model, including repeats of the same functions
+        near_duplicate_threshold=0,
+        trivial_fast_path=False
+    )
+    tokenizer = summarizer.function_tokenizer
+
+    def count_tokens(text: str) -> int:
+        return len(tokenizer(text, add_special_tokens=False)["input_ids"])
+
+    pairs = load_long_functions(args.root, args.num_functions, summarizer.max_input_length, count_tokens)
+    if not pairs:
+        raise SystemExit(f"No documented functions of {summarizer.max_input_length}+ tokens under {args.root}")
+    codes = [code for code, _ in pairs]
+    tokens = [count_tokens(code) for code in codes]
+    print(f"{len(codes)} functions, {sum(tokens) / len(tokens):.0f} tokens on average, longest {max(tokens)}")
+
+    # Warm up so the first measured run does not pay one-off allocation costs
+    summarizer.summarize_functions(["def f(x):\n    return x + 1"], batch_size=1)
+
+    print(f"{'strategy':>10} {'seconds':>10} {'functions/s':>12} {'inputs':>7} {'rouge_l':>8}")
+    for strategy in ("truncate", "chunk"):
+        summarizer.long_function_strategy = strategy
+        inputs = sum(max(1, len(summarizer._chunks(code))) for code in codes)
+        start = time.perf_counter()
+        summaries = summarizer.summarize_functions(codes, batch_size=args.batch_size)
+        elapsed = time.perf_counter() - start
+        score = sum(rouge_l(s, r) for s, (_, r) in zip(summaries, pairs)) / len(pairs)
+        print(f"{strategy:>10} {elapsed:>10.2f} {len(codes) / elapsed:>12.2f} {inputs:>7} {score:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
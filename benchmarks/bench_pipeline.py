@@ -0,0 +1,81 @@
+"""
+Compare sequential summarization of a repository with SummarizationPipeline.
+
+Runs a stand-in for the model (a fixed delay per function) and for Groq (a fixed
+delay per file summary) so only the overlap of the stages is measured; no model,
+GPU or API key is needed. The sequential run parses everything, then summarizes
+the functions, then the files (concurrently), as the CLI did before. Prints the
+wall time of both and the pipeline's per-stage throughput and queue depths.
+
+Usage:
+    python benchmarks/bench_pipeline.py --root path/to/repo --inference-ms 5 --remote-ms 50
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import REPO_ROOT
+from src.hierarchical import HierarchicalSummarizer
+from src.pipeline import SummarizationPipeline
+from src.repository import iter_repository_files, summarize_repository
+from src.summarizer import Summarizer
+
+
+def stand_in(inference_ms: float, remote_ms: float) -> Summarizer:
+    summarizer = Summarizer("stand-in", None, None, near_duplicate_threshold=0, trivial_fast_path=False)
+
+    def generate(codes, batch_size, profile=None):
+        time.sleep(inference_ms / 1000 * len(codes))
+        return [f"summary {i}" for i in range(len(codes))]
+
+    def summarize_group(summaries, level):
+        time.sleep(remote_ms / 1000)
+        return f"{level} of {len(summaries)} functions"
+
+    summarizer._generate = generate
+    summarizer.summarize_group = summarize_group
+    return summarizer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=REPO_ROOT, help="Repository or .zip archive to summarize.")
+    parser.add_argument("--inference-ms", type=float, default=5.0, help="Stand-in model time per function.")
+    parser.add_argument("--remote-ms", type=float, default=50.0, help="Stand-in Groq latency per file summary.")
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--remote-workers", type=int, default=4)
+    parser.add_argument("-j", "--jobs", type=int)
+    args = parser.parse_args()
+
+    summarizer = stand_in(args.inference_ms, args.remote_ms)
+    hierarchical = HierarchicalSummarizer(summarizer, max_workers=args.remote_workers, cache=None)
+    start = time.perf_counter()
+    files = list(iter_repository_files(args.root, jobs=args.jobs))
+    records = [record for _, functions in files for record in functions]
+    by_file = {}
+    for record, summary in summarize_repository(summarizer, iter(records), batch_size=args.batch_size):
+        by_file.setdefault(record.file, []).append(summary)
+    with ThreadPoolExecutor(max_workers=args.remote_workers) as executor:
+        list(executor.map(hierarchical.summarize_file, by_file.values()))
+    sequential = time.perf_counter() - start
+
+    summarizer = stand_in(args.inference_ms, args.remote_ms)
+    hierarchical = HierarchicalSummarizer(summarizer, max_workers=args.remote_workers, cache=None)
+    pipeline = SummarizationPipeline(
+        summarizer, batch_size=args.batch_size, remote_workers=args.remote_workers, hierarchical=hierarchical
+    )
+    result = pipeline.run(args.root, jobs=args.jobs, profile="fast")
+
+    print(f"{len(files)} files, {len(records)} functions")
+    print(f"sequential: {sequential:.2f}s")
+    print(f"pipeline:   {result.elapsed:.2f}s ({sequential / result.elapsed:.1f}x)\n")
+    print(f"{'stage':>10} {'items':>7} {'items/s':>9} {'busy s':>7} {'wall s':>7} {'queue max':>10} {'queue mean':>11}")
+    for metrics in result.metrics:
+        print(
+            f"{metrics.name:>10} {metrics.items:>7} {metrics.throughput:>9.1f} {metrics.busy_seconds:>7.2f} "
+            f"{metrics.wall_seconds:>7.2f} {metrics.queue_max_depth:>10} {metrics.queue_mean_depth:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Simulate a team reviewing the same repository against the local stub API.
+
+Several users (threads) each click "Generate Summary" a few times, picking a
+perspective and one of a few files at random; clicks that collide run at the
+same time. Runs the same click plan with and without the response cache and
+reports Groq requests made and per-click latency.
+
+Usage:
+    python benchmarks/bench_response_cache.py --users 8 --clicks 5 --files 3 --latency 0.5
+"""
+import argparse
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import REPO_ROOT  # noqa: F401  (puts the repository on sys.path)
+from stub_groq_server import StubGroqServer
+from src.config import Config
+from src.response_cache import ResponseCache
+from src.summarizer import Summarizer
+
+PERSPECTIVES = ["product_manager", "developer", "manager"]
+
+
+def run(server, plan, cache):
+    latencies = []
+
+    def click(item):
+        summaries, perspective = item
+        # Every click builds its own Summarizer, like a fresh app session
+        summarizer = Summarizer(
+            function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
+            groq_api_key="stub",
+            groq_model=Config.GROQ_MODEL,
+            groq_base_url=server.base_url,
+            response_cache=cache
+        )
+        start = time.perf_counter()
+        "".join(summarizer.stream_codebase_summary(summaries, perspective))
+        latencies.append(time.perf_counter() - start)
+
+    before = server.requests
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(plan)) as executor:
+        list(executor.map(lambda clicks: [click(item) for item in clicks], plan))
+    return server.requests - before, latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--clicks", type=int, default=5, help="Summaries requested by each user.")
+    parser.add_argument("--files", type=int, default=3, help="Distinct files the team looks at.")
+    parser.add_argument("--latency", type=float, default=0.5, help="Stub API latency in seconds.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    files = [[f"Function {i} of file {f} does step {i}." for i in range(20)] for f in range(args.files)]
+    plan = [
+        [(rng.choice(files), rng.choice(PERSPECTIVES)) for _ in range(args.clicks)]
+        for _ in range(args.users)
+    ]
+
+    with StubGroqServer(latency=args.latency) as server:
+        print(f"{'mode':>10} {'requests':>9} {'clicks':>7} {'p50 s':>7} {'max s':>7} {'wall s':>7}")
+        for mode, cache in (("no cache", None), ("cache", ResponseCache(ttl=3600))):
+            requests, latencies, wall = run(server, plan, cache)
+            print(
+                f"{mode:>10} {requests:>9} {len(latencies):>7} {statistics.median(latencies):>7.2f} "
+                f"{max(latencies):>7.2f} {wall:>7.2f}"
+            )
+            if cache is not None:
+                print(f"cache: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
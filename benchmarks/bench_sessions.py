@@ -0,0 +1,88 @@
+"""
+Simulate many app sessions uploading different files at the same time.
+
+Each session generates its own module (functions named after the session) and
+parses it either the old way, through a shared temp.py in the working directory,
+or in memory with parse_upload, the helper both apps call on an upload. A
+session is corrupted when it gets back any function that is not its own. Exits
+with status 1 if the in-memory path corrupts any session.
+
+Usage:
+    python benchmarks/bench_sessions.py --sessions 64 --threads 16
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from common import REPO_ROOT  # noqa: F401  (puts the repository on sys.path)
+from src.code_parser import extract_functions
+from src.repository import parse_upload
+
+
+def make_source(session: int, functions: int) -> bytes:
+    return "".join(
+        f"def session_{session}_function_{i}(value):\n    return value + {i}\n\n"
+        for i in range(functions)
+    ).encode("utf-8")
+
+
+def parse_via_temp_file(session: int, source: bytes, temp_path: str):
+    with open(temp_path, "wb") as f:
+        f.write(source)
+    # Read into memory rather than memory-mapping: another session truncating the
+    # shared file under a live mmap kills the whole process with SIGBUS
+    try:
+        functions = extract_functions(temp_path, memory_map=False)
+    except FileNotFoundError:
+        # Another session already cleaned up "its" file
+        return []
+    if os.path.exists(temp_path):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+    return functions
+
+
+def parse_in_memory(session: int, source: bytes, temp_path: str):
+    return parse_upload(f"upload_{session}.py", source)
+
+
+def run(parse, args, temp_path: str):
+    sources = [make_source(session, args.functions) for session in range(args.sessions)]
+
+    def session_ok(session: int) -> bool:
+        functions = parse(session, sources[session], temp_path)
+        return len(functions) == args.functions and all(
+            func.name.startswith(f"session_{session}_") for func in functions
+        )
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        results = list(executor.map(session_ok, range(args.sessions)))
+    return time.perf_counter() - start, results.count(False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--functions", type=int, default=50, help="Functions per uploaded file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="codesage_sessions_") as directory:
+        temp_path = os.path.join(directory, "temp.py")
+        print(f"{'mode':>10} {'seconds':>10} {'sessions/s':>11} {'corrupted':>10}")
+        failures = 0
+        for mode, parse in (("temp.py", parse_via_temp_file), ("in-memory", parse_in_memory)):
+            elapsed, corrupted = run(parse, args, temp_path)
+            print(f"{mode:>10} {elapsed:>10.3f} {args.sessions / elapsed:>11.1f} {corrupted:>10}")
+            if parse is parse_in_memory:
+                failures = corrupted
+    raise SystemExit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Count the functions of a repository that take the trivial fast path and the time it saves.
+
+Classifies every function under --root with trivial_summary and prints how many
+match each template, with examples, and the classifier's own cost. With --model
+it also times the function model on exactly those functions (fast path off, no
+cache), which is the wall-clock time the fast path saves on this repository.
+
+Usage:
+    python benchmarks/bench_trivial.py --root path/to/repo --model
+"""
+import argparse
+import re
+import time
+from collections import Counter
+
+from common import REPO_ROOT
+from src.config import Config
+from src.repository import iter_repository_functions
+from src.trivial import trivial_summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", default=REPO_ROOT, help="Repository or .zip archive to scan.")
+    parser.add_argument("--model", action="store_true", help="Also time the model on the trivial functions.")
+    parser.add_argument("--batch-size", type=int, default=Config.FUNCTION_BATCH_SIZE)
+    args = parser.parse_args()
+
+    records = list(iter_repository_functions(args.root))
+    start = time.perf_counter()
+    summaries = [trivial_summary(record.code, record.decorators) for record in records]
+    classify_ms = (time.perf_counter() - start) * 1000
+    trivial = [(record, summary) for record, summary in zip(records, summaries) if summary is not None]
+
+    # Group templates by their fixed text, e.g. "Returns attribute `...`"
+    shapes = Counter(re.sub(r"`[^`]*`", "`...`", summary) for _, summary in trivial)
+    print(f"{len(trivial)} of {len(records)} functions are trivial ({len(trivial) / max(1, len(records)):.0%})")
+    print(f"classifier: {classify_ms:.1f} ms total, {classify_ms / max(1, len(records)):.3f} ms per function\n")
+    for shape, count in shapes.most_common():
+        example = next(record.qualname for record, summary in trivial if re.sub(r"`[^`]*`", "`...`", summary) == shape)
+        print(f"{count:>6}  {shape:<45} e.g. {example}")
+
+    if args.model and trivial:
+        from src.summarizer import Summarizer
+
+        summarizer = Summarizer(
+            function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
+            groq_api_key=Config.GROQ_API_KEY,
+            groq_model=Config.GROQ_MODEL,
+            device=Config.FUNCTION_MODEL_DEVICE,
+            dtype=Config.FUNCTION_MODEL_DTYPE,
+            backend=Config.FUNCTION_MODEL_BACKEND,
+            decoding_profile=Config.DECODING_PROFILE,
+            near_duplicate_threshold=0,
+            trivial_fast_path=False
+        )
+        summarizer.loaded_model
+        start = time.perf_counter()
+        summarizer.summarize_functions([record.code for record, _ in trivial], batch_size=args.batch_size)
+        model_seconds = time.perf_counter() - start
+        print(f"\nmodel on the trivial functions: {model_seconds:.2f}s; fast path: {classify_ms / 1000:.3f}s at most")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Measure function summarization throughput with 1..N forked inference workers.
+
+Each configuration splits the CPU cores evenly between its workers
+(torch.set_num_threads), so the comparison is N processes x cores/N threads
+against a single process using every core. Every run forks from a fresh process
+that has not run inference yet.
+
+Usage:
+    python benchmarks/bench_worker_pool.py --num-functions 128 --workers 1 2 4 8
+"""
+import argparse
+import multiprocessing
+import os
+import time
+
+from common import load_corpus
+from src.config import Config
+from src.summarizer import Summarizer
+from src.worker_pool import InferencePool
+
+
+def run(codes, workers, batch_size, results):
+    summarizer = Summarizer(
+        function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
+        groq_api_key=Config.GROQ_API_KEY or "unused",
+        groq_model=Config.GROQ_MODEL
+    )
+    with InferencePool(summarizer, workers=workers) as pool:
+        # Warm up every worker so the measured run does not pay one-off allocation costs
+        pool.generate(codes[:workers * 2], batch_size=2)
+        start = time.perf_counter()
+        # Bypass the cache and duplicate detection so every function is generated
+        pool.generate(codes, batch_size=batch_size)
+        results.put((time.perf_counter() - start, pool.threads_per_worker))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num-functions", type=int, default=128)
+    parser.add_argument("--batch-size", type=int, default=Config.FUNCTION_BATCH_SIZE)
+    cores = os.cpu_count() or 1
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[n for n in (1, 2, 4, 8, 16, 32) if n <= cores])
+    args = parser.parse_args()
+
+    codes = load_corpus(args.num_functions)
+    context = multiprocessing.get_context("fork")
+    print(f"{'workers':>8} {'threads':>8} {'seconds':>10} {'functions/s':>12} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        results = context.Queue()
+        process = context.Process(target=run, args=(codes, workers, args.batch_size, results))
+        process.start()
+        elapsed, threads = results.get()
+        process.join()
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {threads:>8} {elapsed:>10.2f} {len(codes) / elapsed:>12.2f} {baseline / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
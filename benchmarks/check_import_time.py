@@ -0,0 +1,89 @@
+"""
+Check that a parse-only CLI run starts fast and never imports the heavy dependencies.
+
+Runs ``python -X importtime -m src.cli --parse-only`` on one file several times,
+reports the slowest top-level imports and fails (exit code 1) if the median wall
+time exceeds the budget or torch, transformers, groq, httpx or streamlit was
+imported. Suitable as a CI step.
+
+Usage:
+    python benchmarks/check_import_time.py --budget-ms 200
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from common import REPO_ROOT
+
+HEAVY_MODULES = ("torch", "transformers", "groq", "httpx", "streamlit", "optimum")
+DEFAULT_BUDGET_MS = 200.0
+DEFAULT_TARGET = os.path.join("src", "code_parser.py")
+
+
+def run_once(target: str):
+    """Wall time in ms and (module, cumulative us) for each top-level import of one run."""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src.cli", "--parse-only", target, "-o", os.devnull],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if completed.returncode != 0:
+        raise SystemExit(f"Parse-only run failed with exit code {completed.returncode}:\n{completed.stderr}")
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part for part in line[len("import time:"):].split("|"))
+        imports.append((name[1:].rstrip(), int(cumulative)))
+    return elapsed, imports
+
+
+def heavy_imports(imports):
+    """Names of the imported modules that belong to a heavy dependency."""
+    return sorted({
+        name.strip() for name, _ in imports
+        if name.strip().split(".")[0] in HEAVY_MODULES
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="File to parse.")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to show.")
+    args = parser.parse_args()
+
+    results = [run_once(args.target) for _ in range(args.runs)]
+    median = statistics.median(elapsed for elapsed, _ in results)
+    _, imports = results[-1]
+    # Nested imports are indented below the module that triggered them
+    top_level = sorted(
+        ((name.strip(), us) for name, us in imports if not name.startswith("  ")),
+        key=lambda item: item[1],
+        reverse=True
+    )
+    print(f"{'module':<40} {'cumulative ms':>14}")
+    for name, us in top_level[:args.top]:
+        print(f"{name:<40} {us / 1000:>14.1f}")
+    heavy = heavy_imports(imports)
+    print(f"\nmedian wall time over {args.runs} runs: {median:.0f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: heavy modules imported: {', '.join(heavy)}")
+        failed = True
+    if median > args.budget_ms:
+        print("FAIL: over the startup budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
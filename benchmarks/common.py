@@ -0,0 +1,58 @@
+import os
+import sys
+from typing import List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from src.code_parser import extract_functions
+
+
+def load_corpus(num_functions: int, root: str = REPO_ROOT) -> List[str]:
+    """
+    Collect function sources from the Python files under root, repeated to size.
+    
+    Args:
+        num_functions (int): Number of function sources to return.
+        root (str): Directory to scan for .py files.
+    
+    Returns:
+        List[str]: Function source code, cycling through the discovered functions.
+    """
+    codes = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "__pycache__"]
+        for filename in sorted(filenames):
+            if filename.endswith(".py"):
+                codes.extend(func.code for func in extract_functions(os.path.join(dirpath, filename)))
+    if not codes:
+        raise RuntimeError(f"No functions found under {root}")
+    return [codes[i % len(codes)] for i in range(num_functions)]
+
+
+def rouge_l(candidate: str, reference: str) -> float:
+    """
+    ROUGE-L F1 between two summaries, over lower-cased whitespace tokens.
+    
+    Args:
+        candidate (str): Summary being evaluated.
+        reference (str): Reference summary.
+    
+    Returns:
+        float: F1 of the longest common subsequence, between 0 and 1.
+    """
+    a, b = candidate.lower().split(), reference.lower().split()
+    if not a or not b:
+        return float(a == b)
+    previous = [0] * (len(b) + 1)
+    for token in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(previous[j] + 1 if token == other else max(previous[j + 1], current[j]))
+        previous = current
+    lcs = previous[-1]
+    if lcs == 0:
+        return 0.0
+    precision, recall = lcs / len(a), lcs / len(b)
+    return 2 * precision * recall / (precision + recall)
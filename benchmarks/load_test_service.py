@@ -0,0 +1,108 @@
+"""
+Load-test a running summarization service (python -m src.service).
+
+Clients send one function per request, drawn from a configurable mix:
+"short" and "long" are the shorter and longer halves of the functions in this
+repository, and "repeat" cycles through a handful of functions so the summary
+cache and duplicate detection are exercised. Reports client-side latency
+percentiles and throughput, then the service's own batching statistics.
+
+Usage:
+    python -m src.service --max-batch-size 16 --max-wait-ms 10 &
+    python benchmarks/load_test_service.py --clients 32 --requests 2000 --mix short=0.6,long=0.3,repeat=0.1
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from common import load_corpus
+from src.service import LatencyStats
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("short", "long", "repeat"):
+            raise argparse.ArgumentTypeError(f"Unknown request kind {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def post(url: str, payload: Dict, timeout: float = 120.0) -> Dict:
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST"
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8600")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent clients, each with one request in flight.")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("short=0.6,long=0.3,repeat=0.1"))
+    parser.add_argument("--profile", help="Decoding profile to request (default: the service's).")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Distinct functions for short/long so they miss the cache; a few for repeats
+    codes = sorted(set(load_corpus(10000)), key=len)
+    pools: Dict[str, List[str]] = {
+        "short": codes[:len(codes) // 2],
+        "long": codes[len(codes) // 2:],
+        "repeat": codes[::max(1, len(codes) // 5)][:5]
+    }
+    rng = random.Random(args.seed)
+    kinds = rng.choices(list(args.mix), weights=list(args.mix.values()), k=args.requests)
+    plan = [(kind, rng.choice(pools[kind])) for kind in kinds]
+
+    latencies = {kind: LatencyStats() for kind in args.mix}
+    overall = LatencyStats()
+    errors = []
+    lock = threading.Lock()
+
+    def send(item):
+        kind, code = item
+        payload = {"code": code}
+        if args.profile:
+            payload["profile"] = args.profile
+        start = time.perf_counter()
+        try:
+            post(f"{args.url}/summarize", payload)
+        except (urllib.error.URLError, OSError) as e:
+            with lock:
+                errors.append(str(e))
+            return
+        elapsed = time.perf_counter() - start
+        latencies[kind].record(elapsed)
+        overall.record(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        list(executor.map(send, plan))
+    elapsed = time.perf_counter() - start
+
+    print(f"{'kind':>8} {'requests':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+    for kind, stats in list(latencies.items()) + [("all", overall)]:
+        p = stats.percentiles()
+        print(f"{kind:>8} {stats.count:>9} {p.get('p50', 0):>9.1f} {p.get('p90', 0):>9.1f} {p.get('p99', 0):>9.1f}")
+    print(f"\n{overall.count / elapsed:.1f} requests/s over {elapsed:.1f}s, {len(errors)} errors")
+    if errors:
+        print(f"first error: {errors[0]}")
+    with urllib.request.urlopen(f"{args.url}/stats", timeout=10) as response:
+        print(f"service stats: {json.dumps(json.loads(response.read()), indent=2)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Local stand-in for the Groq chat completions API.
+
+Serves POST /openai/v1/chat/completions (streaming and non-streaming) with a
+configurable latency and share of 429 responses (or a fixed number of 429s
+before the first success), and records request counts, peak concurrency and
+the number of distinct client connections. Point a Summarizer at it with
+groq_base_url=server.base_url.
+
+Usage:
+    python benchmarks/stub_groq_server.py --port 8765 --latency 0.5
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubGroqServer:
+    """Threaded HTTP server mimicking the chat completions endpoint."""
+
+    def __init__(self, latency: float = 0.2, rate_limit_share: float = 0.0, port: int = 0,
+                 reply: str = "The codebase parses Python files and summarizes their functions.",
+                 rate_limit_first: int = 0, retry_after: str = "0.1"):
+        self.latency = latency
+        self.rate_limit_share = rate_limit_share
+        self.rate_limit_first = rate_limit_first
+        self.retry_after = retry_after
+        self.reply = reply
+        self.requests = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections = set()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubGroqServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubGroqServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if self.path.rstrip("/") != "/openai/v1/chat/completions":
+                    return self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                with stub._lock:
+                    stub.requests += 1
+                    stub.connections.add(self.client_address)
+                    stub.in_flight += 1
+                    stub.peak_in_flight = max(stub.peak_in_flight, stub.in_flight)
+                    limited = stub.rate_limited < stub.rate_limit_first or random.random() < stub.rate_limit_share
+                    if limited:
+                        stub.rate_limited += 1
+                try:
+                    if limited:
+                        return self._send_json(429, {"error": {"message": "Rate limit reached", "type": "tokens"}},
+                                               {"retry-after": stub.retry_after})
+                    time.sleep(stub.latency)
+                    if body.get("stream"):
+                        self._send_stream(body)
+                    else:
+                        self._send_json(200, self._completion(body))
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def _completion(self, body):
+                prompt_tokens = sum(len(m.get("content", "")) for m in body.get("messages", [])) // 4
+                completion_tokens = len(stub.reply) // 4
+                return {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": stub.reply},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens
+                    }
+                }
+
+            def _send_json(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, body):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                words = stub.reply.split(" ")
+                for index, word in enumerate(words):
+                    chunk = {
+                        "id": "chatcmpl-stub",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": body.get("model", "stub"),
+                        "choices": [{
+                            "index": 0,
+                            "delta": {"content": word + ("" if index == len(words) - 1 else " ")},
+                            "finish_reason": None
+                        }]
+                    }
+                    self._write_chunk(f"data: {json.dumps(chunk)}\n\n")
+                self._write_chunk("data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _write_chunk(self, text):
+                data = text.encode("utf-8")
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--rate-limit-share", type=float, default=0.0)
+    args = parser.parse_args()
+    server = StubGroqServer(latency=args.latency, rate_limit_share=args.rate_limit_share, port=args.port)
+    with server:
+        print(f"Stub Groq API listening on {server.base_url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Headless batch entry point: ``python codesage.py PATH... [-o results.jsonl]``; see src/cli.py."""
+import sys
+
+from src.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
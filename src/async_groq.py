@@ -0,0 +1,216 @@
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional
+import logging
+
+import httpx
+from groq import APIConnectionError, APIStatusError, AsyncGroq
+
+from src.hierarchical import estimate_tokens
+from src.summarizer import FALLBACK_SUMMARY, Summarizer
+
+logger = logging.getLogger(__name__)
+
+class TokenBucket:
+    """Async token bucket that spreads requests to stay under a tokens-per-minute budget."""
+    
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.tokens = float(tokens_per_minute)
+        self.rate = tokens_per_minute / 60.0
+        self.updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    async def acquire(self, tokens: int):
+        """Wait until tokens are available, then take them."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        tokens = min(float(tokens), self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+    
+    def refund(self, tokens: int):
+        """Return over-estimated tokens (negative values charge extra usage)."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + tokens)
+
+class AsyncCodebaseSummarizer:
+    """
+    Concurrent codebase summaries over the Groq async client.
+    
+    One AsyncGroq client (and its HTTP connection pool) is shared by all requests.
+    A semaphore bounds the number of requests in flight, a token bucket keeps the
+    estimated usage under the tokens-per-minute budget, and 429/5xx responses and
+    connection errors are retried with exponential backoff and full jitter,
+    honouring Retry-After when the server sends it.
+    """
+    
+    def __init__(self, summarizer: Summarizer, max_concurrency: int = 4, tokens_per_minute: int = 6000,
+                 max_retries: int = 5, base_delay: float = 0.5, max_delay: float = 20.0):
+        """
+        Args:
+            summarizer (Summarizer): Supplies the API key, endpoint, model and prompt templates.
+            max_concurrency (int): Maximum requests in flight.
+            tokens_per_minute (int): Token budget shared by all requests.
+            max_retries (int): Retries per request on 429, 5xx and connection errors.
+            base_delay (float): Initial backoff in seconds.
+            max_delay (float): Backoff ceiling in seconds.
+        """
+        self.summarizer = summarizer
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.bucket = TokenBucket(tokens_per_minute)
+        self._client: Optional[AsyncGroq] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    def _ensure_client(self):
+        # Created lazily so they bind to the running event loop
+        if self._client is None:
+            limits = httpx.Limits(max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency)
+            self._client = AsyncGroq(
+                api_key=self.summarizer.groq_api_key,
+                base_url=self.summarizer.groq_base_url,
+                max_retries=0,
+                http_client=httpx.AsyncClient(limits=limits, timeout=60.0)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+    
+    async def aclose(self):
+        """Close the shared HTTP connection pool."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+            self._semaphore = None
+    
+    async def __aenter__(self) -> "AsyncCodebaseSummarizer":
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def complete(self, prompt: str, max_tokens: int = 200) -> str:
+        """
+        Run one chat completion under the concurrency and token budgets.
+        
+        Args:
+            prompt (str): User prompt.
+            max_tokens (int): Completion token limit.
+        
+        Returns:
+            str: The stripped completion text.
+        """
+        self._ensure_client()
+        estimate = estimate_tokens(prompt) + max_tokens
+        for attempt in range(self.max_retries + 1):
+            # Every attempt counts against the budget, so retries after a 429 cannot burst past it
+            await self.bucket.acquire(estimate)
+            try:
+                async with self._semaphore:
+                    response = await self._client.chat.completions.create(
+                        model=self.summarizer.groq_model,
+                        messages=[
+                            {"role": "system", "content": "You are an expert summarizer. Provide clear, concise, and accurate summaries."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        max_tokens=max_tokens,
+                        temperature=0.3,
+                        top_p=0.9
+                    )
+                if response.usage is not None:
+                    self.bucket.refund(estimate - response.usage.total_tokens)
+                return (response.choices[0].message.content or "").strip()
+            except (APIConnectionError, APIStatusError) as e:
+                status = getattr(e, "status_code", None)
+                retryable = status is None or status == 429 or status >= 500
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+                retry_after = getattr(e, "response", None) and e.response.headers.get("retry-after")
+                if retry_after:
+                    try:
+                        delay = max(delay, float(retry_after))
+                    except ValueError:
+                        pass
+                logger.warning(f"Groq request failed ({status or e}), retrying in {delay:.2f}s")
+                # Back off without holding a concurrency slot
+                await asyncio.sleep(delay)
+    
+    async def summarize_codebase(self, function_summaries: List[str], user_type: str = "product_manager") -> str:
+        """
+        Async counterpart of Summarizer.summarize_codebase, sharing its response cache.
+        
+        Args:
+            function_summaries (List[str]): List of function summaries.
+            user_type (str): Type of user (product_manager, developer, manager).
+        
+        Returns:
+            str: Overall summary or fallback message.
+        """
+        cache = self.summarizer.response_cache
+        if cache is None:
+            return await self._summarize_codebase(function_summaries, user_type)
+        key = self.summarizer.codebase_cache_key(function_summaries, user_type)
+        future, leader = cache.begin(key)
+        if not leader:
+            return await asyncio.wrap_future(future)
+        try:
+            summary = await self._summarize_codebase(function_summaries, user_type)
+        except BaseException as e:
+            cache.fail(key, e)
+            raise
+        cache.finish(key, summary, store=summary != FALLBACK_SUMMARY)
+        return summary
+    
+    async def _summarize_codebase(self, function_summaries: List[str], user_type: str) -> str:
+        prompt = self.summarizer.build_codebase_prompt(function_summaries, user_type)
+        try:
+            return self.summarizer.finalize_codebase_summary(await self.complete(prompt))
+        except Exception as e:
+            logger.error(f"Error generating {user_type} summary with Groq API: {e}")
+            return FALLBACK_SUMMARY
+    
+    async def summarize_perspectives(self, function_summaries: List[str], user_types: List[str]) -> Dict[str, str]:
+        """
+        Generate several perspectives of the same codebase concurrently.
+        
+        Args:
+            function_summaries (List[str]): List of function summaries.
+            user_types (List[str]): Perspectives to generate.
+        
+        Returns:
+            Dict[str, str]: Summary per perspective.
+        """
+        summaries = await asyncio.gather(
+            *(self.summarize_codebase(function_summaries, user_type) for user_type in user_types)
+        )
+        return dict(zip(user_types, summaries))
+    
+    async def summarize_many(self, summary_groups: Dict[str, List[str]], user_type: str = "product_manager") -> Dict[str, str]:
+        """
+        Summarize many independent groups (e.g. one per file) concurrently.
+        
+        Args:
+            summary_groups (Dict[str, List[str]]): Function summaries per group name.
+            user_type (str): Perspective used for every group.
+        
+        Returns:
+            Dict[str, str]: Summary per group name.
+        """
+        names = list(summary_groups)
+        summaries = await asyncio.gather(
+            *(self.summarize_codebase(summary_groups[name], user_type) for name in names)
+        )
+        return dict(zip(names, summaries))
@@ -0,0 +1,345 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+import logging
+
+from src.code_parser import FunctionRecord, extract_functions
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Exit codes
+EXIT_OK = 0
+# Some function or codebase summaries could not be generated
+EXIT_FAILURES = 1
+# Bad arguments, missing paths or nothing to summarize
+EXIT_USAGE = 2
+
+PERSPECTIVES = ["product_manager", "developer", "manager"]
+
+def is_supported_input(path: str) -> bool:
+    """Whether a command line input is a .py file, a directory or a zip archive."""
+    if os.path.isdir(path):
+        return True
+    if path.endswith(".py"):
+        return os.path.isfile(path)
+    # Only loaded for inputs that are not plain sources
+    import zipfile
+    
+    return zipfile.is_zipfile(path)
+
+def iter_sources(paths: List[str], excludes: List[str], jobs: Optional[int], **extract_options) -> Iterator[FunctionRecord]:
+    """
+    Extract functions from .py files, directories and .zip archives.
+    
+    Args:
+        paths (List[str]): Inputs as given on the command line.
+        excludes (List[str]): Extra gitignore-style exclude patterns for directories and archives.
+        jobs (Optional[int]): Parser processes for directories and archives.
+        **extract_options: Keyword arguments forwarded to extract_functions.
+    
+    Returns:
+        Iterator[FunctionRecord]: Records whose 'file' is the input path, joined with the
+        path inside it for directories and archives.
+    """
+    for path in paths:
+        if os.path.isfile(path) and path.endswith(".py"):
+            # Records live until their row is written, after inference; a mapping of a file
+            # edited meanwhile would crash the process
+            for record in extract_functions(path, memory_map=False, **extract_options):
+                record.file = path.replace(os.sep, "/")
+                yield record
+        else:
+            # The process pool and archive support are only loaded when needed
+            from src.repository import iter_repository_functions
+            
+            prefix = path.replace(os.sep, "/").rstrip("/")
+            for record in iter_repository_functions(path, excludes, jobs, **extract_options):
+                record.file = f"{prefix}/{record.file}"
+                yield record
+
+class RowWriter:
+    """Writes result rows as JSON lines as they arrive, or as one Parquet table on close."""
+    
+    def __init__(self, output: str, fmt: str):
+        """
+        Args:
+            output (str): Output path, or "-" for stdout (JSONL only).
+            fmt (str): "jsonl" or "parquet".
+        """
+        self.output = output
+        self.fmt = fmt
+        self.rows: List[Dict] = []
+        if fmt == "parquet":
+            # Fail before any inference runs if the optional dependency is missing
+            import pyarrow  # noqa: F401
+            if output == "-":
+                raise ValueError("Parquet output needs a file path (--output)")
+            self._file = None
+        else:
+            self._file = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    
+    def write(self, row: Dict):
+        if self._file is not None:
+            self._file.write(json.dumps(row) + "\n")
+        else:
+            self.rows.append(row)
+    
+    def close(self):
+        if self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            
+            # Row kinds have different keys; from_pylist would keep only those of the first row
+            columns = list(dict.fromkeys(key for row in self.rows for key in row))
+            table = pa.Table.from_pydict({column: [row.get(column) for row in self.rows] for column in columns})
+            pq.write_table(table, self.output)
+        elif self._file is not sys.stdout:
+            self._file.close()
+        else:
+            self._file.flush()
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="codesage",
+        description="Summarize the functions of Python files, directories or zipped repositories."
+    )
+    parser.add_argument("paths", nargs="+", help=".py files, directories or .zip archives.")
+    parser.add_argument("-o", "--output", default="-", help="Output file (default: stdout).")
+    parser.add_argument("--format", choices=["jsonl", "parquet"],
+                        help="Output format (default: from the output extension, else jsonl). "
+                             "Parquet needs pyarrow.")
+    parser.add_argument("-j", "--jobs", type=int, help="Parser processes (default: one per CPU).")
+    parser.add_argument("--perspectives", nargs="*", default=[], metavar="PERSPECTIVE",
+                        help=f"Also write a codebase summary per perspective ({', '.join(PERSPECTIVES)}, or all), "
+                             "and a summary per file of directories and archives; needs GROQ_API_KEY.")
+    parser.add_argument("--exclude", action="append", default=[], help="Extra gitignore-style exclude pattern.")
+    parser.add_argument("--batch-size", type=int, default=Config.FUNCTION_BATCH_SIZE,
+                        help="Functions per generate call.")
+    parser.add_argument("--profile", choices=sorted(Config.DECODING_PROFILES),
+                        help="Decoding profile (default: chosen from the number of files, "
+                             "see BULK_BALANCED_MIN_FILES and BULK_FAST_MIN_FILES).")
+    parser.add_argument("--workers", type=int, default=Config.INFERENCE_WORKERS,
+                        help="Forked inference processes (default: INFERENCE_WORKERS; 0 runs in-process).")
+    parser.add_argument("--include-code", action="store_true", help="Include each function's source.")
+    parser.add_argument("--docstrings", action="store_true", default=Config.DOCSTRING_SUMMARIES,
+                        help="Summarize functions with a good docstring by its first sentence instead of the model "
+                             "(default: DOCSTRING_SUMMARIES).")
+    parser.add_argument("--no-docstrings", action="store_false", dest="docstrings",
+                        help="Run the model on documented functions too.")
+    parser.add_argument("--parse-only", action="store_true",
+                        help="Only extract functions; the model and Groq are never loaded.")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the summary cache.")
+    return parser
+
+def summarize_perspectives(summarizer, file_groups: Dict[str, List[str]], perspectives: List[str],
+                           hierarchical=None, file_summaries: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Codebase summary per perspective, condensing large codebases hierarchically first.
+    
+    Args:
+        summarizer (Summarizer): Writes the summaries.
+        file_groups (Dict[str, List[str]]): Function summaries per file (see group_by_file).
+        perspectives (List[str]): Perspectives to summarize for.
+        hierarchical (Optional[HierarchicalSummarizer]): Condenses large codebases; one is
+            created from the configuration if omitted.
+        file_summaries (Optional[Dict[str, str]]): File summaries the pipeline already produced.
+    
+    Returns:
+        Dict[str, str]: Summary per perspective.
+    """
+    import asyncio
+    
+    from src.async_groq import AsyncCodebaseSummarizer
+    from src.hierarchical import HierarchicalSummarizer, estimate_tokens
+    
+    inputs = [
+        summary for summaries in file_groups.values() for summary in summaries
+        if not summary.startswith("Error summarizing function")
+    ]
+    if sum(estimate_tokens(summary) for summary in inputs) > Config.HIERARCHICAL_TOKEN_BUDGET:
+        hierarchical = hierarchical or HierarchicalSummarizer(
+            summarizer,
+            token_budget=Config.HIERARCHICAL_TOKEN_BUDGET,
+            max_workers=Config.HIERARCHICAL_MAX_WORKERS
+        )
+        inputs = hierarchical.condense(file_groups, known=file_summaries).top_level
+    
+    async def run() -> Dict[str, str]:
+        async with AsyncCodebaseSummarizer(
+            summarizer,
+            max_concurrency=Config.GROQ_MAX_CONCURRENCY,
+            tokens_per_minute=Config.GROQ_TOKENS_PER_MINUTE
+        ) as remote:
+            return await remote.summarize_perspectives(inputs, perspectives)
+    
+    return asyncio.run(run())
+
+def parse_only(args: argparse.Namespace, writer: RowWriter, extract_options: Dict) -> int:
+    """Write the extracted function records without summarizing them."""
+    count = 0
+    try:
+        for record in iter_sources(args.paths, args.exclude, args.jobs, **extract_options):
+            writer.write(dict(record.to_dict(include_code=args.include_code), kind="function"))
+            count += 1
+    finally:
+        writer.close()
+    if not count:
+        logger.error(f"No functions found in {', '.join(args.paths)}")
+        return EXIT_USAGE
+    return EXIT_OK
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the batch CLI and return its exit code."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    perspectives = PERSPECTIVES if "all" in args.perspectives else list(dict.fromkeys(args.perspectives))
+    unknown = [p for p in perspectives if p not in PERSPECTIVES]
+    if unknown:
+        parser.error(f"unknown perspective(s) {', '.join(unknown)}; choose from {', '.join(PERSPECTIVES)} or all")
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing:
+        logger.error(f"Path(s) not found: {', '.join(missing)}")
+        return EXIT_USAGE
+    unsupported = [path for path in args.paths if not is_supported_input(path)]
+    if unsupported:
+        logger.error(f"Not a .py file, directory or .zip archive: {', '.join(unsupported)}")
+        return EXIT_USAGE
+    if perspectives and args.parse_only:
+        parser.error("--perspectives cannot be combined with --parse-only")
+    if perspectives and not Config.GROQ_API_KEY:
+        logger.error("--perspectives needs GROQ_API_KEY")
+        return EXIT_USAGE
+    fmt = args.format or ("parquet" if args.output.endswith(".parquet") else "jsonl")
+    try:
+        writer = RowWriter(args.output, fmt)
+    except (ImportError, OSError, ValueError) as e:
+        logger.error(f"Cannot write {fmt} output to {args.output}: {e}")
+        return EXIT_USAGE
+    extract_options = {
+        'fingerprint': Config.CACHE_KEY_MODE == "ast",
+        'exclude_nested': Config.EXCLUDE_NESTED_BODIES,
+        'docstrings': args.docstrings
+    }
+    if args.parse_only:
+        return parse_only(args, writer, extract_options)
+    
+    from src.hierarchical import HierarchicalSummarizer
+    from src.pipeline import FileResult, SummarizationPipeline
+    from src.repository import summarize_repository
+    from src.response_cache import shared_response_cache
+    from src.summarizer import FALLBACK_SUMMARY, Summarizer
+    from src.summary_cache import shared_cache
+    from src.worker_pool import InferencePool
+    
+    start = time.perf_counter()
+    summarizer = Summarizer(
+        function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
+        groq_api_key=Config.GROQ_API_KEY,
+        groq_model=Config.GROQ_MODEL,
+        device=Config.FUNCTION_MODEL_DEVICE,
+        dtype=Config.FUNCTION_MODEL_DTYPE,
+        cache=None if args.no_cache else shared_cache(Config.SUMMARY_CACHE_PATH, Config.SUMMARY_CACHE_MAX_ENTRIES),
+        groq_base_url=Config.GROQ_BASE_URL,
+        backend=Config.FUNCTION_MODEL_BACKEND,
+        decoding_profile=args.profile or Config.DECODING_PROFILE,
+        long_function_strategy=Config.LONG_FUNCTION_STRATEGY,
+        max_function_chunks=Config.MAX_FUNCTION_CHUNKS,
+        near_duplicate_threshold=Config.NEAR_DUPLICATE_THRESHOLD,
+        trivial_fast_path=Config.TRIVIAL_FAST_PATH,
+        response_cache=shared_response_cache(Config.GROQ_RESPONSE_CACHE_MAX_ENTRIES, Config.GROQ_RESPONSE_CACHE_TTL)
+    )
+    pool = None
+    # Summaries are only kept for the codebase summary; rows are written as they arrive
+    file_groups: Dict[str, List[str]] = {}
+    file_summaries: Dict[str, str] = {}
+    functions_done = 0
+    failures = 0
+    # Pipeline results arrive on its remote worker threads
+    lock = threading.Lock()
+    
+    def write_function(record: FunctionRecord, summary: str):
+        nonlocal failures, functions_done
+        row = dict(record.to_dict(include_code=args.include_code), kind="function", summary=summary)
+        with lock:
+            writer.write(row)
+            functions_done += 1
+            if summary.startswith("Error summarizing function"):
+                failures += 1
+            if perspectives:
+                file_groups.setdefault(record.file, []).append(summary)
+    
+    # Per-file remote summaries are only worth their Groq calls when the codebase summary needs them
+    hierarchical = None
+    if perspectives:
+        hierarchical = HierarchicalSummarizer(
+            summarizer,
+            token_budget=Config.HIERARCHICAL_TOKEN_BUDGET,
+            max_workers=Config.HIERARCHICAL_MAX_WORKERS
+        )
+    try:
+        if args.workers > 0:
+            pool = InferencePool(summarizer, args.workers, Config.INFERENCE_THREADS_PER_WORKER or None).start()
+        files = [path for path in args.paths if os.path.isfile(path) and path.endswith(".py")]
+        functions = iter_sources(files, args.exclude, args.jobs, **extract_options)
+        profile = args.profile or Config.bulk_decoding_profile(len(files))
+        for record, summary in summarize_repository(summarizer, functions, batch_size=args.batch_size, profile=profile):
+            write_function(record, summary)
+        # Directories and archives overlap parsing, inference and file summaries
+        pipeline = SummarizationPipeline(
+            summarizer,
+            batch_size=args.batch_size,
+            remote_workers=Config.HIERARCHICAL_MAX_WORKERS if hierarchical else 0,
+            hierarchical=hierarchical
+        )
+        for path in [path for path in args.paths if path not in files]:
+            prefix = path.replace(os.sep, "/").rstrip("/")
+            
+            def write_file(file_result: FileResult, prefix: str = prefix):
+                file = f"{prefix}/{file_result.path}"
+                for record, summary in zip(file_result.records, file_result.summaries):
+                    record.file = file
+                    write_function(record, summary)
+                if file_result.file_summary is not None:
+                    with lock:
+                        file_summaries[file] = file_result.file_summary
+                        writer.write({'kind': "file", 'file': file, 'summary': file_result.file_summary})
+            
+            pipeline.run(
+                path, args.exclude, args.jobs, on_file=write_file,
+                profile=args.profile, keep_results=False, **extract_options
+            )
+        if not functions_done:
+            logger.error(f"No functions found in {', '.join(args.paths)}")
+            return EXIT_USAGE
+        
+        codebase: Dict[str, str] = {}
+        if perspectives:
+            codebase = summarize_perspectives(summarizer, file_groups, perspectives, hierarchical, file_summaries)
+        for perspective in perspectives:
+            writer.write({'kind': "codebase", 'perspective': perspective, 'summary': codebase[perspective]})
+            if codebase[perspective] == FALLBACK_SUMMARY:
+                failures += 1
+    except KeyboardInterrupt:
+        logger.error("Interrupted")
+        return 130
+    finally:
+        if pool is not None:
+            pool.close()
+        writer.close()
+    
+    logger.info(
+        f"Summarized {functions_done} functions and {len(perspectives)} perspectives in "
+        f"{time.perf_counter() - start:.2f}s, {failures} failures"
+    )
+    logger.info(f"Inference: {summarizer.stats.report()}")
+    return EXIT_FAILURES if failures else EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
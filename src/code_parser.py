@@ -1,38 +1,333 @@
 import ast
-from typing import List, Dict
+import hashlib
+import io
+import mmap
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import logging
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-def extract_functions(file_path: str) -> List[Dict]:
+class SourceBuffer:
     """
-    Extracts individual function definitions from a Python script.
+    Read-only UTF-8 source shared by every record extracted from one file.
+    
+    Files are memory-mapped, so function text is only copied out of the page cache
+    when a slice is materialized. A mapping must not outlive edits to its file:
+    reading a slice of a file truncated in place kills the process with SIGBUS, so
+    records that are kept while the file may change should be read into bytes
+    instead. Pickling (e.g. to return records from a process pool) sends the bytes
+    once per pickled batch.
+    """
+    __slots__ = ("path", "data")
+    
+    def __init__(self, data: Union[bytes, mmap.mmap], path: Optional[str] = None):
+        self.path = path
+        self.data = data
+    
+    @classmethod
+    def open(cls, path: str, memory_map: bool = True) -> "SourceBuffer":
+        """Memory-map a file (or read it when memory_map is False); empty files get an empty buffer."""
+        with open(path, 'rb') as file:
+            if not memory_map:
+                return cls(file.read(), path)
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped
+                data = b""
+        return cls(data, path)
+    
+    def slice(self, start: int, end: int) -> str:
+        """Decode the bytes between two offsets, with CRLF line endings turned into LF."""
+        text = self.data[start:end].decode('utf-8')
+        return text.replace("\r\n", "\n") if "\r" in text else text
+    
+    def line_offsets(self) -> array:
+        """Byte offset at which each line starts; index 0 is line 1."""
+        offsets = array('q', [3 if self.data[:3] == b"\xef\xbb\xbf" else 0])
+        position = self.data.find(b"\n")
+        while position != -1:
+            offsets.append(position + 1)
+            position = self.data.find(b"\n", position + 1)
+        return offsets
+    
+    def __len__(self) -> int:
+        return len(self.data)
+    
+    def __reduce__(self):
+        return (SourceBuffer, (bytes(self.data), self.path))
+
+@dataclass(eq=False)
+class FunctionRecord:
+    """
+    A function extracted from a source file.
+    
+    The code is not stored; it is sliced from the shared SourceBuffer on access,
+    with any stubbed-out nested bodies (see FunctionExtractor) spliced in.
+    """
+    __slots__ = (
+        "name", "qualname", "line_start", "line_end", "decorators", "parent", "is_async",
+        "fingerprint", "docstring", "file", "source", "start", "end", "skips"
+    )
+    name: str
+    qualname: str
+    line_start: int
+    line_end: int
+    decorators: Tuple[str, ...]
+    parent: Optional[str]
+    is_async: bool
+    fingerprint: Optional[str]
+    # Only extracted with extract_functions(..., docstrings=True)
+    docstring: Optional[str]
+    file: Optional[str]
+    source: SourceBuffer
+    start: int
+    end: int
+    # (start, end, replacement) byte ranges replaced when the code is materialized
+    skips: Tuple[Tuple[int, int, str], ...]
+    
+    @property
+    def code(self) -> str:
+        """The function's source text, materialized from the shared buffer."""
+        if not self.skips:
+            return self.source.slice(self.start, self.end).strip()
+        parts = []
+        cursor = self.start
+        for skip_start, skip_end, replacement in self.skips:
+            parts.append(self.source.slice(cursor, skip_start))
+            parts.append(replacement)
+            cursor = skip_end
+        parts.append(self.source.slice(cursor, self.end))
+        return "".join(parts).strip()
+    
+    def to_dict(self, include_code: bool = True) -> Dict:
+        """
+        Convert to a plain dictionary, e.g. for JSON output.
+        
+        Args:
+            include_code (bool): Materialize and include the 'code' key.
+        
+        Returns:
+            Dict: The record's fields, without the source buffer and offsets.
+        """
+        record = {
+            'name': self.name,
+            'qualname': self.qualname,
+            'line_start': self.line_start,
+            'line_end': self.line_end,
+            'decorators': list(self.decorators),
+            'parent': self.parent,
+            'is_async': self.is_async,
+            'fingerprint': self.fingerprint,
+            'docstring': self.docstring,
+            'file': self.file
+        }
+        if include_code:
+            record['code'] = self.code
+        return record
+
+def strip_docstrings(tree: ast.AST) -> ast.AST:
+    """
+    Remove module, class and function docstrings from a tree in place.
     
     Args:
-        file_path (str): Path to the Python file.
+        tree (ast.AST): Parsed tree to modify.
     
     Returns:
-        List[Dict]: List of dictionaries containing function name, code, and line number.
-        Each dictionary has keys: 'name' (str), 'code' (str), 'line_start' (int).
+        ast.AST: The same tree, without docstring statements.
+    """
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)) and node.body:
+            first = node.body[0]
+            if isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant) and isinstance(first.value.value, str):
+                node.body = node.body[1:]
+    return tree
+
+def ast_fingerprint(node: ast.AST) -> str:
+    """
+    Build a canonical fingerprint of a node that ignores formatting and comments.
+    
+    Positions are left out of the dump, so whitespace, comment and (when the tree
+    was passed through strip_docstrings) docstring edits keep the same fingerprint.
+    
+    Args:
+        node (ast.AST): Node to fingerprint, typically a function definition.
+    
+    Returns:
+        str: Hex SHA-256 digest of the position-free AST dump.
+    """
+    return hashlib.sha256(ast.dump(node, include_attributes=False).encode("utf-8")).hexdigest()
+
+class FunctionExtractor(ast.NodeVisitor):
+    """
+    Collects function and method definitions in a single traversal.
+    
+    Records carry qualified names in the style of __qualname__ (``Class.method``,
+    ``outer.<locals>.inner``), the end line, decorator source, and the qualified
+    name of the enclosing function or class.
+    """
+    
+    def __init__(self, source: SourceBuffer, fingerprint: bool = False, exclude_nested: bool = False,
+                 docstrings: Optional[Dict[ast.AST, Optional[str]]] = None):
+        """
+        Args:
+            source (SourceBuffer): Source the tree was parsed from.
+            fingerprint (bool): Add an AST fingerprint to each record.
+            exclude_nested (bool): Replace nested function bodies in a parent's code
+                with a one-line stub, so each body is only summarized once.
+            docstrings (Optional[Dict[ast.AST, Optional[str]]]): Docstring of each function
+                node, collected before any docstrings were stripped from the tree.
+        """
+        self.source = source
+        self.line_offsets = source.line_offsets()
+        self.fingerprint = fingerprint
+        self.exclude_nested = exclude_nested
+        self.docstrings = docstrings
+        self.functions: List[FunctionRecord] = []
+        self._scopes: List[tuple] = []
+    
+    def visit_ClassDef(self, node: ast.ClassDef):
+        self._scopes.append((self._qualname(node.name), 'class'))
+        self.generic_visit(node)
+        self._scopes.pop()
+    
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self._visit_function(node)
+    
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
+        self._visit_function(node)
+    
+    def _qualname(self, name: str) -> str:
+        if not self._scopes:
+            return name
+        parent, kind = self._scopes[-1]
+        return f"{parent}.<locals>.{name}" if kind == 'function' else f"{parent}.{name}"
+    
+    def _offset(self, lineno: int, col_offset: int) -> int:
+        # ast column offsets are UTF-8 byte offsets, so they index the buffer directly
+        return self.line_offsets[lineno - 1] + col_offset
+    
+    def _line_end(self, lineno: int) -> int:
+        return self.line_offsets[lineno] - 1 if lineno < len(self.line_offsets) else len(self.source)
+    
+    def _visit_function(self, node):
+        qualname = self._qualname(node.name)
+        skips = ()
+        if self.exclude_nested:
+            skips = tuple(
+                (
+                    self.line_offsets[min([nested.lineno] + [d.lineno for d in nested.decorator_list]) - 1],
+                    self._line_end(nested.end_lineno),
+                    " " * nested.col_offset
+                    + ("async def" if isinstance(nested, ast.AsyncFunctionDef) else "def")
+                    + f" {nested.name}(...): ..."
+                )
+                for nested in _nested_functions(node)
+            )
+        self.functions.append(FunctionRecord(
+            name=node.name,
+            qualname=qualname,
+            line_start=node.lineno,
+            line_end=node.end_lineno,
+            decorators=tuple(
+                self.source.slice(self._offset(d.lineno, d.col_offset), self._offset(d.end_lineno, d.end_col_offset))
+                for d in node.decorator_list
+            ),
+            parent=self._scopes[-1][0] if self._scopes else None,
+            is_async=isinstance(node, ast.AsyncFunctionDef),
+            fingerprint=ast_fingerprint(node) if self.fingerprint else None,
+            docstring=self.docstrings.get(node) if self.docstrings is not None else None,
+            file=None,
+            source=self.source,
+            start=self.line_offsets[node.lineno - 1],
+            end=self._line_end(node.end_lineno),
+            skips=skips
+        ))
+        self._scopes.append((qualname, 'function'))
+        self.generic_visit(node)
+        self._scopes.pop()
+
+def _declared_encoding(data: Union[bytes, mmap.mmap]) -> str:
+    """Source encoding from a PEP 263 coding declaration in the first two lines, else UTF-8."""
+    end = 0
+    for _ in range(2):
+        newline = data.find(b"\n", end)
+        if newline == -1:
+            end = len(data)
+            break
+        end = newline + 1
+    head = bytes(data[:end])
+    if b"coding" not in head:
+        return "utf-8"
+    # Only loaded for the rare file that declares an encoding
+    import tokenize
+    
+    return tokenize.detect_encoding(io.BytesIO(head).readline)[0]
+
+def _nested_functions(node: ast.AST) -> List[ast.AST]:
+    """Outermost function definitions inside node's body, in source order."""
+    nested = []
+    stack = list(reversed(list(ast.iter_child_nodes(node))))
+    while stack:
+        child = stack.pop()
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            nested.append(child)
+        else:
+            stack.extend(reversed(list(ast.iter_child_nodes(child))))
+    return nested
+
+def extract_functions(file_path: str, fingerprint: bool = False, exclude_nested: bool = False,
+                      source: Optional[Union[str, bytes]] = None, docstrings: bool = False,
+                      memory_map: bool = True) -> List[FunctionRecord]:
+    """
+    Extracts function, method and async function definitions from a Python script.
+    
+    The file is memory-mapped and shared by all returned records; each record's
+    code is only decoded when its ``code`` attribute is read. Callers that keep the
+    records while the file may be edited (e.g. across long inference on a working
+    tree) should pass memory_map=False. In-memory source (e.g. an upload) is parsed
+    directly, without touching the filesystem. Sources that declare another
+    encoding (PEP 263) are transcoded to UTF-8 in memory first, since record
+    offsets and slices are UTF-8.
+    
+    Args:
+        file_path (str): Path to the Python file, or only a name for logging when source is given.
+        fingerprint (bool): Also compute a docstring- and formatting-insensitive AST fingerprint.
+        exclude_nested (bool): Stub out nested function bodies in their parent's code.
+        source (Optional[Union[str, bytes]]): Source text or UTF-8 bytes to parse instead of reading file_path.
+        docstrings (bool): Also record each function's docstring (ast.get_docstring).
+        memory_map (bool): Map the file instead of reading it into memory (see SourceBuffer).
+    
+    Returns:
+        List[FunctionRecord]: One record per function, in source order.
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            code = file.read()
-        tree = ast.parse(code)
-        functions = []
-        code_lines = code.splitlines()
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                start_line = node.lineno - 1
-                end_line = node.end_lineno
-                # Extract function code, handling edge cases
-                function_code = '\n'.join(code_lines[start_line:end_line]) if start_line < len(code_lines) else ""
-                functions.append({
-                    'name': node.name,
-                    'code': function_code.strip(),
-                    'line_start': node.lineno
-                })
+        if source is None:
+            buffer = SourceBuffer.open(file_path, memory_map)
+        else:
+            buffer = SourceBuffer(source.encode('utf-8') if isinstance(source, str) else bytes(source), file_path)
+        encoding = _declared_encoding(buffer.data)
+        if encoding in ("utf-8", "utf-8-sig"):
+            tree = ast.parse(buffer.data)
+        else:
+            # A str is parsed without looking at the coding declaration, and its column
+            # offsets are UTF-8 byte offsets, matching the transcoded buffer
+            text = bytes(buffer.data).decode(encoding)
+            buffer = SourceBuffer(text.encode('utf-8'), buffer.path)
+            tree = ast.parse(text)
+        # Collected first: fingerprinting strips docstrings from the tree
+        docstring_map = {
+            node: ast.get_docstring(node)
+            for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        } if docstrings else None
+        if fingerprint:
+            strip_docstrings(tree)
+        extractor = FunctionExtractor(buffer, fingerprint=fingerprint, exclude_nested=exclude_nested,
+                                      docstrings=docstring_map)
+        extractor.visit(tree)
+        functions = extractor.functions
         logger.info(f"Extracted {len(functions)} functions from {file_path}")
         return functions
     except FileNotFoundError:
@@ -43,4 +338,55 @@ def extract_functions(file_path: str) -> List[Dict]:
         return []
     except Exception as e:
         logger.error(f"Unexpected error parsing file {file_path}: {e}")
-        return []
\ No newline at end of file
+        return []
+
+def split_function_source(code: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """
+    Split a long function into chunks at top-level statement boundaries.
+    
+    Every chunk repeats the function's signature lines, followed by a run of
+    consecutive body statements packed greedily so each chunk stays within
+    max_tokens. A single statement larger than the budget becomes its own chunk and
+    is left to the tokenizer's truncation. Comments between statements stay with
+    the statement before them.
+    
+    Args:
+        code (str): Source of one function, as returned by FunctionRecord.code.
+        max_tokens (int): Token budget of each chunk.
+        count_tokens (Callable[[str], int]): Token count of a piece of source text.
+    
+    Returns:
+        List[str]: The chunks in source order; [code] if it fits or cannot be split.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return [code]
+    if len(tree.body) != 1 or not isinstance(tree.body[0], (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return [code]
+    node = tree.body[0]
+    body = node.body
+    # A body on the def line cannot be split, and a single statement gains nothing
+    if len(body) < 2 or body[0].lineno == node.lineno or count_tokens(code) <= max_tokens:
+        return [code]
+    
+    lines = code.splitlines(keepends=True)
+    starts = [min([stmt.lineno] + [d.lineno for d in getattr(stmt, 'decorator_list', [])]) - 1 for stmt in body]
+    header = "".join(lines[:starts[0]])
+    budget = max_tokens - count_tokens(header)
+    if budget <= 0:
+        return [code]
+    
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for start, end in zip(starts, starts[1:] + [len(lines)]):
+        segment = "".join(lines[start:end])
+        tokens = count_tokens(segment)
+        if current and used + tokens > budget:
+            chunks.append(header + "".join(current))
+            current, used = [], 0
+        current.append(segment)
+        used += tokens
+    chunks.append(header + "".join(current))
+    return chunks
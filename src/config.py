@@ -1,8 +1,24 @@
 import os
-from dotenv import load_dotenv
 from typing import Optional
 
-load_dotenv()
+def _find_env_file() -> Optional[str]:
+    """The nearest .env in this package's directory or its parents, as python-dotenv searches."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(directory, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+# Settings are read at import, so the .env file must be applied first; python-dotenv
+# is only imported when there is one to load
+_env_file = _find_env_file()
+if _env_file is not None:
+    from dotenv import load_dotenv
+    load_dotenv(_env_file)
 
 class Config:
     """Configuration settings for the code summarization project"""
@@ -10,11 +26,69 @@ class Config:
     GROQ_API_KEY: Optional[str] = os.getenv("GROQ_API_KEY")
     FUNCTION_SUMMARIZER_MODEL: str = "Amitabhdas/Code-summarizer-python"
     GROQ_MODEL: str = "llama-3.1-8b-instant"
+    GROQ_BASE_URL: Optional[str] = os.getenv("GROQ_BASE_URL")
+    GROQ_MAX_CONCURRENCY: int = int(os.getenv("GROQ_MAX_CONCURRENCY", "4"))
+    GROQ_TOKENS_PER_MINUTE: int = int(os.getenv("GROQ_TOKENS_PER_MINUTE", "6000"))
+    FUNCTION_MODEL_DEVICE: str = os.getenv("FUNCTION_MODEL_DEVICE", "cpu")
+    FUNCTION_MODEL_DTYPE: str = os.getenv("FUNCTION_MODEL_DTYPE", "float32")
+    # "pytorch" (fp32 eager), "pytorch-int8" (dynamic int8 quantization) or "onnx" (ONNX Runtime)
+    FUNCTION_MODEL_BACKEND: str = os.getenv("FUNCTION_MODEL_BACKEND", "pytorch")
+    ONNX_EXPORT_DIR: str = os.getenv("ONNX_EXPORT_DIR", ".codesage_cache/onnx")
+    FUNCTION_BATCH_SIZE: int = int(os.getenv("FUNCTION_BATCH_SIZE", "8"))
+    # Generation settings per decoding profile; "quality" is the original 4-beam search
+    DECODING_PROFILES = {
+        "fast": {'max_length': 50, 'num_beams': 1},
+        "balanced": {'max_length': 50, 'num_beams': 2, 'early_stopping': True},
+        "quality": {'max_length': 50, 'num_beams': 4, 'early_stopping': True}
+    }
+    DECODING_PROFILE: str = os.getenv("DECODING_PROFILE", "quality")
+    # Repository-wide runs trade quality for throughput as the number of files grows
+    BULK_BALANCED_MIN_FILES: int = int(os.getenv("BULK_BALANCED_MIN_FILES", "100"))
+    BULK_FAST_MIN_FILES: int = int(os.getenv("BULK_FAST_MIN_FILES", "1000"))
+    # Functions longer than the model's input are split into "chunk"s or "truncate"d
+    LONG_FUNCTION_STRATEGY: str = os.getenv("LONG_FUNCTION_STRATEGY", "chunk")
+    MAX_FUNCTION_CHUNKS: int = int(os.getenv("MAX_FUNCTION_CHUNKS", "8"))
+    # Functions at least this similar (MinHash Jaccard over token shingles) share one summary; 0 disables
+    NEAR_DUPLICATE_THRESHOLD: float = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))
+    # Summarize getters, stubs and plain delegations from templates instead of the model
+    TRIVIAL_FAST_PATH: bool = os.getenv("TRIVIAL_FAST_PATH", "true").lower() == "true"
+    # Use the first sentence of a good docstring as the summary instead of running the model
+    DOCSTRING_SUMMARIES: bool = os.getenv("DOCSTRING_SUMMARIES", "false").lower() == "true"
+    # Forked inference processes for bulk runs (0 runs the model in-process)
+    INFERENCE_WORKERS: int = int(os.getenv("INFERENCE_WORKERS", "0"))
+    INFERENCE_THREADS_PER_WORKER: int = int(os.getenv("INFERENCE_THREADS_PER_WORKER", "0"))
+    # Local summarization service (python -m src.service)
+    SERVICE_HOST: str = os.getenv("SERVICE_HOST", "127.0.0.1")
+    SERVICE_PORT: int = int(os.getenv("SERVICE_PORT", "8600"))
+    SERVICE_MAX_BATCH_SIZE: int = int(os.getenv("SERVICE_MAX_BATCH_SIZE", "16"))
+    SERVICE_MAX_WAIT_MS: float = float(os.getenv("SERVICE_MAX_WAIT_MS", "10"))
+    SUMMARY_CACHE_PATH: str = os.getenv("SUMMARY_CACHE_PATH", ".codesage_cache/summaries.sqlite3")
+    SUMMARY_CACHE_MAX_ENTRIES: int = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "100000"))
+    # "source" keys summaries by normalized text, "ast" by a docstring/formatting-insensitive AST fingerprint
+    CACHE_KEY_MODE: str = os.getenv("CACHE_KEY_MODE", "source")
+    # Stub out nested function bodies in their parent's code so no body is summarized twice
+    EXCLUDE_NESTED_BODIES: bool = os.getenv("EXCLUDE_NESTED_BODIES", "false").lower() == "true"
+    # In-memory cache of codebase summaries from Groq, shared by all sessions of a process; a TTL of 0 disables it
+    GROQ_RESPONSE_CACHE_TTL: float = float(os.getenv("GROQ_RESPONSE_CACHE_TTL", "3600"))
+    GROQ_RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("GROQ_RESPONSE_CACHE_MAX_ENTRIES", "256"))
+    HIERARCHICAL_TOKEN_BUDGET: int = int(os.getenv("HIERARCHICAL_TOKEN_BUDGET", "3000"))
+    HIERARCHICAL_MAX_WORKERS: int = int(os.getenv("HIERARCHICAL_MAX_WORKERS", "4"))
+    # Minimum interval between re-renders of a streaming summary in the apps
+    STREAM_REFRESH_SECONDS: float = float(os.getenv("STREAM_REFRESH_SECONDS", "0.1"))
+
+    @staticmethod
+    def bulk_decoding_profile(num_files: int) -> str:
+        """Pick the decoding profile for a bulk run over num_files files, never slower than DECODING_PROFILE"""
+        if num_files >= Config.BULK_FAST_MIN_FILES or Config.DECODING_PROFILE == "fast":
+            return "fast"
+        if num_files >= Config.BULK_BALANCED_MIN_FILES or Config.DECODING_PROFILE == "balanced":
+            return "balanced"
+        return "quality"
 
     @staticmethod
-    def validate(api_key: Optional[str], file_path: Optional[str]):
-        """Validate the configuration settings"""
+    def validate(api_key: Optional[str] = None, file_path: Optional[str] = None):
+        """Validate the configuration settings, and the input file when one is given"""
         if not Config.GROQ_API_KEY:
             raise ValueError("GROQ_API_KEY not found. Please set it in the .env file.")
-        if not file_path or not os.path.exists(file_path):
+        if file_path is not None and not os.path.exists(file_path):
             raise FileNotFoundError(f"Input file {file_path} does not exist.")
\ No newline at end of file
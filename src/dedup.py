@@ -0,0 +1,170 @@
+import random
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+# Mersenne prime for the universal hash (a * x + b) mod p
+_PRIME = (1 << 61) - 1
+
+def shingles(code: str, size: int = 5) -> List[int]:
+    """
+    CRC32 hashes of the overlapping token n-grams of a piece of code.
+    
+    Args:
+        code (str): Source code.
+        size (int): Tokens per shingle.
+    
+    Returns:
+        List[int]: Distinct shingle hashes; one hash of all tokens for very short code.
+    """
+    tokens = _TOKEN.findall(code)
+    if len(tokens) <= size:
+        return [zlib.crc32(" ".join(tokens).encode("utf-8"))]
+    return list({zlib.crc32(" ".join(tokens[i:i + size]).encode("utf-8")) for i in range(len(tokens) - size + 1)})
+
+class NearDuplicateIndex:
+    """
+    Finds near-identical functions with MinHash signatures and LSH banding.
+    
+    Signatures use one-permutation MinHash: every shingle is hashed once and the
+    minimum is kept per bin of the hash range, with empty bins filled from their
+    neighbours, so a signature costs one pass over the shingles rather than one per
+    permutation. Every summarized function becomes a representative with its
+    signature indexed in bands of rows. A new function is looked up in the bands; candidates
+    whose estimated Jaccard similarity over token shingles reaches the threshold are
+    near duplicates and reuse the representative's summary. Matching only against
+    representatives (never members) keeps groups from drifting through chains of
+    small edits. The index persists across calls, so copies in later batches of a
+    run are caught too.
+    """
+    
+    def __init__(self, threshold: float = 0.9, num_perm: int = 64, bands: int = 8,
+                 shingle_size: int = 5, max_entries: int = 100000, seed: int = 1):
+        """
+        Args:
+            threshold (float): Minimum estimated Jaccard similarity to share a summary.
+            num_perm (int): MinHash signature length (number of bins).
+            bands (int): LSH bands; num_perm must be divisible by it. More bands find
+                less similar candidates at the cost of more comparisons.
+            shingle_size (int): Tokens per shingle.
+            max_entries (int): Representatives kept before the index is reset.
+            seed (int): Seed of the hash family, fixed so signatures are reproducible.
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_entries = max_entries
+        rng = random.Random(seed)
+        self._a, self._b = rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)
+        # Representatives as [signature, summary, namespace]; summary is None until generated
+        self._entries: List[list] = []
+        self._buckets: Dict[Tuple[str, int, int], List[int]] = {}
+        # Bumped on every reset so calls in flight do not touch reused entry ids
+        self._generation = 0
+        self._lock = threading.Lock()
+    
+    def signature(self, code: str) -> Tuple[int, ...]:
+        """MinHash signature of the code's token shingles."""
+        bins: List[Optional[int]] = [None] * self.num_perm
+        for x in shingles(code, self.shingle_size):
+            value = (self._a * x + self._b) % _PRIME
+            index, value = value % self.num_perm, value // self.num_perm
+            if bins[index] is None or value < bins[index]:
+                bins[index] = value
+        # Densify: an empty bin borrows the value of the next non-empty one, offset by
+        # the distance so borrowed values only collide when both sides borrow alike
+        signature = []
+        for index in range(self.num_perm):
+            for distance in range(self.num_perm):
+                value = bins[(index + distance) % self.num_perm]
+                if value is not None:
+                    signature.append(value + distance * _PRIME)
+                    break
+        return tuple(signature)
+    
+    def similarity(self, first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        """Estimated Jaccard similarity of two signatures."""
+        return sum(x == y for x, y in zip(first, second)) / self.num_perm
+    
+    def _band_keys(self, signature: Tuple[int, ...], namespace: str) -> List[Tuple[str, int, int]]:
+        return [
+            (namespace, band, hash(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+    
+    def _match(self, signature: Tuple[int, ...], namespace: str) -> Optional[int]:
+        best, best_similarity = None, self.threshold
+        seen = set()
+        for key in self._band_keys(signature, namespace):
+            for entry_id in self._buckets.get(key, ()):
+                if entry_id in seen:
+                    continue
+                seen.add(entry_id)
+                similarity = self.similarity(signature, self._entries[entry_id][0])
+                if similarity >= best_similarity:
+                    best, best_similarity = entry_id, similarity
+        return best
+    
+    def summarize(self, function_codes: List[str], generate, namespace: str = "") -> Tuple[List[str], List[int]]:
+        """
+        Summarize functions, running generate only once per group of near duplicates.
+        
+        Args:
+            function_codes (List[str]): Source code of each function (exact duplicates
+                are expected to have been removed already).
+            generate (Callable[[List[str]], List[str]]): Summarizes a list of functions.
+            namespace (str): Only functions in the same namespace (e.g. decoding settings)
+                share summaries.
+        
+        Returns:
+            Tuple[List[str], List[int]]: One summary per input in input order, and the
+            indices of the inputs served by a near duplicate instead of the model.
+        """
+        signatures = [self.signature(code) for code in function_codes]
+        with self._lock:
+            if len(self._entries) + len(function_codes) > self.max_entries:
+                logger.info(f"Near-duplicate index reached {len(self._entries)} entries; resetting it")
+                self._entries, self._buckets = [], {}
+                self._generation += 1
+            generation = self._generation
+            assignment: List[int] = []
+            representatives: List[int] = []
+            for index, signature in enumerate(signatures):
+                entry_id = self._match(signature, namespace)
+                if entry_id is None:
+                    entry_id = len(self._entries)
+                    self._entries.append([signature, None, namespace])
+                    for key in self._band_keys(signature, namespace):
+                        self._buckets.setdefault(key, []).append(entry_id)
+                    representatives.append(index)
+                assignment.append(entry_id)
+        
+        generated = generate([function_codes[i] for i in representatives]) if representatives else []
+        fresh = {assignment[index]: summary for index, summary in zip(representatives, generated)}
+        with self._lock:
+            current = generation == self._generation
+            if current:
+                for entry_id, summary in fresh.items():
+                    if not summary.startswith("Error summarizing function"):
+                        self._entries[entry_id][1] = summary
+            summaries = [
+                fresh.get(entry_id) or (self._entries[entry_id][1] if current else None)
+                for entry_id in assignment
+            ]
+        # A representative from another call may still be generating or may have failed;
+        # summarize those members themselves
+        missing = [index for index, summary in enumerate(summaries) if summary is None]
+        if missing:
+            for index, summary in zip(missing, generate([function_codes[i] for i in missing])):
+                summaries[index] = summary
+        generated_indices = set(representatives) | set(missing)
+        return summaries, [index for index in range(len(function_codes)) if index not in generated_indices]
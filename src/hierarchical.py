@@ -0,0 +1,233 @@
+import hashlib
+import json
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from src.code_parser import FunctionRecord
+from src.summary_cache import SummaryCache
+
+logger = logging.getLogger(__name__)
+
+# Tokens reserved in every request for the prompt template itself
+PROMPT_OVERHEAD_TOKENS = 200
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English and code (about four characters per token)."""
+    return len(text) // 4 + 1
+
+def group_by_file(records: List[FunctionRecord], summaries: List[str], default_file: str = "") -> Dict[str, List[str]]:
+    """
+    Group function summaries by the file their record came from.
+    
+    Args:
+        records (List[FunctionRecord]): Extracted functions.
+        summaries (List[str]): Summary of each record, in the same order.
+        default_file (str): File name for records without one (single-file uploads).
+    
+    Returns:
+        Dict[str, List[str]]: Function summaries per relative file path.
+    """
+    grouped: Dict[str, List[str]] = {}
+    for record, summary in zip(records, summaries):
+        grouped.setdefault(record.file or default_file, []).append(summary)
+    return grouped
+
+@dataclass
+class HierarchicalResult:
+    """Summaries produced at every level of a hierarchical run."""
+    summary: str
+    file_summaries: Dict[str, str] = field(default_factory=dict)
+    # Keyed by directory path relative to the repository root; "" is the root
+    package_summaries: Dict[str, str] = field(default_factory=dict)
+    # Root-level file and package summaries, already fitted to the token budget
+    top_level: List[str] = field(default_factory=list)
+    remote_calls: int = 0
+    cache_hits: int = 0
+
+class HierarchicalSummarizer:
+    """
+    Map-reduce codebase summarization: functions to files, files to packages, packages to the repo.
+    
+    Every request is kept within a token budget by condensing oversized groups in
+    chunks. Groups at the same level run concurrently, and intermediate summaries
+    are cached by their inputs, so editing one file only recomputes the summaries
+    on its path up to the root.
+    """
+    
+    def __init__(self, summarizer, token_budget: int = 3000, max_workers: int = 4,
+                 cache: Optional[SummaryCache] = None):
+        """
+        Args:
+            summarizer (Summarizer): Provides summarize_group and summarize_codebase.
+            token_budget (int): Maximum estimated prompt tokens per request.
+            max_workers (int): Groups summarized concurrently at each level.
+            cache (Optional[SummaryCache]): Store for intermediate summaries (defaults to the
+                summarizer's cache).
+        """
+        self.summarizer = summarizer
+        self.token_budget = max(token_budget - PROMPT_OVERHEAD_TOKENS, 100)
+        self.max_workers = max_workers
+        self.cache = cache if cache is not None else getattr(summarizer, "cache", None)
+        self._lock = threading.Lock()
+        self._remote_calls = 0
+        self._cache_hits = 0
+    
+    def summarize(self, file_summaries: Dict[str, List[str]], user_type: str = "product_manager") -> HierarchicalResult:
+        """
+        Summarize a codebase bottom-up from its function summaries.
+        
+        Args:
+            file_summaries (Dict[str, List[str]]): Function summaries per '/'-separated
+                relative file path (see group_by_file).
+            user_type (str): Perspective of the final summary (product_manager, developer, manager).
+        
+        Returns:
+            HierarchicalResult: The final summary and all intermediate summaries.
+        """
+        result = self.condense(file_summaries)
+        result.summary = self.summarizer.summarize_codebase(result.top_level, user_type)
+        result.package_summaries[""] = result.summary
+        result.remote_calls += 1
+        return result
+    
+    def condense(self, file_summaries: Dict[str, List[str]], known: Optional[Dict[str, str]] = None) -> HierarchicalResult:
+        """
+        Run the file and package levels, stopping short of the final perspective summary.
+        
+        The returned top_level items can be passed to summarize_codebase or
+        stream_codebase_summary.
+        
+        Args:
+            file_summaries (Dict[str, List[str]]): Function summaries per '/'-separated
+                relative file path (see group_by_file).
+            known (Optional[Dict[str, str]]): File summaries already produced, e.g. by
+                SummarizationPipeline; only the other files are condensed.
+        
+        Returns:
+            HierarchicalResult: File and package summaries, with an empty summary.
+        """
+        self._remote_calls = 0
+        self._cache_hits = 0
+        known = known or {}
+        result = HierarchicalResult(summary="")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            paths = sorted(path for path, summaries in file_summaries.items() if summaries)
+            missing = [path for path in paths if path not in known]
+            condensed = executor.map(lambda path: self._reduce(file_summaries[path], "file"), missing)
+            result.file_summaries = {path: known[path] for path in paths if path in known}
+            result.file_summaries.update(zip(missing, condensed))
+            
+            children: Dict[str, List[Tuple[str, bool]]] = {"": []}
+            for path in paths:
+                child, is_file = path, True
+                while True:
+                    parent = posixpath.dirname(child)
+                    parent_seen = parent in children
+                    children.setdefault(parent, []).append((child, is_file))
+                    if parent_seen or parent == "":
+                        break
+                    child, is_file = parent, False
+            
+            # Deepest packages first, so each level only needs the one below it
+            depths: Dict[int, List[str]] = {}
+            for directory in children:
+                if directory:
+                    depths.setdefault(directory.count("/") + 1, []).append(directory)
+            for depth in sorted(depths, reverse=True):
+                directories = sorted(depths[depth])
+                condensed = executor.map(
+                    lambda directory: self._reduce(self._child_summaries(children[directory], result), "package"),
+                    directories
+                )
+                result.package_summaries.update(zip(directories, condensed))
+        
+        result.top_level = self._fit(self._child_summaries(children[""], result))
+        result.remote_calls = self._remote_calls
+        result.cache_hits = self._cache_hits
+        logger.info(
+            f"Condensed {len(result.file_summaries)} files and {len(result.package_summaries)} packages: "
+            f"{result.remote_calls} remote calls, {result.cache_hits} cache hits"
+        )
+        return result
+    
+    def summarize_file(self, function_summaries: List[str]) -> str:
+        """
+        Condense one file's function summaries, using the same cache entries as condense.
+        
+        Args:
+            function_summaries (List[str]): Summaries of the file's functions.
+        
+        Returns:
+            str: The file summary.
+        """
+        return self._reduce(function_summaries, "file")
+    
+    @staticmethod
+    def _child_summaries(members: List[Tuple[str, bool]], result: HierarchicalResult) -> List[str]:
+        summaries = []
+        for path, is_file in sorted(members):
+            summary = result.file_summaries[path] if is_file else result.package_summaries[path]
+            summaries.append(f"{path}: {summary}")
+        return summaries
+    
+    def _chunks(self, items: List[str]) -> List[List[str]]:
+        """Pack items greedily into chunks that fit the token budget."""
+        chunks: List[List[str]] = [[]]
+        used = 0
+        for item in items:
+            cost = estimate_tokens(item)
+            if chunks[-1] and used + cost > self.token_budget:
+                chunks.append([])
+                used = 0
+            chunks[-1].append(item[:self.token_budget * 4])
+            used += cost
+        return chunks
+    
+    def _fit(self, items: List[str]) -> List[str]:
+        """Condense items chunk by chunk until together they fit one request."""
+        while len(items) > 1 and sum(estimate_tokens(item) for item in items) > self.token_budget:
+            chunks = self._chunks(items)
+            if len(chunks) == len(items):
+                # Every item fills a request on its own; condense pairs of halves so each round still shrinks
+                share = (self.token_budget // 2 - 1) * 4
+                chunks = [[item[:share] for item in items[i:i + 2]] for i in range(0, len(items), 2)]
+            items = [self._condense(chunk, "package") for chunk in chunks]
+        return items
+    
+    def _reduce(self, items: List[str], level: str) -> str:
+        """Condense items into a single summary, in several rounds if they exceed the budget."""
+        items = self._fit(items)
+        if len(items) == 1:
+            return items[0]
+        return self._condense(items, level)
+    
+    def _condense(self, items: List[str], level: str) -> str:
+        if len(items) == 1:
+            return items[0]
+        key = None
+        if self.cache is not None:
+            payload = json.dumps({
+                'level': level,
+                'prompt_version': self.summarizer.group_prompt_version,
+                'model': self.summarizer.groq_model,
+                'items': items
+            })
+            key = "group:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+            cached = self.cache.get(key)
+            if cached is not None:
+                with self._lock:
+                    self._cache_hits += 1
+                return cached
+        summary = self.summarizer.summarize_group(items, level)
+        with self._lock:
+            self._remote_calls += 1
+        if summary is None:
+            # Keep going with a lossy join rather than failing the whole run
+            return "; ".join(items)[:self.summarizer.group_max_tokens * 4]
+        if key is not None:
+            self.cache.put(key, summary)
+        return summary
@@ -0,0 +1,325 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from src.code_parser import FunctionRecord, extract_functions
+from src.config import Config
+from src.repository import IgnoreRules, iter_python_files
+from src.summary_cache import normalize_source
+
+logger = logging.getLogger(__name__)
+
+HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+def _git(repo_root: str, *args: str) -> str:
+    return subprocess.run(
+        ["git", *args], cwd=repo_root, check=True, capture_output=True, text=True
+    ).stdout
+
+def git_head(repo_root: str) -> Optional[str]:
+    """Return the commit checked out in repo_root, or None if it is not a git repository."""
+    try:
+        return _git(repo_root, "rev-parse", "HEAD").strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def git_changed_ranges(repo_root: str, base_ref: str) -> Dict[str, Optional[List[Tuple[int, int]]]]:
+    """
+    List the Python files changed since base_ref and the new-side line ranges of each change.
+    
+    The working tree is compared against base_ref, so uncommitted edits are included.
+    Untracked files and files added since base_ref map to None (the whole file is new);
+    deleted files map to an empty list.
+    
+    Args:
+        repo_root (str): Root of the git repository.
+        base_ref (str): Commit or ref to diff against.
+    
+    Returns:
+        Dict[str, Optional[List[Tuple[int, int]]]]: Inclusive (first, last) line ranges
+        per path relative to repo_root.
+    """
+    changes: Dict[str, Optional[List[Tuple[int, int]]]] = {}
+    diff = _git(repo_root, "diff", "--unified=0", "--no-color", "--no-renames",
+                "--src-prefix=a/", "--dst-prefix=b/", base_ref, "--", "*.py")
+    path = None
+    for line in diff.splitlines():
+        if line.startswith("--- "):
+            old_path = line[4:]
+        elif line.startswith("+++ "):
+            new_path = line[4:]
+            if new_path == "/dev/null":
+                path = old_path[2:]
+                changes[path] = []
+            else:
+                path = new_path[2:]
+                changes[path] = None if old_path == "/dev/null" else []
+        elif path is not None and changes.get(path) is not None:
+            match = HUNK_HEADER.match(line)
+            if match:
+                start = int(match.group(1))
+                count = int(match.group(2)) if match.group(2) is not None else 1
+                # A pure deletion (count 0) sits between line start and start + 1
+                changes[path].append((start, start + max(count - 1, 1)))
+    for path in _git(repo_root, "ls-files", "--others", "--exclude-standard", "--", "*.py").splitlines():
+        changes[path] = None
+    return changes
+
+def _file_hash(path: str) -> str:
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+def _code_hash(code: str) -> str:
+    return hashlib.sha256(normalize_source(code).encode("utf-8")).hexdigest()
+
+@dataclass
+class IncrementalResult:
+    """Outcome of an incremental summarization run."""
+    files_changed: int = 0
+    files_removed: int = 0
+    functions_total: int = 0
+    functions_resummarized: int = 0
+    elapsed: float = 0.0
+    codebase_summaries: Dict[str, str] = field(default_factory=dict)
+
+class IncrementalIndex:
+    """
+    Function summaries of one repository, persisted as a JSON manifest between runs.
+    
+    The manifest records each file's content hash and, per function, its qualified
+    name, span, code hash and summary, plus the git commit it was built from.
+    """
+    
+    def __init__(self, repo_root: str, manifest_path: Optional[str] = None,
+                 excludes: Optional[List[str]] = None, extract_options: Optional[Dict] = None):
+        """
+        Args:
+            repo_root (str): Repository to summarize.
+            manifest_path (Optional[str]): Manifest file (defaults to .codesage_cache/manifest.json
+                inside repo_root).
+            excludes (Optional[List[str]]): Extra gitignore-style exclude patterns.
+            extract_options (Optional[Dict]): Keyword arguments forwarded to extract_functions.
+        """
+        self.repo_root = repo_root
+        self.manifest_path = manifest_path or os.path.join(repo_root, ".codesage_cache", "manifest.json")
+        self.excludes = excludes
+        self.extract_options = extract_options or {}
+        self.commit: Optional[str] = None
+        self.files: Dict[str, Dict] = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+            self.commit = manifest.get('commit')
+            self.files = manifest.get('files', {})
+    
+    def save(self):
+        """Write the manifest to disk."""
+        directory = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.manifest_path, 'w', encoding='utf-8') as file:
+            json.dump({'commit': self.commit, 'files': self.files}, file, indent=1)
+    
+    def summaries(self) -> List[str]:
+        """All stored function summaries, ordered by file path and position."""
+        return [
+            function['summary']
+            for path in sorted(self.files)
+            for function in self.files[path]['functions']
+        ]
+    
+    def _changed_files(self, base_ref: Optional[str]) -> Tuple[Dict[str, Optional[List[Tuple[int, int]]]], bool]:
+        """Changed paths with line ranges (None for whole file), and whether git supplied them."""
+        if base_ref and self.files:
+            try:
+                rules = IgnoreRules.from_directory(self.repo_root, self.excludes)
+                changes = git_changed_ranges(self.repo_root, base_ref)
+                changes = {path: ranges for path, ranges in changes.items() if not rules.excludes_file(path)}
+                for path, stored in self.files.items():
+                    if path in changes:
+                        continue
+                    full_path = os.path.join(self.repo_root, path)
+                    # Files summarized while untracked never show up in the diff once deleted
+                    if not os.path.exists(full_path):
+                        changes[path] = []
+                    # Uncommitted edits summarized last run and since reverted match base_ref again
+                    elif stored['sha256'] != _file_hash(full_path):
+                        changes[path] = None
+                return changes, True
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.warning(f"git diff against {base_ref} failed, falling back to file hashes: {e}")
+        changes = {}
+        present = set()
+        for path in iter_python_files(self.repo_root, self.excludes):
+            present.add(path)
+            stored = self.files.get(path)
+            if stored is None or stored['sha256'] != _file_hash(os.path.join(self.repo_root, path)):
+                changes[path] = None
+        for path in set(self.files) - present:
+            changes[path] = []
+        return changes, False
+    
+    def update(self, summarizer, base_ref: Optional[str] = None, batch_size: int = 8,
+               perspectives: Optional[List[str]] = None, profile: Optional[str] = None) -> IncrementalResult:
+        """
+        Re-summarize only the functions whose spans changed, then rebuild the codebase summaries.
+        
+        Args:
+            summarizer (Summarizer): Summarizer used for functions and the codebase.
+            base_ref (Optional[str]): Git ref to diff against; defaults to the commit stored
+                in the manifest. Without git, changed files are found by content hash.
+            batch_size (int): Functions per generate call.
+            perspectives (Optional[List[str]]): Perspectives to recompute the codebase summary for.
+            profile (Optional[str]): Decoding profile; chosen from the number of changed
+                files (Config.bulk_decoding_profile) if omitted.
+        
+        Returns:
+            IncrementalResult: Counts of changed files and re-summarized functions, and the
+            recomputed codebase summaries.
+        """
+        start = time.perf_counter()
+        result = IncrementalResult()
+        changes, from_git = self._changed_files(base_ref or self.commit)
+        dirty: List[Tuple[Dict, FunctionRecord]] = []
+        for path, ranges in changes.items():
+            full_path = os.path.join(self.repo_root, path)
+            if not os.path.exists(full_path):
+                if self.files.pop(path, None) is not None:
+                    result.files_removed += 1
+                continue
+            result.files_changed += 1
+            # Qualified names can repeat (e.g. property getter and setter), so match them in order
+            previous: Dict[str, List[Dict]] = {}
+            for function in self.files.get(path, {}).get('functions', []):
+                previous.setdefault(function['qualname'], []).append(function)
+            entries = []
+            # Records are kept until inference ends, while the working tree may still be edited
+            for record in extract_functions(full_path, memory_map=False, **self.extract_options):
+                code_hash = _code_hash(record.code)
+                candidates = previous.get(record.qualname)
+                old = candidates.pop(0) if candidates else None
+                # Outside the diff hunks a span cannot have changed; inside, an equal hash
+                # still means only surrounding lines moved
+                untouched = from_git and ranges is not None and not any(
+                    first <= record.line_end and last >= record.line_start for first, last in ranges
+                )
+                unchanged = old is not None and (untouched or old['code_hash'] == code_hash)
+                entry = {
+                    'qualname': record.qualname,
+                    'line_start': record.line_start,
+                    'line_end': record.line_end,
+                    'code_hash': code_hash,
+                    'summary': old['summary'] if unchanged else None
+                }
+                if not unchanged:
+                    dirty.append((entry, record))
+                entries.append(entry)
+            self.files[path] = {'sha256': _file_hash(full_path), 'functions': entries}
+        
+        if dirty:
+            summaries = summarizer.summarize_functions(
+                [record.code for _, record in dirty],
+                batch_size=batch_size,
+                fingerprints=[record.fingerprint for _, record in dirty],
+                profile=profile or Config.bulk_decoding_profile(result.files_changed),
+                docstrings=[record.docstring for _, record in dirty],
+                decorators=[record.decorators for _, record in dirty]
+            )
+            for (entry, _), summary in zip(dirty, summaries):
+                entry['summary'] = summary
+        
+        result.functions_resummarized = len(dirty)
+        result.functions_total = sum(len(stored['functions']) for stored in self.files.values())
+        if perspectives:
+            result.codebase_summaries = summarizer.summarize_perspectives(self.summaries(), perspectives)
+        self.commit = git_head(self.repo_root)
+        self.save()
+        result.elapsed = time.perf_counter() - start
+        logger.info(
+            f"Incremental update of {self.repo_root}: {result.files_changed} files changed, "
+            f"{result.files_removed} removed, {result.functions_resummarized}/{result.functions_total} "
+            f"functions re-summarized in {result.elapsed:.2f}s"
+        )
+        return result
+
+def main(argv: Optional[List[str]] = None):
+    """Incrementally re-summarize a repository, e.g. from a nightly job."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    from src.response_cache import shared_response_cache
+    from src.summarizer import Summarizer
+    from src.summary_cache import shared_cache
+    from src.worker_pool import InferencePool
+    
+    parser = argparse.ArgumentParser(description="Re-summarize only what changed in a repository.")
+    parser.add_argument("repo", help="Repository root.")
+    parser.add_argument("--manifest", help="Manifest path (default: <repo>/.codesage_cache/manifest.json).")
+    parser.add_argument("--since", help="Git ref to diff against (default: the commit stored in the manifest).")
+    parser.add_argument("--exclude", action="append", default=[], help="Extra gitignore-style exclude pattern.")
+    parser.add_argument("--perspective", action="append", default=[],
+                        choices=["product_manager", "developer", "manager"],
+                        help="Recompute the codebase summary for this perspective.")
+    parser.add_argument("--profile", choices=sorted(Config.DECODING_PROFILES),
+                        help="Decoding profile (default: chosen from the number of changed files).")
+    parser.add_argument("--workers", type=int, default=Config.INFERENCE_WORKERS,
+                        help="Forked inference processes (default: INFERENCE_WORKERS; 0 runs in-process).")
+    parser.add_argument("--docstrings", action="store_true", default=Config.DOCSTRING_SUMMARIES,
+                        help="Summarize functions with a good docstring by its first sentence instead of the model "
+                             "(default: DOCSTRING_SUMMARIES).")
+    parser.add_argument("--no-docstrings", action="store_false", dest="docstrings",
+                        help="Run the model on documented functions too.")
+    args = parser.parse_args(argv)
+    
+    summarizer = Summarizer(
+        function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
+        groq_api_key=Config.GROQ_API_KEY,
+        groq_model=Config.GROQ_MODEL,
+        device=Config.FUNCTION_MODEL_DEVICE,
+        dtype=Config.FUNCTION_MODEL_DTYPE,
+        cache=shared_cache(Config.SUMMARY_CACHE_PATH, Config.SUMMARY_CACHE_MAX_ENTRIES),
+        groq_base_url=Config.GROQ_BASE_URL,
+        backend=Config.FUNCTION_MODEL_BACKEND,
+        decoding_profile=Config.DECODING_PROFILE,
+        long_function_strategy=Config.LONG_FUNCTION_STRATEGY,
+        max_function_chunks=Config.MAX_FUNCTION_CHUNKS,
+        near_duplicate_threshold=Config.NEAR_DUPLICATE_THRESHOLD,
+        trivial_fast_path=Config.TRIVIAL_FAST_PATH,
+        response_cache=shared_response_cache(Config.GROQ_RESPONSE_CACHE_MAX_ENTRIES, Config.GROQ_RESPONSE_CACHE_TTL)
+    )
+    index = IncrementalIndex(
+        args.repo,
+        manifest_path=args.manifest,
+        excludes=args.exclude,
+        extract_options={
+            'fingerprint': Config.CACHE_KEY_MODE == "ast",
+            'exclude_nested': Config.EXCLUDE_NESTED_BODIES,
+            'docstrings': args.docstrings
+        }
+    )
+    pool = None
+    if args.workers > 0:
+        pool = InferencePool(summarizer, args.workers, Config.INFERENCE_THREADS_PER_WORKER or None).start()
+    try:
+        result = index.update(summarizer, base_ref=args.since, batch_size=Config.FUNCTION_BATCH_SIZE,
+                              perspectives=args.perspective, profile=args.profile)
+    finally:
+        if pool is not None:
+            pool.close()
+    print(json.dumps({
+        'files_changed': result.files_changed,
+        'files_removed': result.files_removed,
+        'functions_total': result.functions_total,
+        'functions_resummarized': result.functions_resummarized,
+        'elapsed_seconds': round(result.elapsed, 2),
+        'inference': summarizer.stats.as_dict(),
+        'codebase_summaries': result.codebase_summaries
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+import logging
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Inference backends understood by ModelRegistry.get
+BACKENDS = ("pytorch", "pytorch-int8", "onnx")
+
+@dataclass
+class LoadedModel:
+    """A tokenizer/model pair resident in this process, with its load statistics."""
+    model_name: str
+    device: str
+    dtype: str
+    backend: str
+    tokenizer: Any
+    model: Any
+    load_seconds: float
+    resident_bytes: int
+
+class ModelRegistry:
+    """Loads each (model name, device, dtype) once per process and shares it across callers."""
+    
+    def __init__(self, onnx_export_dir: str = os.path.join(".codesage_cache", "onnx")):
+        """
+        Args:
+            onnx_export_dir (str): Directory where ONNX exports are kept between processes.
+        """
+        self.onnx_export_dir = onnx_export_dir
+        self._models: Dict[Tuple[str, str, str, str], LoadedModel] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, model_name: str, device: str = "cpu", dtype: str = "float32", backend: str = "pytorch") -> LoadedModel:
+        """
+        Return the resident model for the key, loading it on first use.
+        
+        Args:
+            model_name (str): Hugging Face model name or local path.
+            device (str): Torch device to place the model on.
+            dtype (str): Torch dtype name for the model weights (e.g. "float32").
+            backend (str): "pytorch" (eager), "pytorch-int8" (dynamically quantized Linear
+                layers, CPU only) or "onnx" (ONNX Runtime encoder/decoder with KV cache,
+                requires optimum[onnxruntime]).
+        
+        Returns:
+            LoadedModel: The shared tokenizer/model pair.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown inference backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+        key = (model_name, device, dtype, backend)
+        loaded = self._models.get(key)
+        if loaded is not None:
+            return loaded
+        with self._lock:
+            loaded = self._models.get(key)
+            if loaded is None:
+                loaded = self._load(model_name, device, dtype, backend)
+                self._models[key] = loaded
+        return loaded
+    
+    def stats(self) -> List[Dict]:
+        """
+        Report load time and resident memory for every loaded model.
+        
+        Returns:
+            List[Dict]: One entry per resident model with keys 'model_name', 'device',
+            'dtype', 'backend', 'load_seconds' and 'resident_mb'.
+        """
+        return [
+            {
+                'model_name': loaded.model_name,
+                'device': loaded.device,
+                'dtype': loaded.dtype,
+                'backend': loaded.backend,
+                'load_seconds': round(loaded.load_seconds, 2),
+                'resident_mb': round(loaded.resident_bytes / (1024 * 1024), 1)
+            }
+            for loaded in self._models.values()
+        ]
+    
+    def clear(self):
+        """Drop all resident models so they can be garbage collected."""
+        with self._lock:
+            self._models.clear()
+    
+    def _load(self, model_name: str, device: str, dtype: str, backend: str) -> LoadedModel:
+        from transformers import AutoTokenizer
+        
+        start = time.perf_counter()
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        if backend == "onnx":
+            model = self._load_onnx(model_name)
+            resident_bytes = _directory_bytes(str(model.model_save_dir))
+        else:
+            import torch
+            from transformers import T5ForConditionalGeneration
+            
+            model = T5ForConditionalGeneration.from_pretrained(model_name, torch_dtype=getattr(torch, dtype))
+            if backend == "pytorch-int8":
+                if device != "cpu":
+                    raise ValueError("The pytorch-int8 backend only runs on CPU")
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            model.to(device)
+            model.eval()
+            resident_bytes = _tensor_bytes(model.state_dict())
+        load_seconds = time.perf_counter() - start
+        logger.info(
+            f"Loaded {model_name} ({backend}) on {device} ({dtype}) in {load_seconds:.2f}s, "
+            f"{resident_bytes / (1024 * 1024):.1f} MB resident"
+        )
+        return LoadedModel(model_name, device, dtype, backend, tokenizer, model, load_seconds, resident_bytes)
+    
+    def _load_onnx(self, model_name: str):
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            raise ImportError("The onnx backend requires optimum[onnxruntime]: pip install optimum[onnxruntime]") from e
+        export_dir = os.path.join(self.onnx_export_dir, model_name.replace("/", "__"))
+        if os.path.isdir(export_dir):
+            return ORTModelForSeq2SeqLM.from_pretrained(export_dir, use_cache=True)
+        # First use: export encoder, decoder and decoder-with-past, then keep the export
+        model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True, use_cache=True)
+        model.save_pretrained(export_dir)
+        logger.info(f"Exported {model_name} to ONNX in {export_dir}")
+        return model
+
+def _tensor_bytes(value) -> int:
+    """Bytes held by the tensors in a state dict, including packed quantized weights."""
+    if hasattr(value, "element_size") and hasattr(value, "numel"):
+        return value.numel() * value.element_size()
+    if isinstance(value, dict):
+        return sum(_tensor_bytes(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_tensor_bytes(item) for item in value)
+    return 0
+
+def _directory_bytes(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(dirpath, filename))
+        for dirpath, _, filenames in os.walk(path)
+        for filename in filenames
+    )
+
+registry = ModelRegistry(onnx_export_dir=Config.ONNX_EXPORT_DIR)
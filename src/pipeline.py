@@ -0,0 +1,285 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import logging
+
+from src.code_parser import FunctionRecord
+from src.config import Config
+from src.hierarchical import HierarchicalSummarizer
+from src.repository import IngestStats, iter_repository_files
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class StageMetrics:
+    """Throughput of one pipeline stage and depth of the queue feeding the next one."""
+    name: str
+    items: int = 0
+    busy_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    queue_max_depth: int = 0
+    queue_depth_total: int = 0
+    queue_samples: int = 0
+    
+    @property
+    def throughput(self) -> float:
+        """Items per second of wall-clock time."""
+        return self.items / self.wall_seconds if self.wall_seconds > 0 else 0.0
+    
+    @property
+    def queue_mean_depth(self) -> float:
+        return self.queue_depth_total / self.queue_samples if self.queue_samples else 0.0
+    
+    def sample_queue(self, depth: int):
+        self.queue_max_depth = max(self.queue_max_depth, depth)
+        self.queue_depth_total += depth
+        self.queue_samples += 1
+    
+    def as_dict(self) -> Dict:
+        return {
+            'stage': self.name,
+            'items': self.items,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'wall_seconds': round(self.wall_seconds, 3),
+            'throughput': round(self.throughput, 2),
+            'queue_max_depth': self.queue_max_depth,
+            'queue_mean_depth': round(self.queue_mean_depth, 2)
+        }
+
+@dataclass
+class FileResult:
+    """Function summaries and the remote file summary of one source file."""
+    path: str
+    records: List[FunctionRecord]
+    summaries: List[str]
+    file_summary: Optional[str] = None
+
+@dataclass
+class PipelineResult:
+    files: Dict[str, FileResult] = field(default_factory=dict)
+    metrics: List[StageMetrics] = field(default_factory=list)
+    elapsed: float = 0.0
+
+class _FileDone:
+    """Marker sent after the last record of a file."""
+    __slots__ = ("path", "count")
+    
+    def __init__(self, path: str, count: int):
+        self.path = path
+        self.count = count
+
+_END = object()
+
+class SummarizationPipeline:
+    """
+    Overlaps parsing, local inference and remote summarization with bounded queues.
+    
+    A parse thread streams function records from the process-pool parser into a
+    bounded queue. The inference thread drains whatever is queued (up to the batch
+    size) into each summarize_functions call, so batches fill up when parsing runs
+    ahead and stay small when it does not. As soon as every function of a file is
+    summarized, the file is queued for its remote file summary, which runs on a
+    small thread pool. Full queues block the stage in front of them, which holds
+    memory flat on large inputs.
+    """
+    
+    def __init__(self, summarizer, batch_size: int = 8, queue_size: int = 256,
+                 remote_workers: int = 4, hierarchical: Optional[HierarchicalSummarizer] = None):
+        """
+        Args:
+            summarizer (Summarizer): Runs local inference.
+            batch_size (int): Maximum functions per generate call.
+            queue_size (int): Capacity of each inter-stage queue.
+            remote_workers (int): Concurrent remote file summaries.
+            hierarchical (Optional[HierarchicalSummarizer]): Produces the file summaries; one is
+                created from the summarizer if omitted. Pass None and remote_workers=0 to skip them.
+        """
+        self.summarizer = summarizer
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.remote_workers = remote_workers
+        self.hierarchical = hierarchical or (HierarchicalSummarizer(summarizer) if remote_workers else None)
+    
+    def run(self, source: str, excludes: Optional[List[str]] = None, jobs: Optional[int] = None,
+            on_file: Optional[Callable[[FileResult], None]] = None, profile: Optional[str] = None,
+            keep_results: bool = True, **extract_options) -> PipelineResult:
+        """
+        Summarize every function of a repository, plus one remote summary per file.
+        
+        Args:
+            source (str): Directory or .zip archive to ingest.
+            excludes (Optional[List[str]]): Extra gitignore-style exclude patterns.
+            jobs (Optional[int]): Number of parser processes.
+            on_file (Optional[Callable[[FileResult], None]]): Called from a worker thread
+                as each file is finished.
+            profile (Optional[str]): Decoding profile; chosen from the number of files
+                (Config.bulk_decoding_profile) if omitted.
+            keep_results (bool): Collect every FileResult in the returned files; pass False
+                with on_file to stream results without holding them all in memory.
+            **extract_options: Keyword arguments forwarded to extract_functions.
+        
+        Returns:
+            PipelineResult: Per-file results and per-stage metrics.
+        """
+        parse_metrics = StageMetrics("parse")
+        inference_metrics = StageMetrics("inference")
+        remote_metrics = StageMetrics("remote")
+        records_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        files_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        result = PipelineResult(metrics=[parse_metrics, inference_metrics, remote_metrics])
+        errors: List[BaseException] = []
+        stop = threading.Event()
+        start = time.perf_counter()
+        decoding = {'profile': profile}
+        
+        def choose_profile(stats: IngestStats):
+            # Called before the first file is yielded, so every record sees the same profile
+            if decoding['profile'] is None:
+                decoding['profile'] = Config.bulk_decoding_profile(stats.files_total)
+                logger.info(f"Using the {decoding['profile']!r} decoding profile for {stats.files_total} files")
+        
+        def put(target: queue.Queue, item, metrics: StageMetrics):
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    metrics.sample_queue(target.qsize())
+                    return
+                except queue.Full:
+                    continue
+        
+        def parse_stage():
+            try:
+                files = iter_repository_files(source, excludes, jobs, choose_profile, **extract_options)
+                while True:
+                    busy = time.perf_counter()
+                    item = next(files, None)
+                    parse_metrics.busy_seconds += time.perf_counter() - busy
+                    if item is None or stop.is_set():
+                        break
+                    path, functions = item
+                    parse_metrics.items += 1
+                    for record in functions:
+                        put(records_queue, record, parse_metrics)
+                    put(records_queue, _FileDone(path, len(functions)), parse_metrics)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                parse_metrics.wall_seconds = time.perf_counter() - start
+                put(records_queue, _END, parse_metrics)
+        
+        def inference_stage():
+            pending: Dict[str, FileResult] = {}
+            expected: Dict[str, int] = {}
+            
+            def finish_ready():
+                for path in [p for p, count in expected.items() if len(pending[p].summaries) == count]:
+                    del expected[path]
+                    put(files_queue, pending.pop(path), inference_metrics)
+            
+            try:
+                finished = False
+                while not finished and not stop.is_set():
+                    try:
+                        items = [records_queue.get(timeout=0.1)]
+                    except queue.Empty:
+                        continue
+                    # Take whatever else is already queued, up to one batch of records
+                    records: List[FunctionRecord] = []
+                    while True:
+                        item = items.pop()
+                        if item is _END:
+                            finished = True
+                        elif isinstance(item, _FileDone):
+                            pending.setdefault(item.path, FileResult(item.path, [], []))
+                            expected[item.path] = item.count
+                        else:
+                            records.append(item)
+                        if finished or len(records) >= self.batch_size:
+                            break
+                        try:
+                            items.append(records_queue.get_nowait())
+                        except queue.Empty:
+                            break
+                    if records:
+                        busy = time.perf_counter()
+                        summaries = self.summarizer.summarize_functions(
+                            [record.code for record in records],
+                            batch_size=self.batch_size,
+                            fingerprints=[record.fingerprint for record in records],
+                            profile=decoding['profile'],
+                            docstrings=[record.docstring for record in records],
+                            decorators=[record.decorators for record in records]
+                        )
+                        inference_metrics.busy_seconds += time.perf_counter() - busy
+                        inference_metrics.items += len(records)
+                        for record, summary in zip(records, summaries):
+                            file_result = pending.setdefault(record.file, FileResult(record.file, [], []))
+                            file_result.records.append(record)
+                            file_result.summaries.append(summary)
+                    finish_ready()
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+            finally:
+                inference_metrics.wall_seconds = time.perf_counter() - start
+                put(files_queue, _END, inference_metrics)
+        
+        def remote_stage():
+            lock = threading.Lock()
+            
+            def summarize_file(file_result: FileResult):
+                try:
+                    if self.hierarchical is not None and file_result.summaries:
+                        busy = time.perf_counter()
+                        file_result.file_summary = self.hierarchical.summarize_file(file_result.summaries)
+                        with lock:
+                            remote_metrics.busy_seconds += time.perf_counter() - busy
+                    with lock:
+                        remote_metrics.items += 1
+                        if keep_results:
+                            result.files[file_result.path] = file_result
+                    if on_file is not None:
+                        on_file(file_result)
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+            
+            with ThreadPoolExecutor(max_workers=max(1, self.remote_workers)) as executor:
+                # Bound the submitted-but-unfinished work so the executor queue stays small too
+                slots = threading.Semaphore(max(1, self.remote_workers) * 2)
+                while not stop.is_set():
+                    try:
+                        item = files_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if item is _END:
+                        break
+                    slots.acquire()
+                    future = executor.submit(summarize_file, item)
+                    future.add_done_callback(lambda _: slots.release())
+            remote_metrics.wall_seconds = time.perf_counter() - start
+        
+        threads = [
+            threading.Thread(target=parse_stage, name="codesage-parse", daemon=True),
+            threading.Thread(target=inference_stage, name="codesage-inference", daemon=True),
+            threading.Thread(target=remote_stage, name="codesage-remote", daemon=True)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+        
+        result.elapsed = time.perf_counter() - start
+        for metrics in result.metrics:
+            logger.info(
+                f"Pipeline stage {metrics.name}: {metrics.items} items, {metrics.throughput:.1f}/s, "
+                f"busy {metrics.busy_seconds:.2f}s, queue depth max {metrics.queue_max_depth} "
+                f"mean {metrics.queue_mean_depth:.1f}"
+            )
+        return result
@@ -0,0 +1,352 @@
+import io
+import os
+import re
+import tempfile
+import time
+import zipfile
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+import logging
+
+from src.code_parser import FunctionRecord, extract_functions
+
+logger = logging.getLogger(__name__)
+
+# Directories that are never worth parsing, whatever .gitignore says
+DEFAULT_EXCLUDES = [".git/", "__pycache__/", ".venv/", "venv/", ".tox/", ".nox/", "*.egg-info/"]
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob into a regex matching a '/'-separated relative path."""
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == "\\" and i + 1 < len(pattern):
+            # A backslash makes the next character literal (e.g. "\#", "\!", "\*")
+            regex += re.escape(pattern[i + 1])
+            i += 2
+        elif pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            regex += "/.*"
+            i += 3
+        elif pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+        elif pattern[i] == "*":
+            regex += "[^/]*"
+            i += 1
+        elif pattern[i] == "?":
+            regex += "[^/]"
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 1)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            regex += f"[{body}]"
+            i = end + 1
+        else:
+            regex += re.escape(pattern[i])
+            i += 1
+    return regex
+
+def _strip_trailing_spaces(line: str) -> str:
+    """Drop trailing whitespace, keeping a space escaped with a backslash."""
+    line = line.rstrip("\r\n")
+    stripped = line.rstrip()
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        return stripped[:-1] + " "
+    return stripped
+
+class IgnoreRules:
+    """Matches relative paths against .gitignore-style patterns, including negation."""
+    
+    def __init__(self, patterns: List[str]):
+        """
+        Compile gitignore-style patterns.
+        
+        Args:
+            patterns (List[str]): Pattern lines; blank lines and '#' comments are skipped.
+                A backslash escapes the next character, e.g. a leading '#' or '!'.
+        """
+        self._rules: List[Tuple[re.Pattern, bool, bool]] = []
+        for raw in patterns:
+            line = _strip_trailing_spaces(raw)
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            # A slash anywhere but the end anchors the pattern to the root
+            anchored = "/" in line
+            regex = _translate_glob(line.lstrip("/"))
+            if not anchored:
+                regex = "(?:.*/)?" + regex
+            self._rules.append((re.compile(regex + "$"), negate, dir_only))
+    
+    @classmethod
+    def from_directory(cls, root: str, extra_patterns: Optional[List[str]] = None) -> "IgnoreRules":
+        """
+        Build rules from the defaults, root/.gitignore and any extra patterns, in that order.
+        
+        Args:
+            root (str): Repository root directory.
+            extra_patterns (Optional[List[str]]): Additional exclude patterns.
+        
+        Returns:
+            IgnoreRules: The combined rules; later patterns override earlier ones.
+        """
+        patterns = list(DEFAULT_EXCLUDES)
+        gitignore = os.path.join(root, ".gitignore")
+        if os.path.isfile(gitignore):
+            with open(gitignore, 'r', encoding='utf-8', errors='replace') as file:
+                patterns.extend(file.read().splitlines())
+        patterns.extend(extra_patterns or [])
+        return cls(patterns)
+    
+    def is_ignored(self, relative_path: str, is_dir: bool = False) -> bool:
+        """
+        Check whether a path relative to the root is excluded.
+        
+        Args:
+            relative_path (str): Path relative to the repository root, using '/' separators.
+            is_dir (bool): Whether the path is a directory.
+        
+        Returns:
+            bool: True if the last matching pattern excludes the path.
+        """
+        ignored = False
+        for regex, negate, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(relative_path):
+                ignored = not negate
+        return ignored
+    
+    def excludes_file(self, relative_path: str) -> bool:
+        """
+        Check whether a file is excluded by its own path or by any directory above it.
+        
+        Matches what iter_python_files yields: a file below an excluded directory stays
+        excluded even if a later pattern would re-include the file itself.
+        
+        Args:
+            relative_path (str): File path relative to the repository root, using '/' separators.
+        
+        Returns:
+            bool: True if the file or one of its ancestor directories is excluded.
+        """
+        parts = relative_path.split("/")
+        return any(
+            self.is_ignored("/".join(parts[:depth]), is_dir=True) for depth in range(1, len(parts))
+        ) or self.is_ignored(relative_path)
+
+def iter_python_files(root: str, excludes: Optional[List[str]] = None) -> Iterator[str]:
+    """
+    Walk a directory and yield the Python files that are not excluded.
+    
+    Only the root .gitignore is read. Excluded directories are not descended into,
+    so files below them cannot be re-included, matching git's behaviour (and
+    IgnoreRules.excludes_file).
+    
+    Args:
+        root (str): Directory to walk.
+        excludes (Optional[List[str]]): Extra gitignore-style exclude patterns.
+    
+    Returns:
+        Iterator[str]: Paths relative to root, using '/' separators.
+    """
+    rules = IgnoreRules.from_directory(root, excludes)
+    for dirpath, dirnames, filenames in os.walk(root):
+        relative_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        prefix = "" if relative_dir == "." else relative_dir + "/"
+        dirnames[:] = sorted(d for d in dirnames if not rules.is_ignored(prefix + d, is_dir=True))
+        for filename in sorted(filenames):
+            if filename.endswith(".py") and not rules.is_ignored(prefix + filename):
+                yield prefix + filename
+
+@dataclass
+class IngestStats:
+    """Progress of a repository ingestion run."""
+    files_total: int = 0
+    files_done: int = 0
+    functions: int = 0
+    elapsed: float = 0.0
+    
+    @property
+    def files_per_second(self) -> float:
+        return self.files_done / self.elapsed if self.elapsed > 0 else 0.0
+
+def _parse_file(root: str, relative_path: str, extract_options: Dict) -> Tuple[str, List[FunctionRecord]]:
+    """Process-pool worker: extract the functions of one file."""
+    return relative_path, extract_functions(os.path.join(root, relative_path), **extract_options)
+
+def _extract_archive(archive_path: Union[str, BinaryIO], destination: str) -> str:
+    with zipfile.ZipFile(archive_path) as archive:
+        members = [
+            name for name in archive.namelist()
+            if name.endswith(".py") or os.path.basename(name) == ".gitignore"
+        ]
+        archive.extractall(destination, members=members)
+    # Archives usually wrap everything in one top-level folder; treat it as the root
+    entries = os.listdir(destination)
+    if len(entries) == 1 and os.path.isdir(os.path.join(destination, entries[0])):
+        return os.path.join(destination, entries[0])
+    return destination
+
+def iter_repository_functions(
+    source: Union[str, BinaryIO],
+    excludes: Optional[List[str]] = None,
+    jobs: Optional[int] = None,
+    progress: Optional[Callable[[IngestStats], None]] = None,
+    **extract_options
+) -> Iterator[FunctionRecord]:
+    """
+    Parse every Python file of a directory or zip archive in a process pool.
+    
+    Function records are yielded as soon as their file has been parsed, so the
+    summarization stage can start before the whole repository is read.
+    
+    Args:
+        source (Union[str, BinaryIO]): Directory or .zip archive to ingest; archives may
+            also be an open binary file object, e.g. an in-memory upload.
+        excludes (Optional[List[str]]): Extra gitignore-style exclude patterns.
+        jobs (Optional[int]): Number of parser processes (defaults to the CPU count).
+        progress (Optional[Callable[[IngestStats], None]]): Called after each parsed file.
+        **extract_options: Keyword arguments forwarded to extract_functions
+            (e.g. fingerprint, exclude_nested).
+    
+    Returns:
+        Iterator[FunctionRecord]: Records from extract_functions with 'file' set
+        to the path relative to the repository root.
+    """
+    for _, functions in iter_repository_files(source, excludes, jobs, progress, **extract_options):
+        yield from functions
+
+def parse_upload(
+    name: str,
+    data: bytes,
+    progress: Optional[Callable[[IngestStats], None]] = None,
+    **extract_options
+) -> List[FunctionRecord]:
+    """
+    Extract the functions of an uploaded .py file or zipped repository, entirely in memory.
+    
+    Nothing is written to a shared location, so concurrent sessions cannot see each
+    other's uploads.
+    
+    Args:
+        name (str): Upload file name; a .zip suffix selects the archive path.
+        data (bytes): Uploaded content.
+        progress (Optional[Callable[[IngestStats], None]]): Called after each parsed file of an archive.
+        **extract_options: Keyword arguments forwarded to extract_functions.
+    
+    Returns:
+        List[FunctionRecord]: Records of the file, or of every file of the archive with
+        'file' set to its path inside it.
+    """
+    if name.endswith(".zip"):
+        return list(iter_repository_functions(io.BytesIO(data), progress=progress, **extract_options))
+    return extract_functions(name, source=data, **extract_options)
+
+def iter_repository_files(
+    source: Union[str, BinaryIO],
+    excludes: Optional[List[str]] = None,
+    jobs: Optional[int] = None,
+    progress: Optional[Callable[[IngestStats], None]] = None,
+    **extract_options
+) -> Iterator[Tuple[str, List[FunctionRecord]]]:
+    """
+    Like iter_repository_functions, but yields each parsed file with all of its functions.
+    
+    Only a bounded number of files are parsed ahead of the consumer, so a slow
+    consumer holds back the process pool instead of accumulating parsed files.
+    
+    Returns:
+        Iterator[Tuple[str, List[FunctionRecord]]]: Relative path and records per file,
+        in completion order; files without functions are included.
+    """
+    if zipfile.is_zipfile(source):
+        with tempfile.TemporaryDirectory(prefix="codesage_") as destination:
+            root = _extract_archive(source, destination)
+            yield from _iter_directory_files(root, excludes, jobs, progress, extract_options)
+    elif os.path.isdir(source):
+        yield from _iter_directory_files(source, excludes, jobs, progress, extract_options)
+    else:
+        raise ValueError(f"{source} is neither a directory nor a zip archive")
+
+def _iter_directory_files(root, excludes, jobs, progress, extract_options) -> Iterator[Tuple[str, List[FunctionRecord]]]:
+    files = list(iter_python_files(root, excludes))
+    stats = IngestStats(files_total=len(files))
+    start = time.perf_counter()
+    workers = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        window = 4 * workers
+        remaining = iter(files)
+        pending = set()
+        for relative_path in islice(remaining, window):
+            pending.add(executor.submit(_parse_file, root, relative_path, extract_options))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for relative_path in islice(remaining, len(done)):
+                pending.add(executor.submit(_parse_file, root, relative_path, extract_options))
+            for future in done:
+                relative_path, functions = future.result()
+                stats.files_done += 1
+                stats.functions += len(functions)
+                stats.elapsed = time.perf_counter() - start
+                if progress is not None:
+                    progress(stats)
+                for function in functions:
+                    function.file = relative_path
+                yield relative_path, functions
+    logger.info(
+        f"Parsed {stats.files_done} files ({stats.functions} functions) from {root} "
+        f"in {stats.elapsed:.2f}s, {stats.files_per_second:.1f} files/s"
+    )
+
+def summarize_repository(
+    summarizer,
+    records: Iterator[FunctionRecord],
+    batch_size: int = 8,
+    chunk_size: int = 256,
+    profile: Optional[str] = None
+) -> Iterator[Tuple[FunctionRecord, str]]:
+    """
+    Summarize streamed function records in chunks as they arrive.
+    
+    Args:
+        summarizer (Summarizer): Summarizer used for the function summaries.
+        records (Iterator[FunctionRecord]): Function records, e.g. from iter_repository_functions.
+        batch_size (int): Functions per generate call.
+        chunk_size (int): Records collected before each summarize_functions call.
+        profile (Optional[str]): Decoding profile; defaults to the summarizer's.
+    
+    Returns:
+        Iterator[Tuple[FunctionRecord, str]]: Each record paired with its summary.
+    """
+    chunk: List[FunctionRecord] = []
+    
+    def flush() -> Iterator[Tuple[FunctionRecord, str]]:
+        summaries = summarizer.summarize_functions(
+            [record.code for record in chunk],
+            batch_size=batch_size,
+            fingerprints=[record.fingerprint for record in chunk],
+            profile=profile,
+            docstrings=[record.docstring for record in chunk],
+            decorators=[record.decorators for record in chunk]
+        )
+        return zip(chunk, summaries)
+    
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield from flush()
+            chunk = []
+    if chunk:
+        yield from flush()
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+def make_response_key(model: str, prompt_version: int, perspective: str, summaries: List[str]) -> str:
+    """
+    Build the cache key of a codebase summary response.
+    
+    Args:
+        model (str): Groq model that writes the response.
+        prompt_version (int): Version of the prompt templates.
+        perspective (str): Prompt template (user type) the response was written for.
+        summaries (List[str]): Summaries filled into the prompt, in order.
+    
+    Returns:
+        str: Hex SHA-256 digest over the model, prompt version, perspective and summaries hash.
+    """
+    # JSON keeps item boundaries: ["a\nb"] and ["a", "b"] fill the prompt differently
+    summaries_hash = hashlib.sha256(json.dumps(summaries).encode("utf-8")).hexdigest()
+    payload = json.dumps(
+        {'model': model, 'prompt_version': prompt_version, 'perspective': perspective, 'summaries': summaries_hash},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """
+    In-memory LRU cache of LLM responses with a time-to-live and request coalescing.
+    
+    The first caller of a key that is neither cached nor in flight becomes its
+    leader and produces the response; identical requests arriving meanwhile wait
+    on the leader's future instead of making their own API call.
+    """
+    
+    def __init__(self, max_entries: int = 256, ttl: float = 3600.0):
+        """
+        Args:
+            max_entries (int): Responses kept before the least recently used is evicted.
+            ttl (float): Seconds a response stays valid.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        """The cached response, or None if it is missing or expired."""
+        with self._lock:
+            return self._get(key)
+    
+    def _get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored, value = entry
+        if time.monotonic() - stored > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def begin(self, key: str) -> Tuple[Future, bool]:
+        """
+        Join the request for key.
+        
+        Args:
+            key (str): Response key, e.g. from make_response_key.
+        
+        Returns:
+            Tuple[Future, bool]: A future for the response and whether the caller is the
+            leader. A leader must call finish() or fail() exactly once; for everyone else
+            the future is already done (cache hit) or resolved by the leader.
+        """
+        with self._lock:
+            value = self._get(key)
+            if value is not None:
+                self.hits += 1
+                future: Future = Future()
+                future.set_result(value)
+                return future, False
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            self.misses += 1
+            future = Future()
+            self._in_flight[key] = future
+            return future, True
+    
+    def finish(self, key: str, value: str, store: bool = True):
+        """Resolve the leader's request, caching the value unless store is False."""
+        if store:
+            self.put(key, value)
+        with self._lock:
+            future = self._in_flight.pop(key, None)
+        if future is not None:
+            future.set_result(value)
+    
+    def fail(self, key: str, error: BaseException):
+        """Abandon the leader's request; waiting callers get the error."""
+        with self._lock:
+            future = self._in_flight.pop(key, None)
+        if future is not None:
+            future.set_exception(error)
+    
+    def get_or_compute(self, key: str, compute: Callable[[], str],
+                       store: Callable[[str], bool] = lambda value: True) -> str:
+        """
+        Return the cached response for key, computing it once for all concurrent callers.
+        
+        Args:
+            key (str): Response key.
+            compute (Callable[[], str]): Produces the response when this caller leads.
+            store (Callable[[str], bool]): Whether a computed response may be cached
+                (e.g. not a fallback answer).
+        
+        Returns:
+            str: The response.
+        """
+        future, leader = self.begin(key)
+        if not leader:
+            return future.result()
+        try:
+            value = compute()
+        except BaseException as e:
+            self.fail(key, e)
+            raise
+        self.finish(key, value, store(value))
+        return value
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = len(self._entries)
+        return {
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced
+        }
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_lock = threading.Lock()
+
+def shared_response_cache(max_entries: int = 256, ttl: float = 3600.0) -> Optional[ResponseCache]:
+    """
+    Return the process-wide ResponseCache, creating it on first use.
+    
+    Args:
+        max_entries (int): Responses kept before the least recently used is evicted.
+        ttl (float): Seconds a response stays valid; 0 disables the cache.
+    
+    Returns:
+        Optional[ResponseCache]: The cache shared by every caller in this process
+        (e.g. all app sessions), or None when disabled.
+    """
+    global _shared_cache
+    if ttl <= 0:
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache(max_entries, ttl)
+        return _shared_cache
@@ -0,0 +1,334 @@
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Tuple
+import logging
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+class LatencyStats:
+    """Thread-safe sliding window of request latencies with percentile summaries."""
+    
+    def __init__(self, window: int = 10000):
+        """
+        Args:
+            window (int): Number of most recent latencies kept for percentiles.
+        """
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+    
+    def record(self, seconds: float):
+        with self._lock:
+            self._latencies.append(seconds)
+            self.count += 1
+    
+    def percentiles(self, points: Tuple[float, ...] = (50, 90, 99)) -> Dict[str, float]:
+        """Nearest-rank percentiles in milliseconds, e.g. {'p50': 12.3, ...}; empty without samples."""
+        with self._lock:
+            ordered = sorted(self._latencies)
+        if not ordered:
+            return {}
+        return {
+            f"p{point:g}": round(1000 * ordered[max(0, math.ceil(len(ordered) * point / 100) - 1)], 2)
+            for point in points
+        }
+
+class _Request:
+    """One function waiting for a batch."""
+    __slots__ = ("code", "profile", "future", "enqueued")
+    
+    def __init__(self, code: str, profile: Optional[str]):
+        self.code = code
+        self.profile = profile
+        self.future: Future = Future()
+        self.enqueued = time.perf_counter()
+
+class MicroBatcher:
+    """
+    Collects single-function requests into micro-batches for one shared Summarizer.
+    
+    A batch is dispatched as soon as it holds max_batch_size requests, or when the
+    oldest request in it has waited max_wait_ms, whichever comes first. Under light
+    load a request therefore pays at most max_wait_ms extra latency; under heavy
+    load batches fill immediately and the model runs at its batched throughput.
+    Requests are answered through futures, so any number of HTTP threads can wait
+    on the single inference thread.
+    """
+    
+    def __init__(self, summarizer, max_batch_size: int = 16, max_wait_ms: float = 10.0, max_queue: int = 1024):
+        """
+        Args:
+            summarizer (Summarizer): Warm summarizer shared by every request.
+            max_batch_size (int): Upper bound on functions per summarize_functions call.
+            max_wait_ms (float): Longest time the first request of a batch waits for company.
+            max_queue (int): Requests allowed to wait before submit() rejects new ones.
+        """
+        self.summarizer = summarizer
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.latency = LatencyStats()
+        self.batches = 0
+        self.batched_requests = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> "MicroBatcher":
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def submit(self, code: str, profile: Optional[str] = None) -> Future:
+        """
+        Queue one function for summarization.
+        
+        Args:
+            code (str): Source code of the function.
+            profile (Optional[str]): Decoding profile; defaults to the summarizer's.
+        
+        Returns:
+            Future: Resolves to the summary string.
+        
+        Raises:
+            queue.Full: If max_queue requests are already waiting.
+        """
+        request = _Request(code, profile)
+        self._queue.put_nowait(request)
+        return request.future
+    
+    def submit_many(self, codes: List[str], profile: Optional[str] = None) -> List[Future]:
+        """
+        Queue several functions, all or none of them.
+        
+        Args:
+            codes (List[str]): Source code of each function.
+            profile (Optional[str]): Decoding profile; defaults to the summarizer's.
+        
+        Returns:
+            List[Future]: One future per function, in order.
+        
+        Raises:
+            queue.Full: If the queue fills up partway; the functions already queued are
+                cancelled and never reach the model.
+        """
+        futures: List[Future] = []
+        try:
+            for code in codes:
+                futures.append(self.submit(code, profile))
+        except queue.Full:
+            for future in futures:
+                future.cancel()
+            raise
+        return futures
+    
+    def stats(self) -> Dict:
+        """Request counts, batching efficiency and latency percentiles."""
+        return {
+            'requests': self.latency.count,
+            'queued': self._queue.qsize(),
+            'batches': self.batches,
+            'mean_batch_size': round(self.batched_requests / self.batches, 2) if self.batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'latency_ms': self.latency.percentiles(),
+            'summaries': self.summarizer.stats.as_dict()
+        }
+    
+    def _collect(self) -> List[_Request]:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = batch[0].enqueued + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self):
+        while not self._stop.is_set():
+            # Requests cancelled while queued (e.g. by submit_many) are dropped here
+            batch = [request for request in self._collect() if request.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            self.batches += 1
+            self.batched_requests += len(batch)
+            by_profile: Dict[Optional[str], List[_Request]] = {}
+            for request in batch:
+                by_profile.setdefault(request.profile, []).append(request)
+            for profile, requests in by_profile.items():
+                try:
+                    summaries = self.summarizer.summarize_functions(
+                        [request.code for request in requests],
+                        batch_size=len(requests),
+                        profile=profile
+                    )
+                except Exception as e:
+                    logger.error(f"Error summarizing a batch of {len(requests)} requests: {e}")
+                    summaries = [f"Error summarizing function: {e}"] * len(requests)
+                finished = time.perf_counter()
+                for request, summary in zip(requests, summaries):
+                    self.latency.record(finished - request.enqueued)
+                    request.future.set_result(summary)
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Many clients connect at once; the default listen backlog of 5 drops connections
+    request_queue_size = 128
+
+class SummarizationService:
+    """
+    Local HTTP front end for a MicroBatcher.
+    
+    Endpoints:
+        POST /summarize   {"code": "..."} or {"codes": [...]}, optional "profile";
+                          answers {"summary": ...} or {"summaries": [...]}.
+        GET  /stats       Batching statistics and latency percentiles.
+        GET  /healthz     Liveness probe.
+    """
+    
+    def __init__(self, batcher: MicroBatcher, host: str = "127.0.0.1", port: int = 8600, timeout: float = 60.0):
+        """
+        Args:
+            batcher (MicroBatcher): Batcher that serves the summarize requests.
+            host (str): Interface to bind.
+            port (int): Port to bind (0 picks a free one).
+            timeout (float): Seconds a request may wait for its summary.
+        """
+        self.batcher = batcher
+        self.timeout = timeout
+        self._server = _HTTPServer((host, port), self._handler_class())
+    
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def serve_forever(self):
+        self.batcher.start()
+        logger.info(f"Summarization service listening on {self.base_url}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self.batcher.stop()
+    
+    def shutdown(self):
+        self._server.shutdown()
+        self._server.server_close()
+    
+    def _handler_class(self):
+        service = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+            
+            def do_GET(self):
+                if self.path.rstrip("/") == "/stats":
+                    return self._send_json(200, service.batcher.stats())
+                if self.path.rstrip("/") == "/healthz":
+                    return self._send_json(200, {'status': "ok"})
+                self._send_json(404, {'error': f"Unknown path {self.path}"})
+            
+            def do_POST(self):
+                if self.path.rstrip("/") != "/summarize":
+                    return self._send_json(404, {'error': f"Unknown path {self.path}"})
+                try:
+                    body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                    codes = body['codes'] if 'codes' in body else [body['code']]
+                    if not isinstance(codes, list):
+                        raise ValueError("'codes' must be a list of strings")
+                    profile = body.get('profile')
+                    if profile is not None and profile not in Config.DECODING_PROFILES:
+                        raise ValueError(f"Unknown decoding profile {profile!r}")
+                    if not all(isinstance(code, str) for code in codes):
+                        raise ValueError("Function code must be a string")
+                except (KeyError, ValueError, TypeError) as e:
+                    return self._send_json(400, {'error': f"Bad request: {e}"})
+                try:
+                    futures = service.batcher.submit_many(codes, profile)
+                except queue.Full:
+                    return self._send_json(503, {'error': "Queue full, retry later"}, {'Retry-After': "1"})
+                try:
+                    summaries = [future.result(timeout=service.timeout) for future in futures]
+                except FutureTimeoutError:
+                    for future in futures:
+                        future.cancel()
+                    return self._send_json(504, {'error': "Timed out waiting for the model"})
+                if 'codes' in body:
+                    return self._send_json(200, {'summaries': summaries})
+                self._send_json(200, {'summary': summaries[0]})
+            
+            def _send_json(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+        
+        return Handler
+
+def main(argv: Optional[List[str]] = None):
+    """Serve function summaries from one warm model over HTTP."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    from src.summarizer import Summarizer
+    from src.summary_cache import shared_cache
+    
+    parser = argparse.ArgumentParser(description="Share one warm function model between local tools over HTTP.")
+    parser.add_argument("--host", default=Config.SERVICE_HOST, help="Interface to bind.")
+    parser.add_argument("--port", type=int, default=Config.SERVICE_PORT, help="Port to bind.")
+    parser.add_argument("--max-batch-size", type=int, default=Config.SERVICE_MAX_BATCH_SIZE,
+                        help="Largest micro-batch passed to the model.")
+    parser.add_argument("--max-wait-ms", type=float, default=Config.SERVICE_MAX_WAIT_MS,
+                        help="Longest wait for a micro-batch to fill.")
+    parser.add_argument("--max-queue", type=int, default=1024, help="Waiting requests before answering 503.")
+    args = parser.parse_args(argv)
+    
+    summarizer = Summarizer(
+        function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
+        groq_api_key=Config.GROQ_API_KEY,
+        groq_model=Config.GROQ_MODEL,
+        device=Config.FUNCTION_MODEL_DEVICE,
+        dtype=Config.FUNCTION_MODEL_DTYPE,
+        cache=shared_cache(Config.SUMMARY_CACHE_PATH, Config.SUMMARY_CACHE_MAX_ENTRIES),
+        groq_base_url=Config.GROQ_BASE_URL,
+        backend=Config.FUNCTION_MODEL_BACKEND,
+        decoding_profile=Config.DECODING_PROFILE,
+        long_function_strategy=Config.LONG_FUNCTION_STRATEGY,
+        max_function_chunks=Config.MAX_FUNCTION_CHUNKS,
+        near_duplicate_threshold=Config.NEAR_DUPLICATE_THRESHOLD,
+        trivial_fast_path=Config.TRIVIAL_FAST_PATH
+    )
+    # Load the model before accepting requests so the first caller does not pay for it
+    summarizer.loaded_model
+    batcher = MicroBatcher(summarizer, args.max_batch_size, args.max_wait_ms, args.max_queue)
+    service = SummarizationService(batcher, args.host, args.port)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
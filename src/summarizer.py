@@ -1,28 +1,153 @@
-from transformers import AutoTokenizer, T5ForConditionalGeneration
-from groq import Groq
-from typing import List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import json
 import logging
+import threading
+import time
+
+from src.code_parser import split_function_source
+from src.config import Config
+from src.dedup import NearDuplicateIndex
+from src.model_registry import LoadedModel, registry
+from src.response_cache import ResponseCache, make_response_key
+from src.summary_cache import SummaryCache, make_cache_key
+from src.trivial import docstring_summary, trivial_summary
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+FALLBACK_SUMMARY = "The codebase enables financial transaction management, including recording transactions, tracking balances, and categorizing spending."
+
+@dataclass
+class SummaryStats:
+    """Where the function summaries of a Summarizer came from, accumulated over its calls."""
+    functions: int = 0
+    docstrings: int = 0
+    trivial: int = 0
+    cache_hits: int = 0
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+    generated: int = 0
+    generate_seconds: float = 0.0
+    
+    @property
+    def inference_saved(self) -> int:
+        """Functions summarized without running the model on them."""
+        return self.functions - self.generated
+    
+    def as_dict(self) -> Dict:
+        seconds_per_function = self.generate_seconds / self.generated if self.generated else 0.0
+        return {
+            'functions': self.functions,
+            'generated': self.generated,
+            'docstrings': self.docstrings,
+            'docstring_share': round(self.docstrings / self.functions, 3) if self.functions else 0.0,
+            'trivial': self.trivial,
+            'cache_hits': self.cache_hits,
+            'exact_duplicates': self.exact_duplicates,
+            'near_duplicates': self.near_duplicates,
+            'inference_saved': self.inference_saved,
+            'generate_seconds': round(self.generate_seconds, 2),
+            # Estimate: skipped functions at the average model time of the generated ones
+            'estimated_seconds_saved': round(seconds_per_function * self.inference_saved, 2)
+        }
+    
+    def report(self) -> str:
+        """One-line summary of how much inference was saved."""
+        stats = self.as_dict()
+        share = self.inference_saved / self.functions if self.functions else 0.0
+        return (
+            f"{self.functions} functions: {self.generated} generated in {stats['generate_seconds']}s, "
+            f"{self.docstrings} from docstrings ({stats['docstring_share']:.0%}), "
+            f"{self.trivial} trivial, {self.exact_duplicates} exact duplicates, "
+            f"{self.near_duplicates} near duplicates, "
+            f"{self.cache_hits} from cache; inference saved on {self.inference_saved} ({share:.0%}), "
+            f"about {stats['estimated_seconds_saved']}s"
+        )
+
 class Summarizer:
     """Handles summarization of functions and overall codebase."""
     
-    def __init__(self, function_model_name: str, groq_api_key: str, groq_model: str):
+    def __init__(self, function_model_name: str, groq_api_key: str, groq_model: str,
+                 device: str = "cpu", dtype: str = "float32", cache: Optional[SummaryCache] = None,
+                 groq_base_url: Optional[str] = None, backend: str = "pytorch",
+                 decoding_profile: str = "quality", long_function_strategy: str = "chunk",
+                 max_function_chunks: int = 8, near_duplicate_threshold: float = 0.9,
+                 trivial_fast_path: bool = True, response_cache: Optional[ResponseCache] = None):
         """
         Initialize summarizer with models and API client.
         
+        The function model is not loaded here; it is fetched from the process-wide
+        model registry on first use, so constructing a Summarizer is cheap.
+        
         Args:
             function_model_name (str): Hugging Face model for function summarization.
             groq_api_key (str): Groq API key.
             groq_model (str): Groq model for overall summarization.
+            device (str): Torch device for the function model.
+            dtype (str): Torch dtype name for the function model weights.
+            cache (Optional[SummaryCache]): Persistent store consulted before running the model.
+            groq_base_url (Optional[str]): Alternative Groq endpoint, e.g. a local stub server.
+            backend (str): Inference backend for the function model ("pytorch", "pytorch-int8"
+                or "onnx"; see ModelRegistry.get).
+            decoding_profile (str): Default key of Config.DECODING_PROFILES ("fast" greedy,
+                "balanced" or "quality" beam search); can be overridden per call.
+            long_function_strategy (str): "chunk" summarizes functions longer than the model
+                input in statement-aligned pieces and combines the results; "truncate"
+                summarizes only the first max_input_length tokens.
+            max_function_chunks (int): Upper bound on the pieces of one function.
+            near_duplicate_threshold (float): Estimated similarity at which a function reuses
+                the summary of a near-identical one (see NearDuplicateIndex); 0 disables.
+            trivial_fast_path (bool): Summarize getters, placeholders and plain delegations
+                from templates (see trivial_summary) without running the model.
+            response_cache (Optional[ResponseCache]): Reuses and coalesces identical
+                codebase summary requests to Groq.
         """
-        self.function_tokenizer = AutoTokenizer.from_pretrained(function_model_name)
-        self.function_model = T5ForConditionalGeneration.from_pretrained(function_model_name)
-        self.function_model.eval()
-        self.groq_client = Groq(api_key=groq_api_key)
+        self.function_model_name = function_model_name
+        self.device = device
+        self.dtype = dtype
+        self.backend = backend
+        self.cache = cache
+        self.max_input_length = 512
+        if decoding_profile not in Config.DECODING_PROFILES:
+            raise ValueError(f"Unknown decoding profile {decoding_profile!r}")
+        self.decoding_profile = decoding_profile
+        if long_function_strategy not in ("chunk", "truncate"):
+            raise ValueError(f"Unknown long function strategy {long_function_strategy!r}")
+        self.long_function_strategy = long_function_strategy
+        self.max_function_chunks = max_function_chunks
+        self.near_duplicates = NearDuplicateIndex(near_duplicate_threshold) if near_duplicate_threshold > 0 else None
+        self.trivial_fast_path = trivial_fast_path
+        self.stats = SummaryStats()
+        self._stats_lock = threading.Lock()
+        # Set by InferencePool.start(); generation then runs in its worker processes
+        self.inference_pool = None
+        self._groq_client = None
+        self.groq_api_key = groq_api_key
+        self.groq_base_url = groq_base_url
         self.groq_model = groq_model
+        self.group_max_tokens = 150
+        # Version of group_prompt_templates; part of the cache key of intermediate summaries
+        self.group_prompt_version = 1
+        self.response_cache = response_cache
+        # Version of prompt_templates; part of the response cache key of codebase summaries
+        self.prompt_version = 1
+        self.group_prompt_templates = {
+            "file": """
+            Summarize what this Python module does, based on summaries of its functions:
+
+            {summaries}
+
+            Provide 2-3 sentences covering the module's responsibility and main operations.
+            """,
+            "package": """
+            Summarize what this part of a codebase does, based on summaries of its modules and subpackages:
+
+            {summaries}
+
+            Provide 2-3 sentences covering its responsibility and how its parts fit together.
+            """
+        }
         self.prompt_templates = {
             "product_manager": """
             As a product manager, summarize the key features and user-facing functionalities of a codebase based on:
@@ -46,6 +171,45 @@ class Summarizer:
             Provide a summary (2-3 sentences, 50-100 words) focusing on purpose, modules, and dependencies.
             """
         }
+        # All perspectives in one completion; the function summaries appear only once
+        self.perspectives_prompt_template = """
+            Summarize a codebase for several readers, based on these function summaries:
+
+            {function_summaries}
+
+            Write one summary per reader:
+            {instructions}
+
+            Synthesize without repeating descriptions verbatim. Respond with only a JSON object whose keys are {keys} and whose values are the summaries.
+            """
+        self.perspective_instructions = {
+            "product_manager": "- product_manager: 2-3 sentences (50-100 words) on what the codebase does, its primary user-facing features, and benefits for users.",
+            "developer": "- developer: 3-4 sentences (100-150 words) outlining logic, data flow, and functionalities, focusing on technical aspects.",
+            "manager": "- manager: 2-3 sentences (50-100 words) on purpose, modules, and dependencies, for a project manager."
+        }
+        self.perspective_max_tokens = 200
+    
+    @property
+    def groq_client(self):
+        """Groq client, created on first use so importing and constructing stay cheap."""
+        if self._groq_client is None:
+            from groq import Groq
+            
+            self._groq_client = Groq(api_key=self.groq_api_key, base_url=self.groq_base_url)
+        return self._groq_client
+    
+    @property
+    def loaded_model(self) -> LoadedModel:
+        """The shared tokenizer/model pair, loaded lazily through the registry."""
+        return registry.get(self.function_model_name, self.device, self.dtype, self.backend)
+    
+    @property
+    def function_tokenizer(self):
+        return self.loaded_model.tokenizer
+    
+    @property
+    def function_model(self):
+        return self.loaded_model.model
     
     def summarize_function(self, function_code: str) -> str:
         """
@@ -57,26 +221,241 @@ class Summarizer:
         Returns:
             str: Summary or error message.
         """
+        return self.summarize_functions([function_code], batch_size=1)[0]
+    
+    def summarize_functions(self, function_codes: List[str], batch_size: int = 8,
+                            fingerprints: Optional[List[Optional[str]]] = None,
+                            profile: Optional[str] = None,
+                            docstrings: Optional[List[Optional[str]]] = None,
+                            decorators: Optional[List[Sequence[str]]] = None) -> List[str]:
+        """
+        Generate summaries for many functions, running several per generate call.
+        
+        Inputs with the same cache key are summarized once. Functions with a good
+        docstring (when docstrings are given) are summarized by its first sentence,
+        trivial functions get a template summary when trivial_fast_path is set, and
+        summaries already in the cache are reused. Of near-identical inputs (vendored
+        copies, generated stubs) only one is summarized when near-duplicate detection
+        is enabled. The remaining inputs are sorted by token length before batching so
+        each padded batch holds similarly sized functions. Functions longer than the
+        model input are split into chunks (see long_function_strategy) that are batched
+        alongside the rest. Summaries are returned in input order.
+        
+        Args:
+            function_codes (List[str]): Source code of each function.
+            batch_size (int): Maximum number of functions per generate call.
+            fingerprints (Optional[List[Optional[str]]]): AST fingerprints from
+                extract_functions(..., fingerprint=True); when given they replace the
+                source text in cache keys so cosmetic edits still hit the cache.
+            profile (Optional[str]): Decoding profile for this call (defaults to the
+                summarizer's decoding_profile).
+            docstrings (Optional[List[Optional[str]]]): Docstrings from
+                extract_functions(..., docstrings=True); usable ones replace inference
+                (see docstring_summary).
+            decorators (Optional[List[Sequence[str]]]): Each function's decorators
+                (FunctionRecord.decorators), which tell abstract methods apart from
+                other placeholders on the trivial fast path.
+        
+        Returns:
+            List[str]: One summary (or error message) per input, in input order.
+        """
+        if not function_codes:
+            return []
+        profile = profile or self.decoding_profile
+        fingerprints = fingerprints or [None] * len(function_codes)
+        keys = [self.cache_key(code, fp, profile) for code, fp in zip(function_codes, fingerprints)]
+        # First input index for every distinct key; duplicates share its summary
+        unique: Dict[str, int] = {}
+        for index, key in enumerate(keys):
+            unique.setdefault(key, index)
+        
+        resolved: Dict[str, str] = {}
+        if docstrings is not None:
+            for key, index in unique.items():
+                summary = docstring_summary(docstrings[index])
+                if summary is not None:
+                    resolved[key] = summary
+        from_docstrings = len(resolved)
+        if self.trivial_fast_path:
+            for key, index in unique.items():
+                summary = None if key in resolved else trivial_summary(
+                    function_codes[index], decorators[index] if decorators is not None else ()
+                )
+                if summary is not None:
+                    resolved[key] = summary
+        # Template and docstring summaries are cheap to rebuild and are not cached
+        trivial = len(resolved) - from_docstrings
+        skipped = len(resolved)
+        if self.cache is not None:
+            resolved.update(self.cache.get_many([key for key in unique if key not in resolved]))
+        pending = [key for key in unique if key not in resolved]
+        borrowed: List[int] = []
+        generate_seconds = 0.0
+        if pending:
+            start = time.perf_counter()
+            pending_codes = [function_codes[unique[key]] for key in pending]
+            if self.near_duplicates is not None:
+                generated, borrowed = self.near_duplicates.summarize(
+                    pending_codes,
+                    lambda codes: self._generate(codes, batch_size, profile),
+                    namespace=self.settings_namespace(profile)
+                )
+            else:
+                generated = self._generate(pending_codes, batch_size, profile)
+            generate_seconds = time.perf_counter() - start
+            fresh = dict(zip(pending, generated))
+            resolved.update(fresh)
+            if self.cache is not None:
+                # A summary borrowed from a near duplicate is approximate; storing it under this
+                # function's exact key would outlive the threshold (or the feature) that produced it
+                borrowed_keys = {pending[index] for index in borrowed}
+                self.cache.put_many({
+                    key: summary for key, summary in fresh.items()
+                    if key not in borrowed_keys and not summary.startswith("Error summarizing function")
+                })
+        near_duplicates = len(borrowed)
+        with self._stats_lock:
+            self.stats.functions += len(keys)
+            self.stats.docstrings += from_docstrings
+            self.stats.trivial += trivial
+            self.stats.cache_hits += len(unique) - len(pending) - skipped
+            self.stats.exact_duplicates += len(keys) - len(unique)
+            self.stats.near_duplicates += near_duplicates
+            self.stats.generated += len(pending) - near_duplicates
+            self.stats.generate_seconds += generate_seconds
+        logger.info(
+            f"Generated {len(pending) - near_duplicates} function summaries in batches of {batch_size} ({profile}), "
+            f"{from_docstrings} from docstrings, {trivial} trivial, "
+            f"{len(unique) - len(pending) - skipped} served from cache, "
+            f"{len(keys) - len(unique)} duplicates and {near_duplicates} near duplicates reused"
+        )
+        return [resolved[key] for key in keys]
+    
+    def generation_kwargs(self, profile: Optional[str] = None) -> Dict:
+        """generate() keyword arguments of a decoding profile (defaults to decoding_profile)."""
+        return Config.DECODING_PROFILES[profile or self.decoding_profile]
+    
+    def generation_settings(self, profile: Optional[str] = None) -> Dict:
+        """Every setting besides the model that changes the summary a function gets."""
+        return dict(
+            self.generation_kwargs(profile),
+            max_input_length=self.max_input_length,
+            backend=self.backend,
+            long_functions=self.long_function_strategy
+        )
+    
+    def cache_key(self, function_code: str, fingerprint: Optional[str] = None, profile: Optional[str] = None) -> str:
+        """Cache key for a function under this summarizer's model and generation settings."""
+        return make_cache_key(function_code, self.function_model_name, self.generation_settings(profile), fingerprint)
+    
+    def settings_namespace(self, profile: Optional[str] = None) -> str:
+        """Near-duplicate index namespace: summaries are only shared under the same model and settings."""
+        return json.dumps({'model': self.function_model_name, 'settings': self.generation_settings(profile)}, sort_keys=True)
+    
+    def _generate(self, function_codes: List[str], batch_size: int, profile: Optional[str] = None) -> List[str]:
+        if self.inference_pool is not None:
+            return self.inference_pool.generate(function_codes, batch_size, profile)
+        return self._generate_local(function_codes, batch_size, profile)
+    
+    def _generate_local(self, function_codes: List[str], batch_size: int, profile: Optional[str] = None) -> List[str]:
+        batch_size = max(1, batch_size)
         try:
-            inputs = self.function_tokenizer(
-                function_code,
-                return_tensors="pt",
-                max_length=512,
+            encodings = self.function_tokenizer(
+                function_codes,
+                max_length=self.max_input_length,
                 truncation=True
             )
-            outputs = self.function_model.generate(
-                input_ids=inputs["input_ids"],
-                attention_mask=inputs["attention_mask"],
-                max_length=50,
-                num_beams=4,
-                early_stopping=True
-            )
-            summary = self.function_tokenizer.decode(outputs[0], skip_special_tokens=True)
-            logger.info(f"Generated summary for function: {summary}")
-            return summary
         except Exception as e:
-            logger.error(f"Error summarizing function: {e}")
-            return f"Error summarizing function: {e}"
+            logger.error(f"Error tokenizing functions: {e}")
+            return [f"Error summarizing function: {e}"] * len(function_codes)
+        
+        # One entry per model input: (function index, input_ids, attention_mask)
+        units: List[Tuple[int, List[int], List[int]]] = []
+        for index, (input_ids, attention_mask) in enumerate(zip(encodings["input_ids"], encodings["attention_mask"])):
+            chunks = self._chunks(function_codes[index]) if len(input_ids) >= self.max_input_length else []
+            if len(chunks) > 1:
+                chunk_encodings = self.function_tokenizer(chunks, max_length=self.max_input_length, truncation=True)
+                units.extend(
+                    (index, ids, mask)
+                    for ids, mask in zip(chunk_encodings["input_ids"], chunk_encodings["attention_mask"])
+                )
+            else:
+                units.append((index, input_ids, attention_mask))
+        
+        # Sorting by length keeps padding to the longest input of each batch small
+        order = sorted(range(len(units)), key=lambda i: len(units[i][1]))
+        unit_summaries: List[str] = [""] * len(units)
+        for start in range(0, len(order), batch_size):
+            batch_indices = order[start:start + batch_size]
+            try:
+                inputs = self.function_tokenizer.pad(
+                    {
+                        "input_ids": [units[i][1] for i in batch_indices],
+                        "attention_mask": [units[i][2] for i in batch_indices],
+                    },
+                    return_tensors="pt"
+                )
+                outputs = self.function_model.generate(
+                    input_ids=inputs["input_ids"].to(self.device),
+                    attention_mask=inputs["attention_mask"].to(self.device),
+                    **self.generation_kwargs(profile)
+                )
+                batch_summaries = self.function_tokenizer.batch_decode(outputs, skip_special_tokens=True)
+            except Exception as e:
+                logger.error(f"Error summarizing function batch: {e}")
+                batch_summaries = [f"Error summarizing function: {e}"] * len(batch_indices)
+            for index, summary in zip(batch_indices, batch_summaries):
+                unit_summaries[index] = summary
+        
+        parts: List[List[str]] = [[] for _ in function_codes]
+        for (index, _, _), summary in zip(units, unit_summaries):
+            parts[index].append(summary)
+        chunked = sum(len(p) > 1 for p in parts)
+        if chunked:
+            logger.info(f"Split {chunked} long functions into {len(units) - len(function_codes) + chunked} chunks")
+        return [self.combine_chunk_summaries(p) for p in parts]
+    
+    def _chunks(self, function_code: str) -> List[str]:
+        """Statement-aligned pieces of a function too long for the model input."""
+        if self.long_function_strategy != "chunk":
+            return []
+        tokenizer = self.function_tokenizer
+        # The budget leaves room for the end-of-sequence token added on encoding
+        chunks = split_function_source(
+            function_code,
+            self.max_input_length - 1,
+            lambda text: len(tokenizer(text, add_special_tokens=False)["input_ids"])
+        )
+        if len(chunks) > self.max_function_chunks:
+            logger.warning(
+                f"Function split into {len(chunks)} chunks; summarizing the first {self.max_function_chunks}"
+            )
+            chunks = chunks[:self.max_function_chunks]
+        return chunks
+    
+    @staticmethod
+    def combine_chunk_summaries(summaries: List[str]) -> str:
+        """
+        Join the summaries of a function's chunks into one summary.
+        
+        Args:
+            summaries (List[str]): Summaries of consecutive chunks, in source order.
+        
+        Returns:
+            str: The single summary unchanged, the first error if any chunk failed,
+            otherwise the distinct chunk summaries as consecutive sentences.
+        """
+        if len(summaries) == 1:
+            return summaries[0]
+        for summary in summaries:
+            if summary.startswith("Error summarizing function"):
+                return summary
+        sentences: List[str] = []
+        for summary in summaries:
+            sentence = summary.strip().rstrip(".")
+            if sentence and sentence.lower() not in (s.lower() for s in sentences):
+                sentences.append(sentence)
+        return " ".join(f"{s[0].upper()}{s[1:]}." for s in sentences)
     
     def summarize_codebase(self, function_summaries: List[str], user_type: str = "product_manager") -> str:
         """
@@ -89,35 +468,250 @@ class Summarizer:
         Returns:
             str: Overall summary or fallback message.
         """
-        summaries_str = "\n".join([f"- {summary}" for summary in function_summaries])
-        prompt = self.prompt_templates.get(user_type, self.prompt_templates["product_manager"]).format(function_summaries=summaries_str)
+        if self.response_cache is None:
+            return self._summarize_codebase(function_summaries, user_type)
+        return self.response_cache.get_or_compute(
+            self.codebase_cache_key(function_summaries, user_type),
+            lambda: self._summarize_codebase(function_summaries, user_type),
+            store=lambda summary: summary != FALLBACK_SUMMARY
+        )
+    
+    def _summarize_codebase(self, function_summaries: List[str], user_type: str) -> str:
+        prompt = self.build_codebase_prompt(function_summaries, user_type)
         logger.debug(f"Generated Prompt: {prompt}")
         
         try:
-            completion = self.groq_client.chat.completions.create(
-                model=self.groq_model,
-                messages=[
-                    {"role": "system", "content": "You are an expert summarizer. Provide clear, concise, and accurate summaries."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=200,
-                temperature=0.3,
-                top_p=0.9,
-                stream=True  # Enable streaming
-            )
-            summary = ""
-            for chunk in completion:
-                chunk_content = chunk.choices[0].delta.content or ""
-                summary += chunk_content
-            summary = summary.strip()
+            summary = self._complete(prompt)
             logger.debug(f"Raw Response: {summary}")
-            if not summary or any(keyword in summary.lower() for keyword in ["as a product manager", "function descriptions"]):
-                fallback = "The codebase enables financial transaction management, including recording transactions, tracking balances, and categorizing spending."
-                logger.warning(f"Using fallback summary: {fallback}")
-                return fallback
-            return summary
+            return self.finalize_codebase_summary(summary)
         except Exception as e:
             logger.error(f"Error generating summary with Groq API: {e}")
             if "401" in str(e):
                 logger.error("401 Error: Invalid API key. Verify in Groq Console (https://console.groq.com).")
-            return "The codebase enables financial transaction management, including recording transactions, tracking balances, and categorizing spending."
\ No newline at end of file
+            return FALLBACK_SUMMARY
+    
+    def summarize_perspectives(self, function_summaries: List[str],
+                               user_types: Optional[List[str]] = None) -> Dict[str, str]:
+        """
+        Generate several perspectives of the codebase in one round trip.
+        
+        Perspectives already in the response cache, or being generated by another
+        caller, are reused. The rest are registered as in flight, so concurrent
+        identical requests wait for this one, and requested together in one
+        completion that answers with a JSON object holding one summary per
+        perspective; the summaries are stored in the response cache, so a later
+        summarize_codebase or stream_codebase_summary for any of them is instant.
+        Perspectives missing from or unusable in that answer are generated one per
+        call, concurrently.
+        
+        Args:
+            function_summaries (List[str]): List of function summaries.
+            user_types (Optional[List[str]]): Perspectives to generate (default: all).
+        
+        Returns:
+            Dict[str, str]: Summary (or fallback message) per perspective, in request order.
+        """
+        user_types = list(dict.fromkeys(user_types or self.prompt_templates))
+        unknown = [user_type for user_type in user_types if user_type not in self.prompt_templates]
+        if unknown:
+            raise ValueError(f"Unknown perspective(s) {', '.join(unknown)}")
+        keys = {user_type: self.codebase_cache_key(function_summaries, user_type) for user_type in user_types}
+        results: Dict[str, str] = {}
+        # Cached perspectives and those another caller is already generating
+        joined: Dict[str, Future] = {}
+        led = user_types
+        if self.response_cache is not None:
+            led = []
+            for user_type in user_types:
+                future, leader = self.response_cache.begin(keys[user_type])
+                if leader:
+                    led.append(user_type)
+                else:
+                    joined[user_type] = future
+        
+        def resolve(user_type: str, summary: str):
+            results[user_type] = summary
+            if self.response_cache is not None:
+                self.response_cache.finish(keys[user_type], summary, store=summary != FALLBACK_SUMMARY)
+        
+        individual: List[str] = []
+        try:
+            if len(led) > 1:
+                for user_type, summary in self._complete_perspectives(function_summaries, led).items():
+                    resolve(user_type, summary)
+            individual = [user_type for user_type in led if user_type not in results]
+            if individual:
+                with ThreadPoolExecutor(max_workers=len(individual)) as executor:
+                    summaries = executor.map(
+                        lambda user_type: self._summarize_codebase(function_summaries, user_type), individual
+                    )
+                    for user_type, summary in zip(individual, summaries):
+                        resolve(user_type, summary)
+        except BaseException as e:
+            if self.response_cache is not None:
+                for user_type in led:
+                    if user_type not in results:
+                        self.response_cache.fail(keys[user_type], e)
+            raise
+        for user_type, future in joined.items():
+            results[user_type] = future.result()
+        logger.info(
+            f"Generated {len(user_types)} perspectives: {len(joined)} from the cache or a concurrent request, "
+            f"{len(led) - len(individual)} in one combined request, {len(individual)} individually"
+        )
+        return {user_type: results[user_type] for user_type in user_types}
+    
+    def build_perspectives_prompt(self, function_summaries: List[str], user_types: List[str]) -> str:
+        """Fill the combined prompt with the function summaries and one instruction per perspective."""
+        summaries_str = "\n".join([f"- {summary}" for summary in function_summaries])
+        return self.perspectives_prompt_template.format(
+            function_summaries=summaries_str,
+            instructions="\n".join(self.perspective_instructions[user_type] for user_type in user_types),
+            keys=", ".join(f'"{user_type}"' for user_type in user_types)
+        )
+    
+    def _complete_perspectives(self, function_summaries: List[str], user_types: List[str]) -> Dict[str, str]:
+        """The usable summaries of one combined completion, by perspective; empty on failure."""
+        prompt = self.build_perspectives_prompt(function_summaries, user_types)
+        try:
+            text = self._complete(prompt, max_tokens=self.perspective_max_tokens * len(user_types))
+        except Exception as e:
+            logger.error(f"Error generating perspectives with Groq API: {e}")
+            return {}
+        # Models sometimes wrap the object in a code fence or a sentence
+        start, end = text.find("{"), text.rfind("}")
+        try:
+            data = json.loads(text[start:end + 1]) if 0 <= start < end else {}
+        except json.JSONDecodeError as e:
+            logger.warning(f"Combined perspectives response is not valid JSON: {e}")
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        summaries = {}
+        for user_type in user_types:
+            value = data.get(user_type)
+            summary = self.finalize_codebase_summary(value.strip()) if isinstance(value, str) else FALLBACK_SUMMARY
+            if summary != FALLBACK_SUMMARY:
+                summaries[user_type] = summary
+        return summaries
+    
+    def codebase_cache_key(self, function_summaries: List[str], user_type: str = "product_manager") -> str:
+        """Response cache key of a codebase summary (see make_response_key)."""
+        perspective = user_type if user_type in self.prompt_templates else "product_manager"
+        return make_response_key(self.groq_model, self.prompt_version, perspective, function_summaries)
+    
+    def build_codebase_prompt(self, function_summaries: List[str], user_type: str = "product_manager") -> str:
+        """Fill the perspective's prompt template with the function summaries."""
+        summaries_str = "\n".join([f"- {summary}" for summary in function_summaries])
+        return self.prompt_templates.get(user_type, self.prompt_templates["product_manager"]).format(function_summaries=summaries_str)
+    
+    @staticmethod
+    def finalize_codebase_summary(summary: str) -> str:
+        """Return the summary, or the fallback if it is empty or just echoes the prompt."""
+        if not summary or any(keyword in summary.lower() for keyword in ["as a product manager", "function descriptions"]):
+            logger.warning(f"Using fallback summary: {FALLBACK_SUMMARY}")
+            return FALLBACK_SUMMARY
+        return summary
+    
+    def summarize_group(self, summaries: List[str], level: str) -> Optional[str]:
+        """
+        Condense a group of summaries into one intermediate summary (e.g. for a file or package).
+        
+        Args:
+            summaries (List[str]): Summaries of the group's members.
+            level (str): Key of group_prompt_templates ("file" or "package").
+        
+        Returns:
+            Optional[str]: The condensed summary, or None if the API call failed.
+        """
+        summaries_str = "\n".join([f"- {summary}" for summary in summaries])
+        prompt = self.group_prompt_templates[level].format(summaries=summaries_str)
+        try:
+            summary = self._complete(prompt, max_tokens=self.group_max_tokens)
+            return summary or None
+        except Exception as e:
+            logger.error(f"Error generating {level} summary with Groq API: {e}")
+            return None
+    
+    def stream_codebase_summary(self, function_summaries: List[str], user_type: str = "product_manager") -> Iterator[str]:
+        """
+        Stream the overall codebase summary token by token as Groq produces it.
+        
+        Unlike summarize_codebase, the prompt-echo check cannot be applied to text
+        that was already yielded; callers can pass the joined text through
+        finalize_codebase_summary once the stream ends. If the request fails before
+        any text arrives, the fallback summary is yielded instead. With a response
+        cache, a cached summary is yielded whole, and a request identical to one in
+        flight waits for that one's summary instead of calling Groq again.
+        
+        Args:
+            function_summaries (List[str]): List of function summaries.
+            user_type (str): Type of user (product_manager, developer, manager).
+        
+        Returns:
+            Iterator[str]: Text deltas in arrival order.
+        """
+        key = None
+        if self.response_cache is not None:
+            key = self.codebase_cache_key(function_summaries, user_type)
+            future, leader = self.response_cache.begin(key)
+            if not leader:
+                try:
+                    yield future.result()
+                    return
+                except Exception:
+                    # The leading request was abandoned; make our own, uncached
+                    key = None
+        prompt = self.build_codebase_prompt(function_summaries, user_type)
+        parts: List[str] = []
+        failed = False
+        try:
+            try:
+                for delta in self._stream(prompt):
+                    parts.append(delta)
+                    yield delta
+            except Exception as e:
+                failed = True
+                logger.error(f"Error streaming summary with Groq API: {e}")
+                if "401" in str(e):
+                    logger.error("401 Error: Invalid API key. Verify in Groq Console (https://console.groq.com).")
+            if not parts:
+                yield FALLBACK_SUMMARY
+        except BaseException as e:
+            # Includes the consumer closing the stream early
+            if key is not None:
+                self.response_cache.fail(key, e)
+            raise
+        if key is not None:
+            summary = self.finalize_codebase_summary("".join(parts).strip())
+            # A stream cut off by an error is passed to waiting callers but not cached
+            self.response_cache.finish(key, summary, store=not failed and summary != FALLBACK_SUMMARY)
+    
+    def _complete(self, prompt: str, max_tokens: int = 200) -> str:
+        """Run one streamed chat completion and return the stripped text."""
+        return "".join(self._stream(prompt, max_tokens)).strip()
+    
+    def _stream(self, prompt: str, max_tokens: int = 200) -> Iterator[str]:
+        """Yield the non-empty content deltas of one streamed chat completion, logging latency."""
+        start = time.perf_counter()
+        first_token = None
+        completion = self.groq_client.chat.completions.create(
+            model=self.groq_model,
+            messages=[
+                {"role": "system", "content": "You are an expert summarizer. Provide clear, concise, and accurate summaries."},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=0.3,
+            top_p=0.9,
+            stream=True  # Enable streaming
+        )
+        for chunk in completion:
+            chunk_content = chunk.choices[0].delta.content if chunk.choices else None
+            if chunk_content:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                yield chunk_content
+        total = time.perf_counter() - start
+        ttft = f"{first_token:.2f}s" if first_token is not None else "n/a"
+        logger.info(f"Groq completion: time to first token {ttft}, total {total:.2f}s")
@@ -0,0 +1,268 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import textwrap
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+def normalize_source(function_code: str) -> str:
+    """
+    Normalize function source so indentation and trailing whitespace do not affect its key.
+    
+    Args:
+        function_code (str): Source code of the function.
+    
+    Returns:
+        str: Dedented source with trailing whitespace and blank lines removed.
+    """
+    lines = textwrap.dedent(function_code).splitlines()
+    return "\n".join(line.rstrip() for line in lines if line.strip())
+
+def make_cache_key(function_code: str, model_name: str, settings: Dict, fingerprint: Optional[str] = None) -> str:
+    """
+    Build a content-addressed cache key for a function summary.
+    
+    Args:
+        function_code (str): Source code of the function.
+        model_name (str): Model that produces the summary.
+        settings (Dict): Generation settings that influence the summary.
+        fingerprint (Optional[str]): AST fingerprint used in place of the normalized source.
+    
+    Returns:
+        str: Hex SHA-256 digest over the source (or fingerprint), model name and settings.
+    """
+    source = f"ast:{fingerprint}" if fingerprint else normalize_source(function_code)
+    payload = json.dumps(
+        {'source': source, 'model': model_name, 'settings': settings},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SummaryCache:
+    """Persistent SQLite store of function summaries with size-bounded LRU eviction."""
+    
+    def __init__(self, path: str, max_entries: int = 100_000):
+        """
+        Open (or create) the cache database.
+        
+        Args:
+            path (str): Path of the SQLite database file.
+            max_entries (int): Entries kept before least recently used ones are evicted.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                summary TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS summaries_last_access ON summaries (last_access);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached summary for key, or None on a miss."""
+        return self.get_many([key]).get(key)
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up several keys at once and refresh their LRU position.
+        
+        Args:
+            keys (Iterable[str]): Cache keys to look up.
+        
+        Returns:
+            Dict[str, str]: Summaries for the keys that were found.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        found: Dict[str, str] = {}
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, summary FROM summaries WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                found.update(rows)
+            if found:
+                self._conn.executemany(
+                    "UPDATE summaries SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+            hits, misses = len(found), len(keys) - len(found)
+            self.hits += hits
+            self.misses += misses
+            self._bump_counters(hits, misses)
+            self._conn.commit()
+        return found
+    
+    def put(self, key: str, summary: str):
+        """Store a single summary."""
+        self.put_many({key: summary})
+    
+    def put_many(self, items: Dict[str, str]):
+        """
+        Store several summaries and evict least recently used entries beyond the size bound.
+        
+        Args:
+            items (Dict[str, str]): Summaries keyed by cache key.
+        """
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO summaries (key, summary, created, last_access) VALUES (?, ?, ?, ?)",
+                [(key, summary, now, now) for key, summary in items.items()]
+            )
+            self._evict(self.max_entries)
+            self._conn.commit()
+    
+    def prune(self, max_entries: int) -> int:
+        """
+        Evict least recently used entries until at most max_entries remain.
+        
+        Args:
+            max_entries (int): Number of entries to keep.
+        
+        Returns:
+            int: Number of entries removed.
+        """
+        with self._lock:
+            removed = self._evict(max_entries)
+            self._conn.commit()
+        return removed
+    
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM summaries")
+            self._conn.execute("DELETE FROM counters")
+            self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+    
+    def stats(self) -> Dict:
+        """
+        Report the cache size and hit/miss counters.
+        
+        Returns:
+            Dict: Keys 'path', 'entries', 'max_entries', 'size_bytes', 'hits', 'misses'
+            (persisted across processes) and 'session_hits', 'session_misses' (this instance).
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+            counters = dict(self._conn.execute("SELECT name, value FROM counters").fetchall())
+        return {
+            'path': self.path,
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'size_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            'hits': counters.get('hits', 0),
+            'misses': counters.get('misses', 0),
+            'session_hits': self.hits,
+            'session_misses': self.misses
+        }
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+    
+    def _evict(self, max_entries: int) -> int:
+        excess = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0] - max_entries
+        if excess <= 0:
+            return 0
+        self._conn.execute(
+            "DELETE FROM summaries WHERE key IN (SELECT key FROM summaries ORDER BY last_access LIMIT ?)",
+            (excess,)
+        )
+        logger.info(f"Evicted {excess} least recently used summaries from {self.path}")
+        return excess
+    
+    def _bump_counters(self, hits: int, misses: int):
+        for name, value in (('hits', hits), ('misses', misses)):
+            if value:
+                self._conn.execute(
+                    "INSERT INTO counters (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    (name, value)
+                )
+
+_shared_caches: Dict[str, SummaryCache] = {}
+_shared_lock = threading.Lock()
+
+def shared_cache(path: str, max_entries: int = 100_000) -> SummaryCache:
+    """
+    Return a process-wide SummaryCache for path, opening it on first use.
+    
+    Args:
+        path (str): Path of the SQLite database file.
+        max_entries (int): Entries kept before least recently used ones are evicted.
+    
+    Returns:
+        SummaryCache: The cache shared by every caller in this process.
+    """
+    with _shared_lock:
+        cache = _shared_caches.get(path)
+        if cache is None:
+            cache = SummaryCache(path, max_entries=max_entries)
+            _shared_caches[path] = cache
+        return cache
+
+def main(argv: Optional[List[str]] = None):
+    """Inspect or prune the on-disk summary cache."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    from src.config import Config
+    
+    parser = argparse.ArgumentParser(description="Inspect or prune the CodeSage summary cache.")
+    parser.add_argument("--path", default=Config.SUMMARY_CACHE_PATH, help="Path of the cache database.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help="Show entry count, size and hit/miss counters.")
+    prune_parser = subparsers.add_parser("prune", help="Evict least recently used entries.")
+    prune_parser.add_argument("--max-entries", type=int, required=True, help="Number of entries to keep.")
+    subparsers.add_parser("clear", help="Remove every entry and reset counters.")
+    args = parser.parse_args(argv)
+    
+    cache = SummaryCache(args.path, max_entries=Config.SUMMARY_CACHE_MAX_ENTRIES)
+    try:
+        if args.command == "stats":
+            stats = cache.stats()
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+            print(json.dumps(stats, indent=2))
+        elif args.command == "prune":
+            print(f"Removed {cache.prune(args.max_entries)} entries")
+        elif args.command == "clear":
+            cache.clear()
+            print(f"Cleared {args.path}")
+    finally:
+        cache.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import ast
+import re
+import reprlib
+import textwrap
+from typing import List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+ABSTRACT_DECORATORS = ("abstractmethod", "abc.abstractmethod")
+# Constants are quoted in summaries, which end up in Groq prompts; long ones are elided in the middle
+_CONSTANT_REPR = reprlib.Repr()
+_CONSTANT_REPR.maxstring = _CONSTANT_REPR.maxother = _CONSTANT_REPR.maxlong = 40
+# A sentence ends at punctuation followed by a capitalized word, unless it is an abbreviation
+_SENTENCE_END = re.compile(r"[.!?]\s+(?=[A-Z])")
+_ABBREVIATIONS = ("e.g.", "i.e.", "etc.", "vs.", "cf.")
+# First sentences that say nothing about what the function does
+_UNINFORMATIVE = re.compile(
+    r"^(todo|fixme|xxx|hack|deprecated|internal|private|helper|wrapper|see |note:|args:|returns:|"
+    r"parameters|:param|>>>|\w+\(.*\)\s*(->.*)?$)",
+    re.IGNORECASE
+)
+
+def _parse_function(code: str) -> Optional[ast.AST]:
+    for source in (code, textwrap.dedent(code)):
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            continue
+        if len(tree.body) == 1 and isinstance(tree.body[0], (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return tree.body[0]
+        return None
+    return None
+
+def _is_docstring(stmt: ast.stmt) -> bool:
+    return isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant) and isinstance(stmt.value.value, str)
+
+def _is_empty(stmt: ast.stmt) -> bool:
+    """pass, ... or a lone docstring."""
+    if isinstance(stmt, ast.Pass) or _is_docstring(stmt):
+        return True
+    return isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant) and stmt.value.value is Ellipsis
+
+def _is_not_implemented(stmt: ast.stmt) -> bool:
+    """raise NotImplementedError, with or without a message."""
+    if isinstance(stmt, ast.Raise) and stmt.exc is not None:
+        exc = stmt.exc.func if isinstance(stmt.exc, ast.Call) else stmt.exc
+        return isinstance(exc, ast.Name) and exc.id == "NotImplementedError"
+    return False
+
+def _parameters(node: ast.AST) -> List[str]:
+    args = node.args
+    names = [a.arg for a in args.posonlyargs + args.args + args.kwonlyargs]
+    names += [a.arg for a in (args.vararg, args.kwarg) if a is not None]
+    return names
+
+def _dotted(expr: ast.expr) -> Optional[str]:
+    """'self._items.append' for a chain of names and attributes, otherwise None."""
+    parts = []
+    while isinstance(expr, ast.Attribute):
+        parts.append(expr.attr)
+        expr = expr.value
+    if not isinstance(expr, ast.Name):
+        return None
+    parts.append(expr.id)
+    return ".".join(reversed(parts))
+
+def _forwards_parameters(call: ast.Call, parameters: List[str]) -> bool:
+    """True if every argument of the call is a parameter passed through unchanged."""
+    values = list(call.args) + [keyword.value for keyword in call.keywords]
+    values = [v.value if isinstance(v, ast.Starred) else v for v in values]
+    return all(isinstance(v, ast.Name) and v.id in parameters for v in values)
+
+def trivial_summary(code: str, decorators: Sequence[str] = ()) -> Optional[str]:
+    """
+    Template summary for a function too simple to need the model.
+    
+    Recognized shapes, ignoring a leading docstring: abstract methods and bodies
+    that raise NotImplementedError, empty bodies (pass, ...), returning an attribute
+    of self or cls, self itself, a constant or a parameter, setting one attribute of
+    self from a parameter, and delegating to another callable with the function's
+    own parameters.
+    
+    Args:
+        code (str): Source code of one function.
+        decorators (Sequence[str]): Decorator source without the '@', as in
+            FunctionRecord.decorators; extracted code starts at the def line and
+            does not include them.
+    
+    Returns:
+        Optional[str]: The template summary, or None if the function is not trivial
+        (or cannot be parsed on its own).
+    """
+    node = _parse_function(code)
+    if node is None:
+        return None
+    body = node.body[1:] if len(node.body) > 1 and _is_docstring(node.body[0]) else node.body
+    if len(body) != 1:
+        return None
+    stmt = body[0]
+    parameters = _parameters(node)
+    owner = parameters[0] if parameters and parameters[0] in ("self", "cls") else None
+    
+    abstract = any(_dotted(d) in ABSTRACT_DECORATORS for d in node.decorator_list) \
+        or any(d.strip() in ABSTRACT_DECORATORS for d in decorators)
+    if _is_not_implemented(stmt) or (abstract and _is_empty(stmt)):
+        return "Abstract placeholder"
+    if _is_empty(stmt):
+        return "Placeholder that does nothing"
+    if isinstance(stmt, ast.Return):
+        value = stmt.value
+        if value is None or (isinstance(value, ast.Constant) and value.value is None):
+            return "Does nothing and returns None"
+        if isinstance(value, ast.Constant):
+            return f"Returns constant `{_CONSTANT_REPR.repr(value.value)}`"
+        if owner and isinstance(value, ast.Attribute) and _dotted(value) == f"{owner}.{value.attr}":
+            return f"Returns attribute `{value.attr}`"
+        if owner and isinstance(value, ast.Name) and value.id == owner:
+            return "Returns the instance itself" if owner == "self" else "Returns the class itself"
+        if isinstance(value, ast.Name) and value.id in parameters:
+            return f"Returns its argument `{value.id}`"
+    if (
+        owner == "self" and isinstance(stmt, ast.Assign) and len(stmt.targets) == 1
+        and isinstance(stmt.targets[0], ast.Attribute) and _dotted(stmt.targets[0]) == f"self.{stmt.targets[0].attr}"
+        and isinstance(stmt.value, (ast.Name, ast.Constant))
+        and (not isinstance(stmt.value, ast.Name) or stmt.value.id in parameters)
+    ):
+        return f"Sets attribute `{stmt.targets[0].attr}`"
+    call = stmt.value if isinstance(stmt, (ast.Return, ast.Expr)) else None
+    if isinstance(call, ast.Await):
+        call = call.value
+    if isinstance(call, ast.Call) and _forwards_parameters(call, parameters):
+        if isinstance(call.func, ast.Attribute) and isinstance(call.func.value, ast.Call) \
+                and _dotted(call.func.value.func) == "super":
+            return f"Delegates to the parent class's `{call.func.attr}`"
+        target = _dotted(call.func)
+        if target is not None:
+            return f"Delegates to `{target}`"
+    return None
+
+def docstring_summary(docstring: Optional[str], min_words: int = 3, max_words: int = 40) -> Optional[str]:
+    """
+    First sentence of a docstring, if it is good enough to stand in as the summary.
+    
+    The sentence is taken from the first paragraph. It is rejected when it is too
+    short or long to be a summary, is a note (TODO, Deprecated, ...), an argument or
+    doctest section, or just repeats a signature.
+    
+    Args:
+        docstring (Optional[str]): Cleaned docstring, as returned by ast.get_docstring.
+        min_words (int): Fewest words of an acceptable sentence.
+        max_words (int): Most words of an acceptable sentence.
+    
+    Returns:
+        Optional[str]: The sentence, capitalized and ending in punctuation, or None.
+    """
+    if not docstring:
+        return None
+    paragraph = " ".join(docstring.strip().split("\n\n", 1)[0].split())
+    sentence = paragraph
+    for match in _SENTENCE_END.finditer(paragraph):
+        if not paragraph[:match.start() + 1].lower().endswith(_ABBREVIATIONS):
+            sentence = paragraph[:match.start() + 1]
+            break
+    sentence = sentence.strip()
+    if _UNINFORMATIVE.match(sentence) or not min_words <= len(sentence.split()) <= max_words:
+        return None
+    if not any(c.isalpha() for c in sentence):
+        return None
+    if sentence[-1] not in ".!?":
+        sentence += "."
+    return sentence[0].upper() + sentence[1:]
@@ -0,0 +1,150 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+def _worker_main(summarizer, threads: int, tasks, results):
+    """Inference process: pull batches from the shared task queue until a None sentinel arrives."""
+    import torch
+    
+    torch.set_num_threads(threads)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        job_id, function_codes, batch_size, profile = task
+        try:
+            summaries = summarizer._generate_local(function_codes, batch_size, profile)
+        except Exception as e:
+            logger.error(f"Inference worker {os.getpid()} failed on a batch: {e}")
+            summaries = [f"Error summarizing function: {e}"] * len(function_codes)
+        results.put((job_id, summaries))
+
+class InferencePool:
+    """
+    Runs local function summarization in several forked processes.
+    
+    PyTorch's intra-op threading scales poorly for the small seq2seq batches used
+    here, so on many-core machines it is faster to run N processes with a few
+    threads each. The model is loaded once in the parent before forking; workers
+    inherit the weights copy-on-write, so resident memory grows by the activations
+    of each worker, not by one model per worker. Batches are pushed to one shared
+    queue and taken by whichever worker is idle.
+    
+    Forking requires a POSIX platform, and the parent must not have run inference
+    before start() (OpenMP thread pools do not survive a fork). While started, the
+    summarizer's summarize_functions sends its cache misses to the pool.
+    """
+    
+    def __init__(self, summarizer, workers: int = 2, threads_per_worker: Optional[int] = None):
+        """
+        Args:
+            summarizer (Summarizer): Summarizer whose model and settings the workers use.
+            workers (int): Number of inference processes.
+            threads_per_worker (Optional[int]): torch.set_num_threads in each worker;
+                defaults to an even share of the CPU cores.
+        """
+        if summarizer.device != "cpu":
+            raise ValueError(f"InferencePool only supports CPU inference, not {summarizer.device!r}")
+        self.summarizer = summarizer
+        self.workers = max(1, workers)
+        self.threads_per_worker = threads_per_worker or max(1, (os.cpu_count() or 1) // self.workers)
+        self._context = multiprocessing.get_context("fork")
+        self._tasks = None
+        self._results = None
+        self._processes: List[multiprocessing.Process] = []
+        self._lock = threading.Lock()
+        self._next_job = 0
+    
+    def start(self) -> "InferencePool":
+        """Load the model in this process, fork the workers and attach the pool to the summarizer."""
+        if self._processes:
+            return self
+        start = time.perf_counter()
+        # ONNX Runtime sessions are not fork-safe, so those workers load their own
+        if self.summarizer.backend != "onnx":
+            self.summarizer.loaded_model
+        self._tasks = self._context.Queue()
+        self._results = self._context.Queue()
+        for _ in range(self.workers):
+            process = self._context.Process(
+                target=_worker_main,
+                args=(self.summarizer, self.threads_per_worker, self._tasks, self._results),
+                daemon=True
+            )
+            process.start()
+            self._processes.append(process)
+        self.summarizer.inference_pool = self
+        logger.info(
+            f"Started {self.workers} inference workers with {self.threads_per_worker} threads each "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+        return self
+    
+    def generate(self, function_codes: List[str], batch_size: int, profile: Optional[str] = None) -> List[str]:
+        """
+        Summarize functions across the workers, one batch per task.
+        
+        Args:
+            function_codes (List[str]): Source code of each function.
+            batch_size (int): Functions per task (and per generate call in the worker).
+            profile (Optional[str]): Decoding profile passed to the workers.
+        
+        Returns:
+            List[str]: One summary (or error message) per input, in input order.
+        """
+        if not self._processes:
+            raise RuntimeError("InferencePool.generate called before start()")
+        batch_size = max(1, batch_size)
+        # Neighbouring lengths share a batch, keeping padding low inside each worker
+        order = sorted(range(len(function_codes)), key=lambda i: len(function_codes[i]))
+        summaries: List[str] = [""] * len(function_codes)
+        with self._lock:
+            jobs = {}
+            for start in range(0, len(order), batch_size):
+                indices = order[start:start + batch_size]
+                job_id = self._next_job
+                self._next_job += 1
+                jobs[job_id] = indices
+                self._tasks.put((job_id, [function_codes[i] for i in indices], batch_size, profile))
+            while jobs:
+                try:
+                    job_id, batch_summaries = self._results.get(timeout=1.0)
+                except queue.Empty:
+                    dead = [p.pid for p in self._processes if not p.is_alive()]
+                    if dead:
+                        raise RuntimeError(f"Inference workers {dead} exited with {len(jobs)} batches outstanding")
+                    continue
+                # Results of a call that failed part-way are left over; skip them
+                if job_id not in jobs:
+                    continue
+                for index, summary in zip(jobs.pop(job_id), batch_summaries):
+                    summaries[index] = summary
+        return summaries
+    
+    def close(self):
+        """Stop the workers and detach the pool from the summarizer."""
+        if not self._processes:
+            return
+        if self.summarizer.inference_pool is self:
+            self.summarizer.inference_pool = None
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._tasks.close()
+        self._results.close()
+    
+    def __enter__(self) -> "InferencePool":
+        return self.start()
+    
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,11 +1,17 @@
 import streamlit as st
-import os
+import hashlib
 import nest_asyncio
 from streamlit.watcher import local_sources_watcher
 from src.config import Config
-from src.code_parser import extract_functions
+from src.repository import parse_upload
+from src.hierarchical import HierarchicalSummarizer, group_by_file
 from src.summarizer import Summarizer
+from src.model_registry import registry
+from src.response_cache import shared_response_cache
+from src.summary_cache import shared_cache
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Page config
@@ -96,6 +102,11 @@ def main():
         st.markdown("## 👋 Welcome")
         st.write("Upload a Python `.py` file to generate function-level and codebase summaries.")
         st.write("Choose a perspective (Product Manager, Developer, or Manager).")
+        use_docstrings = st.checkbox(
+            "Use docstrings as summaries",
+            value=Config.DOCSTRING_SUMMARIES,
+            help="Summarize documented functions by their docstring's first sentence and run the model only on the rest."
+        )
 
     # Main section title
     st.markdown('<div class="section-title">📄 Upload Python File</div>', unsafe_allow_html=True)
@@ -105,110 +116,181 @@ def main():
         summarizer = Summarizer(
             function_model_name=Config.FUNCTION_SUMMARIZER_MODEL,
             groq_api_key=Config.GROQ_API_KEY,
-            groq_model=Config.GROQ_MODEL
+            groq_model=Config.GROQ_MODEL,
+            device=Config.FUNCTION_MODEL_DEVICE,
+            dtype=Config.FUNCTION_MODEL_DTYPE,
+            cache=shared_cache(Config.SUMMARY_CACHE_PATH, Config.SUMMARY_CACHE_MAX_ENTRIES),
+            groq_base_url=Config.GROQ_BASE_URL,
+            backend=Config.FUNCTION_MODEL_BACKEND,
+            decoding_profile=Config.DECODING_PROFILE,
+            long_function_strategy=Config.LONG_FUNCTION_STRATEGY,
+            max_function_chunks=Config.MAX_FUNCTION_CHUNKS,
+            near_duplicate_threshold=Config.NEAR_DUPLICATE_THRESHOLD,
+            trivial_fast_path=Config.TRIVIAL_FAST_PATH,
+            response_cache=shared_response_cache(Config.GROQ_RESPONSE_CACHE_MAX_ENTRIES, Config.GROQ_RESPONSE_CACHE_TTL)
         )
     except Exception as e:
         st.markdown(f'<div class="error-box">⚠️ Failed to initialize summarizer: {e}</div>', unsafe_allow_html=True)
         return
 
     # File uploader
-    uploaded_file = st.file_uploader("Upload a Python file", type=["py"])
+    uploaded_file = st.file_uploader(
+        "Upload a Python file or a zipped repository",
+        type=["py", "zip"],
+        help=".gitignore excludes inside a zipped repository are honoured."
+    )
     if not uploaded_file:
         st.info("Please upload a Python file to proceed.")
         return
 
-    # Save the uploaded file temporarily
-    temp_path = "temp.py"
-    try:
-        with open(temp_path, "wb") as f:
-            f.write(uploaded_file.read())
-        st.markdown('<div class="success-box">✅ File uploaded successfully!</div>', unsafe_allow_html=True)
+    # Parse the upload in memory; nothing is shared between sessions on disk
+    st.markdown('<div class="success-box">✅ File uploaded successfully!</div>', unsafe_allow_html=True)
 
-        # Validate the uploaded file
-        try:
-            Config.validate(api_key=Config.GROQ_API_KEY, file_path=temp_path)
-        except Exception as e:
-            st.markdown(f'<div class="error-box">⚠️ Validation error: {e}</div>', unsafe_allow_html=True)
-            return
-
-        # Extract functions from the file
-        functions = extract_functions(temp_path)
-        if not functions:
-            st.markdown('<div class="error-box">⚠️ No functions found in the uploaded file.</div>', unsafe_allow_html=True)
-            return
-
-        # Display function summaries
-        extracted_summaries = []
-        st.markdown('<div class="section-title">🧠 Function Summaries</div>', unsafe_allow_html=True)
-        for func in functions:
-            with st.expander(f"{func['name']} (Line {func['line_start']})"):
-                try:
-                    summary = summarizer.summarize_function(func['code'])
-                    extracted_summaries.append(summary)
-                    st.markdown('<div class="card">', unsafe_allow_html=True)
-                    st.code(func['code'], language='python')
-                    st.markdown("**Summary:**")
-                    st.markdown(f'<div class="summary-text">{summary}</div>', unsafe_allow_html=True)
-                    st.markdown('</div>', unsafe_allow_html=True)
-                except Exception as e:
-                    st.markdown(f'<div class="error-box">⚠️ Error summarizing function: {e}</div>', unsafe_allow_html=True)
-
-        # Download function summaries
-        if extracted_summaries:
-            summary_text = "\n\n".join(
-                f"Function: {func['name']} (Line {func['line_start']})\nSummary: {summary}"
-                for func, summary in zip(functions, extracted_summaries)
-            )
-            st.download_button(
-                "⬇️ Download Function Summaries",
-                summary_text,
-                file_name=f"function_summaries_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                mime="text/plain"
-            )
+    # Validate the configuration
+    try:
+        Config.validate(api_key=Config.GROQ_API_KEY)
+    except Exception as e:
+        st.markdown(f'<div class="error-box">⚠️ Validation error: {e}</div>', unsafe_allow_html=True)
+        return
 
-        # Overall codebase summary
-        st.markdown('<div class="section-title">🧾 Overall Codebase Summary</div>', unsafe_allow_html=True)
-        col1, col2 = st.columns([3, 1])
+    # Extract functions from the file or repository archive
+    report_progress = None
+    if uploaded_file.name.endswith(".zip"):
+        progress_bar = st.progress(0.0)
 
-        with col1:
-            user_type = st.selectbox(
-                "Select a role",
-                ["product_manager", "developer", "manager"],
-                key="perspective_select",
+        def report_progress(stats):
+            progress_bar.progress(
+                stats.files_done / stats.files_total,
+                text=f"Parsed {stats.files_done}/{stats.files_total} files ({stats.files_per_second:.1f} files/s)"
             )
 
-        with col2:
-            st.markdown("<div style='height: 28px;'></div>", unsafe_allow_html=True)  # Vertical alignment trick
-            generate = st.button("Generate Summary", key="generate_summary")
-
-        if generate:
-            with st.spinner("Generating summary..."):
-                try:
-                    overall_summary = summarizer.summarize_codebase(extracted_summaries, user_type)
-                    st.markdown('<div class="card">', unsafe_allow_html=True)
-                    st.markdown("**Overall Summary:**")
-                    st.markdown(f'<div class="summary-text">{overall_summary}</div>', unsafe_allow_html=True)
-                    st.markdown('</div>', unsafe_allow_html=True)
-
-                    # Download overall summary
-                    st.download_button(
-                        label="⬇️ Download Overall Summary",
-                        data=overall_summary,
-                        file_name=f"overall_summary_{user_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                        mime="text/plain",
-                        help="Download the overall summary as a .txt file"
-                    )
-                except Exception as e:
-                    st.markdown(f'<div class="error-box">⚠️ Error generating overall summary: {e}</div>', unsafe_allow_html=True)
+    functions = parse_upload(
+        uploaded_file.name,
+        uploaded_file.getvalue(),
+        report_progress,
+        fingerprint=Config.CACHE_KEY_MODE == "ast",
+        exclude_nested=Config.EXCLUDE_NESTED_BODIES,
+        docstrings=use_docstrings
+    )
+    if not functions:
+        st.markdown('<div class="error-box">⚠️ No functions found in the uploaded file.</div>', unsafe_allow_html=True)
+        return
 
-    finally:
-        # Cleanup temporary file
-        if os.path.exists(temp_path):
+    # Display function summaries
+    st.markdown('<div class="section-title">🧠 Function Summaries</div>', unsafe_allow_html=True)
+    with st.spinner("Summarizing functions..."):
+        extracted_summaries = summarizer.summarize_functions(
+            [func.code for func in functions],
+            batch_size=Config.FUNCTION_BATCH_SIZE,
+            fingerprints=[func.fingerprint for func in functions],
+            docstrings=[func.docstring for func in functions],
+            decorators=[func.decorators for func in functions],
+            # Whole repositories switch to cheaper decoding as they grow
+            profile=Config.bulk_decoding_profile(len({func.file for func in functions}))
+            if uploaded_file.name.endswith(".zip") else None
+        )
+    for model_stats in registry.stats():
+        st.sidebar.caption(
+            f"Model {model_stats['model_name']}: loaded in {model_stats['load_seconds']}s, "
+            f"{model_stats['resident_mb']} MB resident"
+        )
+    st.sidebar.caption(f"Inference: {summarizer.stats.report()}")
+    for func, summary in zip(functions, extracted_summaries):
+        with st.expander(f"{func.file or uploaded_file.name}:{func.qualname} (Line {func.line_start})"):
             try:
-                os.remove(temp_path)
-                logger.info(f"Removed temporary file: {temp_path}")
+                st.markdown('<div class="card">', unsafe_allow_html=True)
+                st.code(func.code, language='python')
+                st.markdown("**Summary:**")
+                st.markdown(f'<div class="summary-text">{summary}</div>', unsafe_allow_html=True)
+                st.markdown('</div>', unsafe_allow_html=True)
             except Exception as e:
-                logger.warning(f"Error during cleanup: {e}")
+                st.markdown(f'<div class="error-box">⚠️ Error summarizing function: {e}</div>', unsafe_allow_html=True)
+
+    # Download function summaries
+    if extracted_summaries:
+        summary_text = "\n\n".join(
+            f"Function: {func.qualname} (Line {func.line_start})\nSummary: {summary}"
+            for func, summary in zip(functions, extracted_summaries)
+        )
+        st.download_button(
+            "⬇️ Download Function Summaries",
+            summary_text,
+            file_name=f"function_summaries_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+            mime="text/plain"
+        )
+
+    # Overall codebase summary
+    st.markdown('<div class="section-title">🧾 Overall Codebase Summary</div>', unsafe_allow_html=True)
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        perspectives = ["product_manager", "developer", "manager"]
+        user_type = st.selectbox(
+            "Select a role",
+            perspectives,
+            key="perspective_select",
+        )
+
+    with col2:
+        st.markdown("<div style='height: 28px;'></div>", unsafe_allow_html=True)  # Vertical alignment trick
+        generate = st.button("Generate Summary", key="generate_summary")
+
+    # All perspectives are generated on one click and kept for this upload, so
+    # switching the role afterwards shows the stored view without a request
+    views_key = hashlib.sha256("\n".join([uploaded_file.name] + extracted_summaries).encode("utf-8")).hexdigest()
+    views = st.session_state.get("perspective_views")
+    overall_summary = views['summaries'].get(user_type) if views and views['key'] == views_key else None
+    if generate:
+        try:
+            summary_inputs = extracted_summaries
+            if any(func.file for func in functions):
+                # Repository uploads are summarized per file and package to stay within the context window
+                with st.spinner("Summarizing files and packages..."):
+                    hierarchical = HierarchicalSummarizer(
+                        summarizer,
+                        token_budget=Config.HIERARCHICAL_TOKEN_BUDGET,
+                        max_workers=Config.HIERARCHICAL_MAX_WORKERS
+                    )
+                    summary_inputs = hierarchical.condense(group_by_file(functions, extracted_summaries)).top_level
+            # The selected role streams in while the others are generated in one combined request
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                others = executor.submit(
+                    summarizer.summarize_perspectives,
+                    summary_inputs,
+                    [perspective for perspective in perspectives if perspective != user_type]
+                )
+                placeholder = st.empty()
+                parts = []
+                rendered_at = 0.0
+                for delta in summarizer.stream_codebase_summary(summary_inputs, user_type):
+                    parts.append(delta)
+                    # Each render resends the whole text, so join and refresh on an interval rather than per token
+                    if time.monotonic() - rendered_at >= Config.STREAM_REFRESH_SECONDS:
+                        placeholder.markdown(f'<div class="summary-text">{"".join(parts)}</div>', unsafe_allow_html=True)
+                        rendered_at = time.monotonic()
+                overall_summary = summarizer.finalize_codebase_summary("".join(parts).strip())
+                placeholder.empty()
+                st.session_state["perspective_views"] = {
+                    'key': views_key,
+                    'summaries': dict(others.result(), **{user_type: overall_summary})
+                }
+        except Exception as e:
+            st.markdown(f'<div class="error-box">⚠️ Error generating overall summary: {e}</div>', unsafe_allow_html=True)
+
+    if overall_summary is not None:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.markdown("**Overall Summary:**")
+        st.markdown(f'<div class="summary-text">{overall_summary}</div>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Download overall summary
+        st.download_button(
+            label="⬇️ Download Overall Summary",
+            data=overall_summary,
+            file_name=f"overall_summary_{user_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
+            mime="text/plain",
+            help="Download the overall summary as a .txt file"
+        )
 
 
 if __name__ == "__main__":
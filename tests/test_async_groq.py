@@ -0,0 +1,82 @@
+import asyncio
+import os
+import sys
+import time
+
+from src.async_groq import AsyncCodebaseSummarizer
+from src.summarizer import Summarizer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from stub_groq_server import StubGroqServer  # noqa: E402
+
+
+def async_summarizer(server, **kwargs):
+    summarizer = Summarizer("stand-in", "stub-key", "stub-model", groq_base_url=server.base_url)
+    return AsyncCodebaseSummarizer(summarizer, **kwargs)
+
+
+def count_acquires(client):
+    acquired = []
+    acquire = client.bucket.acquire
+
+    async def counting_acquire(tokens):
+        acquired.append(tokens)
+        await acquire(tokens)
+
+    client.bucket.acquire = counting_acquire
+    return acquired
+
+
+def test_rate_limited_requests_honour_retry_after_and_are_charged_per_attempt():
+    with StubGroqServer(latency=0, rate_limit_first=2, retry_after="0.3") as server:
+        client = async_summarizer(server, base_delay=0.001)
+        acquired = count_acquires(client)
+
+        async def run():
+            async with client:
+                return await client.complete("Summarize this codebase.")
+
+        start = time.perf_counter()
+        reply = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+    assert reply == server.reply
+    assert server.requests == 3
+    assert server.rate_limited == 2
+    assert elapsed >= 0.6
+    assert len(acquired) == 3
+
+
+def test_concurrency_and_connections_are_bounded():
+    groups = {f"file_{i}.py": [f"Function {i} returns {i}."] for i in range(8)}
+    with StubGroqServer(latency=0.2) as server:
+        client = async_summarizer(server, max_concurrency=2)
+
+        async def run():
+            async with client:
+                return await client.summarize_many(groups)
+
+        summaries = asyncio.run(run())
+    assert len(summaries) == len(groups)
+    assert server.requests == len(groups)
+    assert server.peak_in_flight == 2
+    assert len(server.connections) <= 2
+
+
+def test_backoff_does_not_hold_a_concurrency_slot():
+    with StubGroqServer(latency=0.2, rate_limit_first=1, retry_after="1.0") as server:
+        client = async_summarizer(server, max_concurrency=1, base_delay=0.001)
+
+        async def run():
+            async with client:
+                start = time.perf_counter()
+                limited = asyncio.ensure_future(client.complete("First request."))
+                await asyncio.sleep(0.05)
+                await client.complete("Second request.")
+                second = time.perf_counter() - start
+                await limited
+                return second
+
+        second = asyncio.run(run())
+    # The second request runs while the first waits out its Retry-After
+    assert second < 0.9
+    assert server.requests == 3
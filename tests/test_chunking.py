@@ -0,0 +1,57 @@
+from src.code_parser import split_function_source
+from src.summarizer import Summarizer
+
+
+def count_words(text):
+    return len(text.split())
+
+
+def long_function(statements=40):
+    body = "".join(
+        f"    value_{i} = compute(value, {i}) + offset\n    # step {i} done\n" if i % 5 == 0
+        else f"    value_{i} = compute(value, {i}) + offset\n"
+        for i in range(statements)
+    )
+    return f"@cached\ndef process(value, offset):\n{body}    return value_{statements - 1}\n"
+
+
+def test_chunks_repeat_the_signature_and_cover_the_whole_body():
+    code = long_function()
+    chunks = split_function_source(code, 40, count_words)
+    header = "@cached\ndef process(value, offset):\n"
+    assert len(chunks) > 1
+    assert all(chunk.startswith(header) for chunk in chunks)
+    assert "".join(chunk[len(header):] for chunk in chunks) == code[len(header):]
+    assert all(count_words(chunk) <= 40 for chunk in chunks)
+
+
+def test_short_or_unsplittable_functions_stay_whole():
+    short = "def f(x):\n    y = x + 1\n    return y\n"
+    assert split_function_source(short, 100, count_words) == [short]
+    one_statement = "def f(x):\n    return " + " + ".join(f"x{i}" for i in range(50)) + "\n"
+    assert split_function_source(one_statement, 10, count_words) == [one_statement]
+    assert split_function_source("def f(x): return x", 1, count_words) == ["def f(x): return x"]
+    assert split_function_source("not python (", 1, count_words) == ["not python ("]
+
+
+def test_oversized_statements_become_their_own_chunk():
+    code = "def f(x):\n    a = 1\n    b = " + " + ".join(f"x{i}" for i in range(30)) + "\n    return a\n"
+    chunks = split_function_source(code, 20, count_words)
+    assert [chunk.splitlines()[1].split()[0] for chunk in chunks] == ["a", "b", "return"]
+
+
+class WordTokenizer:
+    def __call__(self, text, add_special_tokens=True):
+        return {"input_ids": text.split()}
+
+
+def test_summarizer_caps_the_number_of_chunks(monkeypatch):
+    monkeypatch.setattr(Summarizer, "function_tokenizer", property(lambda self: WordTokenizer()))
+    summarizer = Summarizer("stand-in", None, None, max_function_chunks=3)
+    summarizer.max_input_length = 41
+    code = long_function()
+    assert len(split_function_source(code, 40, count_words)) > 3
+    chunks = summarizer._chunks(code)
+    assert chunks == split_function_source(code, 40, count_words)[:3]
+    summarizer.long_function_strategy = "truncate"
+    assert summarizer._chunks(code) == []
@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+from src import cli
+from src.config import Config
+from src.summarizer import Summarizer
+
+
+def test_bulk_runs_pick_the_decoding_profile_from_the_file_count(tmp_path, monkeypatch):
+    profiles = []
+
+    def generate(self, codes, batch_size, profile=None):
+        profiles.append(profile)
+        return ["summary"] * len(codes)
+
+    monkeypatch.setattr(Summarizer, "_generate", generate)
+    monkeypatch.setattr(Config, "DECODING_PROFILE", "quality")
+    monkeypatch.setattr(Config, "BULK_BALANCED_MIN_FILES", 3)
+    repository = tmp_path / "repo"
+    repository.mkdir()
+    for i in range(3):
+        (repository / f"m{i}.py").write_text(f"def f{i}(x):\n    return x * {i} + len(str(x))\n")
+    single = tmp_path / "single.py"
+    single.write_text("def g(x):\n    return x * 2 + len(str(x))\n")
+
+    code = cli.main([str(repository), str(single), "-o", str(tmp_path / "out.jsonl"), "--workers", "0",
+                     "--no-cache", "-j", "1"])
+    assert code == cli.EXIT_OK
+    assert set(profiles) == {"balanced", "quality"}
+    profiles.clear()
+    cli.main([str(repository), "-o", str(tmp_path / "out.jsonl"), "--workers", "0", "--no-cache",
+              "--profile", "fast"])
+    assert set(profiles) == {"fast"}
+
+
+def test_rows_carry_the_docstring_that_replaced_inference(tmp_path, monkeypatch):
+    monkeypatch.setattr(Summarizer, "_generate", lambda self, codes, batch_size, profile=None: ["model"] * len(codes))
+    source = tmp_path / "m.py"
+    source.write_text(
+        'def load(path):\n    """Read the configuration file from disk."""\n    return open(path).read().strip()\n\n'
+        'def save(path, text):\n    open(path, "w").write(text.strip() + "!")\n'
+    )
+    output = tmp_path / "out.jsonl"
+    cli.main([str(source), "-o", str(output), "--workers", "0", "--no-cache", "--docstrings"])
+    rows = {row['name']: row for row in map(json.loads, output.read_text().splitlines())}
+    assert rows['load']['docstring'] == "Read the configuration file from disk."
+    assert rows['load']['summary'] == "Read the configuration file from disk."
+    assert rows['save']['docstring'] is None
+    assert rows['save']['summary'] == "model"
+
+
+def test_unsupported_inputs_are_usage_errors(tmp_path):
+    notes = tmp_path / "notes.txt"
+    notes.write_text("not python")
+    assert cli.main([str(notes), "-o", str(tmp_path / "out.jsonl"), "--parse-only"]) == cli.EXIT_USAGE
+    assert cli.main([str(notes), "-o", str(tmp_path / "out.jsonl"), "--workers", "0", "--no-cache"]) == cli.EXIT_USAGE
+
+
+def test_parquet_rows_keep_the_columns_of_every_kind(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "out.parquet"
+    writer = cli.RowWriter(str(output), "parquet")
+    writer.write({'kind': "function", 'name': "f", 'summary': "Adds numbers."})
+    writer.write({'kind': "file", 'file': "m.py", 'summary': "Math helpers."})
+    writer.write({'kind': "codebase", 'perspective': "developer", 'summary': "A math library."})
+    writer.close()
+    rows = pq.read_table(str(output)).to_pylist()
+    assert rows[1]['file'] == "m.py"
+    assert rows[2]['perspective'] == "developer"
+    assert rows[2]['name'] is None
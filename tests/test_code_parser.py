@@ -0,0 +1,93 @@
+from src.code_parser import extract_functions
+
+
+def test_records_read_into_memory_survive_truncation(tmp_path):
+    path = tmp_path / "m.py"
+    path.write_text("def f(x):\n    return x + 1\n\ndef g():\n    pass\n")
+    records = extract_functions(str(path), memory_map=False)
+    # Truncating a file under a live mapping would kill the process on the next slice
+    with open(path, "w"):
+        pass
+    assert [record.code for record in records] == ["def f(x):\n    return x + 1", "def g():\n    pass"]
+    assert isinstance(records[0].source.data, bytes)
+
+
+SOURCE = '''\
+import functools
+
+
+class Shop:
+    class Cart:
+        def total(self):
+            return 0
+
+    @functools.lru_cache(
+        maxsize=None,
+    )
+    def price(self, item):
+        return 1
+
+    async def fetch(self):
+        return 2
+
+
+def outer(values):
+    @functools.wraps(outer)
+    def inner():
+        return values
+
+    async def poll():
+        return None
+
+    return inner
+'''
+
+
+def test_records_carry_qualnames_async_flags_and_decorators():
+    records = {record.qualname: record for record in extract_functions("shop.py", source=SOURCE)}
+    assert list(records) == [
+        "Shop.Cart.total", "Shop.price", "Shop.fetch", "outer", "outer.<locals>.inner", "outer.<locals>.poll"
+    ]
+    assert records["Shop.price"].parent == "Shop"
+    assert records["outer.<locals>.inner"].parent == "outer"
+    assert records["outer"].parent is None
+    assert [qualname for qualname, record in records.items() if record.is_async] == ["Shop.fetch", "outer.<locals>.poll"]
+    price = records["Shop.price"]
+    assert price.decorators == ("functools.lru_cache(\n        maxsize=None,\n    )",)
+    assert (price.line_start, price.line_end) == (12, 13)
+    assert price.code == "def price(self, item):\n        return 1"
+    assert records["outer.<locals>.inner"].decorators == ("functools.wraps(outer)",)
+
+
+def test_exclude_nested_replaces_nested_bodies_and_their_decorators_with_stubs():
+    records = {record.qualname: record for record in extract_functions("shop.py", source=SOURCE, exclude_nested=True)}
+    assert records["outer"].code == (
+        "def outer(values):\n"
+        "    def inner(...): ...\n"
+        "\n"
+        "    async def poll(...): ...\n"
+        "\n"
+        "    return inner"
+    )
+    assert records["outer.<locals>.inner"].code == "def inner():\n        return values"
+    without = {record.qualname: record for record in extract_functions("shop.py", source=SOURCE)}
+    assert "return values" in without["outer"].code
+
+
+def test_crlf_and_declared_encodings_are_decoded():
+    crlf = b"class A:\r\n    def m(self):\r\n        return 1\r\n"
+    assert [record.code for record in extract_functions("a.py", source=crlf)] == ["def m(self):\n        return 1"]
+    latin1 = "# -*- coding: latin-1 -*-\ndef caf\u00e9():\n    return '\u00e9t\u00e9'\n".encode("latin-1")
+    records = extract_functions("cafe.py", source=latin1)
+    assert [(record.name, record.code) for record in records] == [
+        ("caf\u00e9", "def caf\u00e9():\n    return '\u00e9t\u00e9'")
+    ]
+    bom = "\ufeffdef f():\n    return '\u00e9'\n".encode("utf-8")
+    assert [record.code for record in extract_functions("bom.py", source=bom)] == ["def f():\n    return '\u00e9'"]
+
+
+def test_files_with_a_declared_encoding_are_transcoded(tmp_path):
+    path = tmp_path / "cafe.py"
+    path.write_bytes("# coding: cp1252\ndef f():\n    return '\u20ac'\n".encode("cp1252"))
+    records = extract_functions(str(path))
+    assert [record.code for record in records] == ["def f():\n    return '\u20ac'"]
@@ -0,0 +1,47 @@
+from src.code_parser import extract_functions
+
+ORIGINAL = '''\
+def area(width, height):
+    """Area of a rectangle."""
+    # Multiply the sides
+    return width * height
+'''
+
+COSMETIC = '''\
+def area(width,   height):
+    """Compute the area of a rectangle from its two sides."""
+
+    return (width *
+            height)  # the product
+'''
+
+
+def fingerprint(source):
+    record, = extract_functions("area.py", source=source, fingerprint=True)
+    return record.fingerprint
+
+
+def test_fingerprint_ignores_whitespace_comments_and_docstrings():
+    assert fingerprint(ORIGINAL) == fingerprint(COSMETIC)
+    assert fingerprint(ORIGINAL) == fingerprint(ORIGINAL.replace('    """Area of a rectangle."""\n', ""))
+    indented = "class Shape:\n" + "".join(f"    {line}\n" for line in ORIGINAL.splitlines())
+    assert fingerprint(ORIGINAL) == fingerprint(indented)
+
+
+def test_fingerprint_changes_on_semantic_edits():
+    edits = [
+        ORIGINAL.replace("width * height", "width + height"),
+        ORIGINAL.replace("def area(width, height)", "def area(height, width)"),
+        ORIGINAL.replace("def area", "def surface"),
+        ORIGINAL.replace("def area", "async def area"),
+        ORIGINAL.replace("return width * height", "return width * height * 1"),
+        "@staticmethod\n" + ORIGINAL,
+    ]
+    fingerprints = {fingerprint(edit) for edit in edits}
+    assert len(fingerprints) == len(edits)
+    assert fingerprint(ORIGINAL) not in fingerprints
+
+
+def test_fingerprints_are_only_computed_on_request():
+    record, = extract_functions("area.py", source=ORIGINAL)
+    assert record.fingerprint is None
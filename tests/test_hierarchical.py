@@ -0,0 +1,50 @@
+import threading
+
+from src.hierarchical import HierarchicalSummarizer, estimate_tokens
+
+
+class StubSummarizer:
+    """Stands in for Summarizer with group summaries longer than the token budget."""
+    group_prompt_version = 1
+    group_max_tokens = 150
+    groq_model = "stub"
+    cache = None
+
+    def __init__(self, length=700):
+        self.length = length
+        self.groups = []
+
+    def summarize_group(self, summaries, level):
+        self.groups.append(summaries)
+        return "g" * self.length
+
+    def summarize_codebase(self, summaries, user_type):
+        return "codebase"
+
+
+def run_with_timeout(target, timeout=10):
+    outcome = {}
+    thread = threading.Thread(target=lambda: outcome.setdefault("value", target()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "summarize did not finish"
+    return outcome["value"]
+
+
+def test_fit_makes_progress_when_every_item_fills_a_request():
+    stub = StubSummarizer()
+    hierarchical = HierarchicalSummarizer(stub, token_budget=500)
+    files = {'a/x.py': ["reads the input file"] * 3, 'b/y.py': ["writes the output file"] * 3}
+    result = run_with_timeout(lambda: hierarchical.summarize(files))
+    assert result.summary == "codebase"
+    assert len(result.top_level) == 1
+    # Every pair sent to the model fits the budget
+    for group in stub.groups:
+        assert sum(estimate_tokens(item) for item in group) <= hierarchical.token_budget
+
+
+def test_fit_condenses_odd_item_counts():
+    stub = StubSummarizer(length=2000)
+    hierarchical = HierarchicalSummarizer(stub, token_budget=300)
+    items = run_with_timeout(lambda: hierarchical._fit([f"{i}: " + "s" * 2000 for i in range(5)]))
+    assert len(items) == 1
@@ -0,0 +1,12 @@
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from check_import_time import DEFAULT_BUDGET_MS, DEFAULT_TARGET, heavy_imports, run_once  # noqa: E402
+
+
+def test_parse_only_startup_skips_heavy_imports_and_stays_within_budget():
+    results = [run_once(DEFAULT_TARGET) for _ in range(3)]
+    assert [heavy_imports(imports) for _, imports in results] == [[], [], []]
+    assert statistics.median(elapsed for elapsed, _ in results) <= DEFAULT_BUDGET_MS
@@ -0,0 +1,62 @@
+import subprocess
+
+from src.incremental import IncrementalIndex
+
+
+class StandInSummarizer:
+    """Summarizes a function by its source, so stale summaries are visible."""
+
+    def summarize_functions(self, codes, batch_size=8, fingerprints=None, profile=None, docstrings=None,
+                            decorators=None):
+        return [code.splitlines()[-1].strip() for code in codes]
+
+
+def git(repo, *args):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                   cwd=repo, check=True, capture_output=True)
+
+
+def test_reverted_uncommitted_edit_is_resummarized(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    module = repo / "m.py"
+    module.write_text("def f():\n    x = 1\n    return x\n\ndef g():\n    return 2\n")
+    git(repo, "init", "-q")
+    git(repo, "add", "m.py")
+    git(repo, "commit", "-q", "-m", "initial")
+    summarizer = StandInSummarizer()
+    manifest = str(tmp_path / "manifest.json")
+
+    IncrementalIndex(str(repo), manifest_path=manifest).update(summarizer)
+    module.write_text("def f():\n    x = 99\n    return x * 99\n\ndef g():\n    return 2\n")
+    result = IncrementalIndex(str(repo), manifest_path=manifest).update(summarizer)
+    assert result.functions_resummarized == 1
+    git(repo, "checkout", "m.py")
+    index = IncrementalIndex(str(repo), manifest_path=manifest)
+    result = index.update(summarizer)
+
+    assert result.functions_resummarized == 1
+    assert index.summaries() == ["return x", "return 2"]
+
+
+def test_git_mode_honours_directory_excludes(tmp_path):
+    repo = tmp_path / "repo"
+    (repo / "vendor").mkdir(parents=True)
+    (repo / "m.py").write_text("def f():\n    return 1\n")
+    (repo / "vendor" / "lib.py").write_text("def v():\n    return 1\n")
+    git(repo, "init", "-q")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "initial")
+    summarizer = StandInSummarizer()
+    manifest = str(tmp_path / "manifest.json")
+
+    index = IncrementalIndex(str(repo), manifest_path=manifest, excludes=["vendor/"])
+    index.update(summarizer)
+    assert sorted(index.files) == ["m.py"]
+    (repo / "m.py").write_text("def f():\n    return 2\n")
+    (repo / "vendor" / "lib.py").write_text("def v():\n    return 2\n")
+    git(repo, "commit", "-q", "-am", "edit")
+    index = IncrementalIndex(str(repo), manifest_path=manifest, excludes=["vendor/"])
+    index.update(summarizer)
+
+    assert sorted(index.files) == ["m.py"]
@@ -0,0 +1,89 @@
+import json
+import os
+
+from src import cli
+from src.pipeline import SummarizationPipeline
+from src.summarizer import Summarizer
+
+
+def write_repository(root, files=6, functions=5):
+    for f in range(files):
+        package = os.path.join(root, f"pkg{f % 2}")
+        os.makedirs(package, exist_ok=True)
+        with open(os.path.join(package, f"module{f}.py"), "w") as file:
+            for i in range(functions):
+                file.write(f"def function_{f}_{i}(values):\n    total = sum(values) * {i}\n    return total - {f}\n\n")
+
+
+def stand_in_generate(self, codes, batch_size, profile=None):
+    return [f"summary of {code.split('(')[0][4:]}" for code in codes]
+
+
+def test_pipeline_summarizes_every_function_and_reports_metrics(tmp_path, monkeypatch):
+    monkeypatch.setattr(Summarizer, "_generate", stand_in_generate)
+    write_repository(str(tmp_path))
+    summarizer = Summarizer("stand-in", None, None, trivial_fast_path=False)
+    summarizer.summarize_group = lambda summaries, level: f"{level}: {len(summaries)} functions"
+    finished = []
+    result = SummarizationPipeline(summarizer, batch_size=4, queue_size=8, remote_workers=2).run(
+        str(tmp_path), jobs=2, on_file=finished.append, profile="fast"
+    )
+    assert sorted(result.files) == sorted(file.path for file in finished)
+    assert len(result.files) == 6
+    for file_result in result.files.values():
+        assert file_result.file_summary == "file: 5 functions"
+        assert [s.split()[-1] for s in file_result.summaries] == [r.name for r in file_result.records]
+    parse, inference, remote = result.metrics
+    assert (parse.items, inference.items, remote.items) == (6, 30, 6)
+    assert parse.queue_max_depth <= 8
+    assert all(metrics.wall_seconds > 0 for metrics in result.metrics)
+
+
+def test_cli_runs_directories_through_the_pipeline(tmp_path, monkeypatch):
+    monkeypatch.setattr(Summarizer, "_generate", stand_in_generate)
+    runs = []
+    original_run = SummarizationPipeline.run
+
+    def run(self, *args, **kwargs):
+        result = original_run(self, *args, **kwargs)
+        runs.append(result)
+        return result
+
+    monkeypatch.setattr(SummarizationPipeline, "run", run)
+    repository = tmp_path / "repo"
+    write_repository(str(repository))
+    output = tmp_path / "out.jsonl"
+    code = cli.main([str(repository), "-o", str(output), "--workers", "0", "--no-cache", "-j", "1"])
+    rows = [json.loads(line) for line in output.read_text().splitlines()]
+    assert code == cli.EXIT_OK
+    assert len(runs) == 1
+    # Rows are streamed out; the pipeline does not hold on to the records
+    assert runs[0].files == {}
+    assert len(rows) == 30
+    assert all(row['file'].startswith(str(repository).replace(os.sep, "/") + "/pkg") for row in rows)
+    assert all(row['summary'] == f"summary of {row['name']}" for row in rows)
+
+
+def test_cli_keeps_only_summaries_for_perspectives(tmp_path, monkeypatch):
+    monkeypatch.setattr(Summarizer, "_generate", stand_in_generate)
+    monkeypatch.setattr(Summarizer, "summarize_group", lambda self, summaries, level: f"{level} summary")
+    monkeypatch.setattr(cli.Config, "GROQ_API_KEY", "stand-in")
+    calls = []
+
+    def summarize_perspectives(summarizer, file_groups, perspectives, hierarchical=None, file_summaries=None):
+        calls.append((file_groups, file_summaries))
+        return {perspective: "codebase summary" for perspective in perspectives}
+
+    monkeypatch.setattr(cli, "summarize_perspectives", summarize_perspectives)
+    repository = tmp_path / "repo"
+    write_repository(str(repository), files=2, functions=3)
+    output = tmp_path / "out.jsonl"
+    code = cli.main([str(repository), "-o", str(output), "--workers", "0", "--no-cache", "-j", "1",
+                     "--perspectives", "developer"])
+    assert code == cli.EXIT_OK
+    (file_groups, file_summaries), = calls
+    prefix = str(repository).replace(os.sep, "/")
+    assert file_groups == {
+        f"{prefix}/pkg{f}/module{f}.py": [f"summary of function_{f}_{i}" for i in range(3)] for f in range(2)
+    }
+    assert set(file_summaries) == set(file_groups)
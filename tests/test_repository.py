@@ -0,0 +1,87 @@
+import io
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.repository import IgnoreRules, iter_python_files, parse_upload
+
+
+def make_source(session, functions=20):
+    return "".join(
+        f"def session_{session}_function_{i}(value):\n    return value + {i}\n\n" for i in range(functions)
+    ).encode("utf-8")
+
+
+def make_archive(session):
+    data = io.BytesIO()
+    with zipfile.ZipFile(data, "w") as archive:
+        archive.writestr(f"repo_{session}/pkg/a.py", make_source(session, 3))
+        archive.writestr(f"repo_{session}/b.py", make_source(session, 2))
+    return data.getvalue()
+
+
+def test_concurrent_uploads_only_see_their_own_functions():
+    def session(number):
+        if number % 4 == 0:
+            functions = parse_upload(f"upload_{number}.zip", make_archive(number))
+            expected = 5
+        else:
+            functions = parse_upload(f"upload_{number}.py", make_source(number))
+            expected = 20
+        return len(functions) == expected and all(f.name.startswith(f"session_{number}_") for f in functions)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(session, range(32)))
+
+
+def test_archive_records_carry_their_path_inside_the_archive():
+    functions = parse_upload("upload.zip", make_archive(7))
+    assert sorted({f.file for f in functions}) == ["b.py", "pkg/a.py"]
+
+
+@pytest.mark.parametrize("patterns, path, is_dir, ignored", [
+    # Unanchored patterns match at any depth, anchored ones only from the root
+    (["*.py"], "pkg/m.py", False, True),
+    (["m.py"], "pkg/m.py", False, True),
+    (["/m.py"], "pkg/m.py", False, False),
+    (["/m.py"], "m.py", False, True),
+    (["pkg/m.py"], "pkg/m.py", False, True),
+    (["pkg/m.py"], "src/pkg/m.py", False, False),
+    # Wildcards stay within one path segment, ** crosses them
+    (["pkg/*.py"], "pkg/sub/m.py", False, False),
+    (["pkg/**/m.py"], "pkg/m.py", False, True),
+    (["pkg/**/m.py"], "pkg/a/b/m.py", False, True),
+    (["**/build"], "a/b/build", True, True),
+    (["pkg/**"], "pkg/a/m.py", False, True),
+    (["m?.py"], "m1.py", False, True),
+    (["m[0-9].py"], "mx.py", False, False),
+    (["m[!0-9].py"], "mx.py", False, True),
+    # The last matching pattern wins, so negation re-includes
+    (["*.py", "!keep.py"], "keep.py", False, False),
+    (["!keep.py", "*.py"], "keep.py", False, True),
+    # Directory-only patterns never match files
+    (["build/"], "build", True, True),
+    (["build/"], "build", False, False),
+    # Comments, blank lines and escapes
+    (["# m.py", ""], "m.py", False, False),
+    (["\\#notes.py"], "#notes.py", False, True),
+    (["\\!important.py"], "!important.py", False, True),
+    (["\\*.py"], "m.py", False, False),
+    (["\\*.py"], "*.py", False, True),
+    (["trailing.py   "], "trailing.py", False, True),
+    (["space\\ "], "space ", False, True),
+])
+def test_ignore_rules(patterns, path, is_dir, ignored):
+    assert IgnoreRules(patterns).is_ignored(path, is_dir=is_dir) is ignored
+
+
+def test_files_below_excluded_directories_stay_excluded(tmp_path):
+    for path in ("m.py", "vendor/lib.py", "vendor/keep.py", "pkg/__pycache__/m.py"):
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("x = 1\n")
+    rules = IgnoreRules.from_directory(str(tmp_path), ["vendor/", "!vendor/keep.py"])
+    walked = list(iter_python_files(str(tmp_path), ["vendor/", "!vendor/keep.py"]))
+    assert walked == ["m.py"]
+    assert [path for path in ("m.py", "vendor/lib.py", "vendor/keep.py", "pkg/__pycache__/m.py")
+            if not rules.excludes_file(path)] == walked
@@ -0,0 +1,83 @@
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src import response_cache
+from src.response_cache import ResponseCache, make_response_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache, "time", types.SimpleNamespace(monotonic=clock.monotonic))
+    cache = ResponseCache(ttl=10)
+    cache.put("key", "response")
+    clock.now = 10
+    assert cache.get("key") == "response"
+    clock.now = 10.5
+    assert cache.get("key") is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "response a")
+    cache.put("b", "response b")
+    cache.get("a")
+    cache.put("c", "response c")
+    assert [cache.get(key) for key in ("a", "b", "c")] == ["response a", None, "response c"]
+
+
+def test_concurrent_identical_requests_are_computed_once():
+    cache = ResponseCache()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return "response"
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(cache.get_or_compute, "key", compute) for _ in range(4)]
+        while cache.stats()['coalesced'] < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        assert [future.result() for future in futures] == ["response"] * 4
+    assert len(calls) == 1
+    assert cache.get_or_compute("key", compute) == "response"
+    assert cache.stats() == {'entries': 1, 'hits': 1, 'misses': 1, 'coalesced': 3}
+
+
+def test_a_failed_leader_fails_its_followers_and_is_not_cached():
+    cache = ResponseCache()
+    future, leader = cache.begin("key")
+    follower, follower_leads = cache.begin("key")
+    assert leader and not follower_leads
+    cache.fail("key", RuntimeError("Groq is down"))
+    with pytest.raises(RuntimeError):
+        follower.result(timeout=1)
+    assert cache.get_or_compute("key", lambda: "retried") == "retried"
+
+
+def test_fallback_responses_are_not_stored():
+    cache = ResponseCache()
+    assert cache.get_or_compute("key", lambda: "fallback", store=lambda value: value != "fallback") == "fallback"
+    assert cache.get("key") is None
+
+
+def test_keys_keep_summary_boundaries():
+    key = make_response_key("model", 1, "developer", ["a\nb"])
+    assert make_response_key("model", 1, "developer", ["a", "b"]) != key
+    assert make_response_key("model", 1, "developer", ["a\nb"]) == key
+    assert make_response_key("model", 1, "manager", ["a\nb"]) != key
+    assert make_response_key("model", 2, "developer", ["a\nb"]) != key
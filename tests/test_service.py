@@ -0,0 +1,64 @@
+import json
+import queue
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.service import MicroBatcher, SummarizationService
+from src.summarizer import SummaryStats
+
+
+class StandInSummarizer:
+    def __init__(self):
+        self.stats = SummaryStats()
+        self.codes = []
+
+    def summarize_functions(self, codes, batch_size=8, profile=None):
+        self.codes.extend(codes)
+        return [f"summary of {code}" for code in codes]
+
+
+def post(service, payload):
+    request = urllib.request.Request(
+        f"{service.base_url}/summarize", data=json.dumps(payload).encode("utf-8"),
+        headers={'Content-Type': "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+@pytest.fixture
+def service():
+    batcher = MicroBatcher(StandInSummarizer(), max_batch_size=4, max_wait_ms=1).start()
+    service = SummarizationService(batcher, port=0)
+    thread = threading.Thread(target=service._server.serve_forever, daemon=True)
+    thread.start()
+    yield service
+    service.shutdown()
+    batcher.stop()
+
+
+def test_codes_must_be_a_list(service):
+    status, body = post(service, {'codes': "abc"})
+    assert status == 400
+    assert "list" in body['error']
+    assert post(service, {'codes': ["a", "b"]}) == (200, {'summaries': ["summary of a", "summary of b"]})
+    assert post(service, {'code': "a"}) == (200, {'summary': "summary of a"})
+
+
+def test_requests_queued_before_a_full_queue_are_cancelled():
+    summarizer = StandInSummarizer()
+    batcher = MicroBatcher(summarizer, max_batch_size=4, max_wait_ms=1, max_queue=2)
+    with pytest.raises(queue.Full):
+        batcher.submit_many(["a", "b", "c"])
+    batcher.start()
+    try:
+        assert batcher.submit("d").result(timeout=5) == "summary of d"
+    finally:
+        batcher.stop()
+    assert summarizer.codes == ["d"]
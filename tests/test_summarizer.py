@@ -0,0 +1,80 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.response_cache import ResponseCache
+from src.summary_cache import SummaryCache
+from src.summarizer import Summarizer
+
+CODES = [f"def f{i}(x):\n    y = x * {i}\n    return y + {i * 7} - len(str(y))\n" for i in range(6)]
+
+
+def counting_summarizer(**kwargs):
+    summarizer = Summarizer("stand-in", None, None, **kwargs)
+    summarizer.generated_inputs = 0
+
+    def generate(codes, batch_size, profile=None):
+        summarizer.generated_inputs += len(codes)
+        return [f"{summarizer.long_function_strategy} summary {i}" for i in range(len(codes))]
+
+    summarizer._generate = generate
+    return summarizer
+
+
+def test_near_duplicates_are_not_shared_across_settings():
+    summarizer = counting_summarizer(long_function_strategy="truncate")
+    first = summarizer.summarize_functions(CODES)
+    summarizer.long_function_strategy = "chunk"
+    second = summarizer.summarize_functions(CODES)
+    assert summarizer.generated_inputs > 0
+    assert all(summary.startswith("chunk") for summary in second)
+    assert first != second
+
+
+def test_benchmark_settings_send_every_repeat_to_the_model():
+    summarizer = counting_summarizer(near_duplicate_threshold=0, trivial_fast_path=False)
+    for batch_size in (1, 4, 8):
+        before = summarizer.generated_inputs
+        summarizer.summarize_functions(CODES, batch_size=batch_size)
+        assert summarizer.generated_inputs - before == len(CODES)
+
+
+def test_concurrent_sessions_share_one_combined_perspectives_request():
+    cache = ResponseCache()
+    calls = []
+
+    def session():
+        summarizer = Summarizer("stand-in", None, "stub-model", response_cache=cache)
+
+        def complete(prompt, max_tokens=200):
+            calls.append(prompt)
+            time.sleep(0.2)
+            return json.dumps({'developer': "Parses code.", 'manager': "Two modules."})
+
+        summarizer._complete = complete
+        return summarizer.summarize_perspectives(["reads files", "writes files"], ["developer", "manager"])
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: session(), range(4)))
+    assert len(calls) == 1
+    assert all(result == {'developer': "Parses code.", 'manager': "Two modules."} for result in results)
+    assert cache.stats()['coalesced'] + cache.stats()['hits'] == 6
+
+
+def test_near_duplicate_summaries_do_not_reach_the_persistent_cache(tmp_path):
+    body = "".join(f"    step_{i} = helper_{i}(v0, v1, {i})\n" for i in range(30))
+    adds = f"def combine(v0, v1):\n{body}    return v0 + v1\n"
+    subtracts = f"def combine(v0, v1):\n{body}    return v0 - v1\n"
+    cache = SummaryCache(str(tmp_path / "summaries.sqlite3"))
+
+    def summarizer(threshold):
+        summarizer = Summarizer("stand-in", None, None, cache=cache, near_duplicate_threshold=threshold,
+                                trivial_fast_path=False)
+        summarizer._generate = lambda codes, batch_size, profile=None: [
+            "ADDS" if "v0 + v1" in code else "SUBTRACTS" for code in codes
+        ]
+        return summarizer
+
+    assert summarizer(0.5).summarize_functions([adds, subtracts]) == ["ADDS", "ADDS"]
+    assert summarizer(0).summarize_functions([subtracts]) == ["SUBTRACTS"]
+    cache.close()
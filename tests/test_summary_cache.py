@@ -0,0 +1,49 @@
+import itertools
+import types
+
+from src import summary_cache
+from src.summary_cache import SummaryCache, make_cache_key
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = itertools.count(1)
+    monkeypatch.setattr(summary_cache, "time", types.SimpleNamespace(time=lambda: next(clock)))
+    cache = SummaryCache(str(tmp_path / "summaries.sqlite3"), max_entries=2)
+    cache.put("a", "summary a")
+    cache.put("b", "summary b")
+    assert cache.get("a") == "summary a"
+    cache.put("c", "summary c")
+    assert cache.get_many(["a", "b", "c"]) == {'a': "summary a", 'c': "summary c"}
+    assert cache.prune(1) == 1
+    assert cache.get_many(["a", "c"]) == {'c': "summary c"}
+    cache.close()
+
+
+def test_hits_and_misses_are_counted_per_instance_and_persisted(tmp_path):
+    path = str(tmp_path / "summaries.sqlite3")
+    cache = SummaryCache(path)
+    cache.put_many({'a': "summary a", 'b': "summary b"})
+    assert cache.get_many(["a", "b", "missing", "a"]) == {'a': "summary a", 'b': "summary b"}
+    assert cache.get("other") is None
+    stats = cache.stats()
+    assert (stats['entries'], stats['session_hits'], stats['session_misses']) == (2, 2, 2)
+    assert (stats['hits'], stats['misses']) == (2, 2)
+    cache.close()
+
+    reopened = SummaryCache(path)
+    reopened.get("a")
+    stats = reopened.stats()
+    assert (stats['session_hits'], stats['session_misses']) == (1, 0)
+    assert (stats['hits'], stats['misses']) == (3, 2)
+    reopened.clear()
+    assert reopened.stats()['entries'] == 0
+    reopened.close()
+
+
+def test_keys_ignore_indentation_but_not_model_or_settings():
+    code = "def f(x):\n    return x + 1\n"
+    key = make_cache_key(code, "model", {'num_beams': 4})
+    assert make_cache_key("    def f(x):   \n\n        return x + 1", "model", {'num_beams': 4}) == key
+    assert make_cache_key(code, "other-model", {'num_beams': 4}) != key
+    assert make_cache_key(code, "model", {'num_beams': 1}) != key
+    assert make_cache_key(code, "model", {'num_beams': 4}, fingerprint="abc") != key
@@ -0,0 +1,41 @@
+from src.code_parser import extract_functions
+from src.trivial import trivial_summary
+
+SOURCE = '''import abc
+
+
+class Base(abc.ABC):
+    @abc.abstractmethod
+    def load(self):
+        """Load the data."""
+
+    @abc.abstractmethod
+    def save(self):
+        pass
+
+    def reset(self):
+        pass
+'''
+
+
+def test_abstract_methods_are_told_apart_by_their_decorators():
+    records = extract_functions("base.py", source=SOURCE)
+    summaries = {record.name: trivial_summary(record.code, record.decorators) for record in records}
+    assert summaries == {
+        'load': "Abstract placeholder",
+        'save': "Abstract placeholder",
+        'reset': "Placeholder that does nothing"
+    }
+
+
+def test_decorators_in_the_code_are_still_recognized():
+    assert trivial_summary("@abstractmethod\ndef load(self):\n    ...") == "Abstract placeholder"
+
+
+def test_long_constants_are_elided_in_the_summary():
+    assert trivial_summary("def f():\n    return 'short'") == "Returns constant `'short'`"
+    for constant in ('"' + "x" * 5000 + '"', 'b"' + "y" * 5000 + '"', "9" * 500):
+        summary = trivial_summary(f"def f():\n    return {constant}")
+        assert summary.startswith("Returns constant `")
+        assert "..." in summary
+        assert len(summary) < 80